@@ -1,8 +1,17 @@
 from entities.news_article import GNewsArticle, BBCArticle, NewsArticle, TheGuardianArticle, NYTArticle
 from entities.user_input import UserInput
+from aggregator.http_session import HTTPSessionPool, get_shared_pool
+from aggregator.cache import CacheBackend, CacheEntry, CachedList, get_default_cache, make_cache_key
+from aggregator.singleflight import SingleFlight, get_shared_group
+from aggregator.watermarks import WatermarkStore
+from aggregator.rate_limiter import Budget, Priority, RequestScheduler, get_shared_scheduler, request_priority
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+import contextvars
+import copy
+import threading
 import requests
 from datetime import datetime
-import streamlit as st
 
 
 class APIClient:
@@ -10,9 +19,291 @@ class APIClient:
     Base class for all news API clients.
     Provides common functionality and interface for fetching news articles.
     """
-    def __init__(self, api_key, base_url):
+    first_page = 1  # Index of the first results page
+    max_page_size = 10  # Largest page the provider serves
+    max_pages: Optional[int] = None  # Deepest page the provider serves, None if unbounded
+    max_results: Optional[int] = None  # Results the provider serves across all pages, None if unbounded
+    hedge_requests = False  # Duplicate slow requests; off since duplicates count against the quota
+    # Names the provider in the rate limits, cache and watermarks, so that the blocking and
+    # asyncio clients of a provider share its quota and data
+    provider_key = "APIClient"
+
+    def __init__(self, api_key, base_url, session_pool: Optional[HTTPSessionPool] = None,
+                 cache: Optional[CacheBackend] = None, flight: Optional[SingleFlight] = None,
+                 stale_while_revalidate: bool = True, watermarks: Optional[WatermarkStore] = None,
+                 scheduler: Optional[RequestScheduler] = None):
         self.api_key = api_key  # API access key
         self.base_url = base_url  # Base URL for API requests
+        self.session_pool = session_pool or get_shared_pool()  # Pooled keep-alive connections
+        self.cache = cache if cache is not None else get_default_cache()  # Fetch results cache
+        self.flight = flight or get_shared_group()  # Coalesces identical concurrent fetches
+        self.stale_while_revalidate = stale_while_revalidate  # Serve expired results while refreshing
+        self.watermarks = watermarks  # High-water marks for incremental (delta) fetching
+        self.scheduler = scheduler or get_shared_scheduler()  # Per-key rate limits and request priorities
+
+    def remaining_budget(self) -> Budget:
+        """
+        Returns the remaining request budget of this client's API key.
+
+        Returns:
+            Budget: Tokens available now and requests left today
+        """
+        return self.scheduler.remaining(self.provider_key, self.api_key)
+
+    def _since(self, category: str) -> Optional[datetime]:
+        """
+        Returns the publication date of the newest article already held for a category,
+        so the fetch only asks for newer items. None when incremental fetching is off or
+        the category has never been fetched.
+
+        Args:
+            category (str): The news category
+
+        Returns:
+            Optional[datetime]: The high-water mark in UTC
+        """
+        if self.watermarks is None:
+            return None
+        return self.watermarks.since(self.provider_key, category)
+
+    def _merge_delta(self, category: str, articles: list[NewsArticle]) -> list[NewsArticle]:
+        """
+        Merges the articles of a delta fetch into the set already held for a category.
+
+        Args:
+            category (str): The news category
+            articles (list[NewsArticle]): The newly fetched articles
+
+        Returns:
+            list[NewsArticle]: The merged set, or the fetched articles when incremental fetching is off
+        """
+        if self.watermarks is None:
+            return articles
+        return self.watermarks.merge(self.provider_key, category, articles)
+
+    def _cached_fetch(self, key_parts: tuple, loader: Callable[[], list[NewsArticle]]) -> CachedList:
+        """
+        Returns the cached result of a fetch, calling the loader on a miss.
+        Concurrent misses for the same key share a single call to the loader.
+        Failed fetches raise and are never cached.
+
+        With stale-while-revalidate enabled, an expired result that is still within the
+        cache's staleness ceiling is returned right away (flagged as stale) and refreshed
+        on a background thread.
+
+        Args:
+            key_parts (tuple): Arguments identifying the fetch, e.g. (category, page_size)
+            loader (Callable[[], list[NewsArticle]]): Function performing the real fetch
+
+        Returns:
+            CachedList: The fetched articles, annotated with the age of the data
+        """
+        key = make_cache_key(self.provider_key, *key_parts)
+        entry = self.cache.get_entry(key, allow_stale=self.stale_while_revalidate)
+
+        if entry is None:
+            entry = self.flight.do(key, lambda: self._load_and_store(key, loader))
+        elif entry.is_expired():
+            self._refresh_in_background(key, loader)
+
+        # Copy the list and the articles, so callers can extend the list and enrich the
+        # articles without touching the cached value shared with every other session
+        return CachedList((copy.copy(article) for article in entry.value),
+                          fetched_at=entry.stored_at, stale=entry.is_expired())
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], list[NewsArticle]]):
+        """
+        Starts a background refresh of a stale cache entry, unless one is already running.
+
+        Args:
+            key (str): The cache key to refresh
+            loader (Callable[[], list[NewsArticle]]): Function performing the real fetch
+        """
+        if self.flight.is_running(key):
+            return
+
+        def refresh():
+            try:
+                # Refreshes wait behind requests a user is waiting for
+                with request_priority(Priority.BACKGROUND):
+                    self.flight.do(key, lambda: self._load_and_store(key, loader))
+            except Exception as e:
+                # Keep serving the stale data; the next request will try again
+                print(f"Error refreshing {key}: {e}")
+
+        threading.Thread(target=refresh, name=f"refresh-{key}", daemon=True).start()
+
+    def _load_and_store(self, key: str, loader: Callable[[], list[NewsArticle]]) -> CacheEntry:
+        """
+        Calls the loader and caches its result. Checks the cache first, since another
+        caller may have stored the key between our miss and the start of this flight.
+
+        Args:
+            key (str): The cache key
+            loader (Callable[[], list[NewsArticle]]): Function performing the real fetch
+
+        Returns:
+            CacheEntry: The fresh cache entry
+        """
+        entry = self.cache.get_entry(key)
+        if entry is None:
+            entry = self.cache.set(key, list(loader()))
+        return entry
+
+    def _page_request(self, category: str, page: int, page_size: int,
+                      since: Optional[datetime] = None) -> tuple[str, Optional[dict], Optional[dict]]:
+        """
+        Builds the request for one page of results. Shared by the blocking and the
+        asyncio clients.
+
+        Args:
+            category (str): The news category to fetch articles for
+            page (int): The page index, starting at `first_page`
+            page_size (int): Number of articles per page
+            since (Optional[datetime], optional): Only return articles published after this date
+
+        Returns:
+            tuple[str, Optional[dict], Optional[dict]]: The URL, query parameters and headers
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support paginated fetching.")
+
+    def _parse_page(self, response_json: dict) -> list[NewsArticle]:
+        """
+        Parses one page of results into articles. Shared by the blocking and the
+        asyncio clients.
+
+        Args:
+            response_json (dict): The decoded response body
+
+        Returns:
+            list[NewsArticle]: The articles on the page
+
+        Raises:
+            KeyError: If the response JSON is missing expected keys.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support paginated fetching.")
+
+    def _fetch_page(self, category: str, page: int, page_size: int,
+                    since: Optional[datetime] = None) -> list[NewsArticle]:
+        """
+        Fetches one page of results from the provider, bypassing the cache.
+
+        Args:
+            category (str): The news category to fetch articles for
+            page (int): The page index, starting at `first_page`
+            page_size (int): Number of articles per page
+            since (Optional[datetime], optional): Only return articles published after this date
+
+        Returns:
+            list[NewsArticle]: The articles on the page
+
+        Raises:
+            requests.exceptions.HTTPError: If the API request fails.
+            KeyError: If the response JSON is missing expected keys.
+        """
+        url, params, headers = self._page_request(category, page, page_size, since)
+        try:
+            response = self._get(url, params=params, headers=headers)
+            response.raise_for_status()
+            return self._parse_page(response.json())
+
+        except requests.exceptions.RequestException as e:
+            raise requests.exceptions.HTTPError(f"Error fetching news: {e}")
+        except KeyError as e:
+            raise KeyError(f"Error parsing API response: {e}")
+
+    def iter_articles(self, category: str, max_items: Optional[int] = None,
+                      page_size: Optional[int] = None) -> Iterator[NewsArticle]:
+        """
+        Lazily iterates over the articles of a category, page by page. The next page is
+        downloaded in the background while the caller handles the current one, and
+        fetching stops as soon as the caller stops iterating or `max_items` is reached.
+        Only one page is held in memory at a time.
+
+        Args:
+            category (str): The news category to fetch articles for
+            max_items (Optional[int], optional): Maximum number of articles to yield.
+                Defaults to None (until the provider runs out of results).
+            page_size (Optional[int], optional): Articles per request. Defaults to the
+                provider's largest page.
+
+        Yields:
+            NewsArticle: The next article
+
+        Raises:
+            requests.exceptions.HTTPError: If a page request fails.
+            KeyError: If a response JSON is missing expected keys.
+        """
+        page_size = min(page_size or self.max_page_size, self.max_page_size)
+        if max_items is not None:
+            page_size = max(min(page_size, max_items), 1)
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-prefetch")
+        page = self.first_page
+        # Prefetches run with the caller's request priority
+        pending: Optional[Future] = executor.submit(
+            contextvars.copy_context().run, self._fetch_page, category, page, page_size
+        )
+        yielded = 0
+        try:
+            while pending is not None and (max_items is None or yielded < max_items):
+                articles = pending.result()
+                pending = None
+                page += 1
+
+                # Prefetch the next page only if this one was full and more items are wanted
+                wanted = max_items is None or yielded + len(articles) < max_items
+                if len(articles) >= page_size and wanted and self._serves_page(page, page_size):
+                    pending = executor.submit(
+                        contextvars.copy_context().run, self._fetch_page, category, page, page_size
+                    )
+
+                for article in articles:
+                    if max_items is not None and yielded >= max_items:
+                        break
+                    yield article
+                    yielded += 1
+        finally:
+            # Runs when the consumer stops early too; a page already downloading is discarded
+            if pending is not None:
+                pending.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _serves_page(self, page: int, page_size: int) -> bool:
+        """Returns whether the provider serves the page of results at this index and size."""
+        if self.max_pages is not None and page >= self.first_page + self.max_pages:
+            return False
+        return self.max_results is None or (page - self.first_page + 1) * page_size <= self.max_results
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a GET request through the shared connection pool, once the rate limiter
+        of this client's API key allows it. A 429 answer pauses the key for the
+        duration given in its Retry-After header. The pool applies its timeout and,
+        while the provider is failing, fails fast with CircuitOpenError.
+
+        Args:
+            url (str): The URL to request
+            **kwargs: Any keyword argument accepted by requests.Session.get
+
+        Returns:
+            requests.Response: The response
+
+        Raises:
+            RateLimitExceeded: If the daily quota of the API key is used up
+            CircuitOpenError: If the provider's circuit is open
+        """
+        provider = self.provider_key
+        self.scheduler.acquire(provider, self.api_key)
+        response = self.session_pool.get(url, hedge=self.hedge_requests, **kwargs)
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = 1.0
+            self.scheduler.penalize(provider, self.api_key, retry_after=delay)
+        return response
 
     def fetch_articles(self, source: str, category: str) -> list[NewsArticle]:
         """
@@ -62,10 +353,14 @@ class APIClient:
 
 
 class TheGuardianApi(APIClient):
-    @st.cache_data
-    def fetch_articles(_self, category: str, _page_size: int = 10) -> list[TheGuardianArticle]:
+    provider_key = "TheGuardianApi"
+    first_page = 1
+    max_page_size = 50
+
+    def fetch_articles(self, category: str, _page_size: int = 10) -> list[TheGuardianArticle]:
         """
         Fetches the latest news articles from The Guardian API.
+        Results are served from the client's cache while they are fresh.
 
         Args:
             category (str): The news category to fetch articles for.
@@ -78,45 +373,57 @@ class TheGuardianApi(APIClient):
             requests.exceptions.HTTPError: If the API request fails.
             KeyError: If the response JSON is missing expected keys.
         """
+        return self._cached_fetch((category, _page_size), lambda: self._fetch_articles(category, _page_size))
+
+    def _fetch_articles(self, category: str, _page_size: int) -> list[TheGuardianArticle]:
+        """Performs the uncached request behind fetch_articles."""
+        articles = self._fetch_page(category, self.first_page, _page_size, since=self._since(category))
+        return self._merge_delta(category, articles)
+
+    def _page_request(self, category: str, page: int, page_size: int,
+                      since: Optional[datetime] = None) -> tuple[str, dict, Optional[dict]]:
+        """Builds the request for one page of The Guardian search results."""
         params = {
-            "api-key": _self.api_key,
-            "page-size": _page_size,
+            "api-key": self.api_key,
+            "page-size": page_size,
+            "page": page,
             "show-fields": "all",
         }
 
         section = category
         params["section"] = section.lower()
 
-        try:
-            url = f"{_self.base_url}search"
-
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            response_json = response.json()
+        if since:
+            params["from-date"] = since.strftime("%Y-%m-%d")
 
-            if "response" not in response_json or "results" not in response_json["response"]:
-                raise KeyError("Unexpected response structure from The Guardian API.")
+        return f"{self.base_url}search", params, None
 
-            response = response_json["response"]
-            articles = [TheGuardianArticle(**item) for item in response["results"]]
+    def _parse_page(self, response_json: dict) -> list[TheGuardianArticle]:
+        """Parses one page of The Guardian search results."""
+        if "response" not in response_json or "results" not in response_json["response"]:
+            raise KeyError("Unexpected response structure from The Guardian API.")
 
-            return articles
+        response = response_json["response"]
+        articles = [TheGuardianArticle(**item) for item in response["results"]]
 
-        except requests.exceptions.RequestException as e:
-            raise requests.exceptions.HTTPError(f"Error fetching news: {e}")
-        except KeyError as e:
-            raise KeyError(f"Error parsing API response: {e}")
+        return articles
 
 class BBCApi(APIClient):
-    @st.cache_data
-    def fetch_articles(_self, source: str, category: str, page_size: int = 3) -> list[BBCArticle]:
+    provider_key = "BBCApi"
+    first_page = 1
+    max_page_size = 100
+    # NewsAPI.org developer keys answer "maximumResultsReached" past the first 100 results
+    max_results = 100
+
+    def fetch_articles(self, source: str, category: str, page_size: int = 10) -> list[BBCArticle]:
         """
         Fetches news articles from BBC News using the NewsAPI.org service.
+        Results are served from the client's cache while they are fresh.
 
         Args:
             source (str): The news source identifier.
             category (str): The news category to fetch articles for.
-            page_size (int, optional): Number of articles to fetch. Defaults to 3.
+            page_size (int, optional): Number of articles to fetch. Defaults to 10.
 
         Returns:
             list[BBCArticle]: A list of BBCArticle objects.
@@ -125,47 +432,61 @@ class BBCApi(APIClient):
             requests.exceptions.HTTPError: If the API request fails.
             KeyError: If the response JSON is missing expected keys.
         """
-        try:
-            params = {
-                "apiKey": _self.api_key,
-                "q": category,
-                "language": "en",
-                "pageSize": 10,
-                "sources": "bbc-news"
-            }
+        return self._cached_fetch((category, page_size), lambda: self._fetch_articles(source, category, page_size))
 
-            response = requests.get("https://newsapi.org/v2/everything", params=params)
-            response.raise_for_status()
-            response_json = response.json()
-
-            if "articles" not in response_json:
-                raise KeyError("Unexpected response structure from NewsAPI.org.")
-
-            articles_data = response_json["articles"]
-            articles = []
-            for item in articles_data:
-                article_dict = {
-                    "title": item.get("title", ""),
-                    "description": item.get("description", ""),
-                    "url": item.get("url", ""),
-                    "image_url": item.get("urlToImage", ""),
-                    "published_at": item.get("publishedAt", ""),
-                    "source": item.get("source", {}).get("name", "BBC News")
-                }
-                articles.append(BBCArticle.from_dict(article_dict))
+    def _fetch_articles(self, source: str, category: str, page_size: int) -> list[BBCArticle]:
+        """Performs the uncached request behind fetch_articles."""
+        articles = self._fetch_page(category, self.first_page, page_size, since=self._since(category))
+        return self._merge_delta(category, articles)
 
-            return articles
+    def _page_request(self, category: str, page: int, page_size: int,
+                      since: Optional[datetime] = None) -> tuple[str, dict, Optional[dict]]:
+        """Builds the request for one page of BBC News results from NewsAPI.org."""
+        params = {
+            "apiKey": self.api_key,
+            "q": category,
+            "language": "en",
+            "pageSize": page_size,
+            "page": page,
+            "sources": "bbc-news"
+        }
 
-        except requests.exceptions.RequestException as e:
-            raise requests.exceptions.HTTPError(f"Error fetching news: {e}")
-        except KeyError as e:
-            raise KeyError(f"Error parsing API response: {e}")
+        if since:
+            params["from"] = since.strftime("%Y-%m-%dT%H:%M:%S")
+
+        return "https://newsapi.org/v2/everything", params, None
+
+    def _parse_page(self, response_json: dict) -> list[BBCArticle]:
+        """Parses one page of BBC News results from NewsAPI.org."""
+        if "articles" not in response_json:
+            raise KeyError("Unexpected response structure from NewsAPI.org.")
+
+        articles_data = response_json["articles"]
+        articles = []
+        for item in articles_data:
+            article_dict = {
+                "title": item.get("title", ""),
+                "description": item.get("description", ""),
+                "url": item.get("url", ""),
+                "image_url": item.get("urlToImage", ""),
+                "published_at": item.get("publishedAt", ""),
+                "source": item.get("source", {}).get("name", "BBC News")
+            }
+            articles.append(BBCArticle.from_dict(article_dict))
+
+        return articles
 
 class NYTNewsApi(APIClient):
-    @st.cache_data
-    def fetch_articles(_self, category: str) -> list[NYTArticle]:
+    provider_key = "NYTNewsApi"
+    # The Article Search API pages from 0 and always returns 10 documents per page
+    first_page = 0
+    max_page_size = 10
+    max_pages = 100
+
+    def fetch_articles(self, category: str) -> list[NYTArticle]:
         """
         Fetches the latest news articles from The New York Times API.
+        Results are served from the client's cache while they are fresh.
 
         Args:
             category (str): The news category to fetch articles for.
@@ -177,42 +498,48 @@ class NYTNewsApi(APIClient):
             requests.exceptions.HTTPError: If the API request fails.
             KeyError: If the response JSON is missing expected keys.
         """
+        return self._cached_fetch((category,), lambda: self._fetch_articles(category))
+
+    def _fetch_articles(self, category: str) -> list[NYTArticle]:
+        """Performs the uncached request behind fetch_articles."""
+        articles = self._fetch_page(category, self.first_page, self.max_page_size, since=self._since(category))
+        return self._merge_delta(category, articles)
+
+    def _page_request(self, category: str, page: int, page_size: int,
+                      since: Optional[datetime] = None) -> tuple[str, dict, Optional[dict]]:
+        """Builds the request for one page of New York Times search results (page_size is fixed by the API)."""
         parameters = {
-            "api-key": _self.api_key,
+            "api-key": self.api_key,
             "q": category,
             "sort": "best",
-            "begin_date": "20200101",
+            "begin_date": since.strftime("%Y%m%d") if since else "20200101",
             "end_date": datetime.today().strftime("%Y%m%d"),
             "fq": 'type:("Article")'
         }
+        if page != self.first_page:
+            parameters["page"] = page
         headers = {
             "Accept": "application/json"
         }
-        try:
-            response = requests.get(
-                url=f"{_self.base_url}articlesearch.json",
-                params=parameters,
-                headers=headers
-            )
-            response.raise_for_status()
-            response_json = response.json()
+        return f"{self.base_url}articlesearch.json", parameters, headers
 
-            if "response" not in response_json or "docs" not in response_json["response"]:
-                raise KeyError("Unexpected response structure from The NYT API.")
+    def _parse_page(self, response_json: dict) -> list[NYTArticle]:
+        """Parses one page of New York Times search results."""
+        if "response" not in response_json or "docs" not in response_json["response"]:
+            raise KeyError("Unexpected response structure from The NYT API.")
 
-            articles = [NYTArticle(**art) for art in response_json["response"]["docs"]]
-            return articles
-
-        except requests.exceptions.RequestException as e:
-            raise requests.exceptions.HTTPError(f"Error fetching news: {e}")
-        except KeyError as e:
-            raise KeyError(f"Error parsing API response: {e}")
+        articles = [NYTArticle(**art) for art in response_json["response"]["docs"]]
+        return articles
 
 class GNewsApi(APIClient):
-    @st.cache_data
-    def fetch_articles(_self, category: str, page_size: int = 10) -> list[GNewsArticle]:
+    provider_key = "GNewsApi"
+    first_page = 1
+    max_page_size = 100
+
+    def fetch_articles(self, category: str, page_size: int = 10) -> list[GNewsArticle]:
         """
         Fetches the latest news articles from GNews API.
+        Results are served from the client's cache while they are fresh.
 
         Args:
             category (str): The news category to fetch articles for.
@@ -225,22 +552,31 @@ class GNewsApi(APIClient):
             requests.exceptions.HTTPError: If the API request fails.
             KeyError: If the response JSON is missing expected keys.
         """
+        return self._cached_fetch((category, page_size), lambda: self._fetch_articles(category, page_size))
+
+    def _fetch_articles(self, category: str, page_size: int) -> list[GNewsArticle]:
+        """Performs the uncached request behind fetch_articles."""
+        articles = self._fetch_page(category, self.first_page, page_size, since=self._since(category))
+        return self._merge_delta(category, articles)
+
+    def _page_request(self, category: str, page: int, page_size: int,
+                      since: Optional[datetime] = None) -> tuple[str, Optional[dict], Optional[dict]]:
+        """Builds the request for one page of GNews top headlines."""
         category = category.lower()
 
-        try:
-            url = f"{_self.base_url}top-headlines?category={category}&apikey={_self.api_key}&lang=en"
+        url = f"{self.base_url}top-headlines?category={category}&apikey={self.api_key}&lang=en&max={page_size}"
+        if page != self.first_page:
+            url += f"&page={page}"
 
-            response = requests.get(url)
-            response.raise_for_status()
-            response_json = response.json()
+        if since:
+            url += f"&from={since.strftime('%Y-%m-%dT%H:%M:%SZ')}"
 
-            if "articles" not in response_json:
-                raise KeyError("Unexpected response structure from GNews API.")
+        return url, None, None
 
-            articles = [GNewsArticle(**item) for item in response_json["articles"]]
-            return articles
+    def _parse_page(self, response_json: dict) -> list[GNewsArticle]:
+        """Parses one page of GNews top headlines."""
+        if "articles" not in response_json:
+            raise KeyError("Unexpected response structure from GNews API.")
 
-        except requests.exceptions.RequestException as e:
-            raise requests.exceptions.HTTPError(f"Error fetching news: {e}")
-        except KeyError as e:
-            raise KeyError(f"Error parsing API response: {e}")
\ No newline at end of file
+        articles = [GNewsArticle(**item) for item in response_json["articles"]]
+        return articles
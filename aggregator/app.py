@@ -2,10 +2,16 @@ from datetime import datetime
 import streamlit as st
 from aggregator.api_client import GNewsApi, TheGuardianApi, BBCApi, NYTNewsApi, APIClient
 from aggregator.scraper import ArticleScraper
+from aggregator.rate_limiter import Priority
+from aggregator.fetcher import FanOutFetcher
+from aggregator.dedup import collapse_duplicates
+from aggregator.watermarks import get_shared_watermarks
 from aggregator.processor import NewsProcessor
 from aggregator.visualizer import NewsVisualizer
+from entities.article_batch import ArticleBatch
 from entities.news_article import NewsArticle
 from entities.user_input import UserInput
+import math
 import os
 
 class AggregatorApp:
@@ -18,29 +24,46 @@ class AggregatorApp:
 		self.source_selected = None
 		self.category_selected = None
 		
-		# Initialize API clients with their respective credentials
+		# Initialize API clients with their respective credentials.
+		# Refreshes only ask each provider for articles newer than the ones already held.
 		self.api_client = APIClient(api_key="", base_url="")
 		self.the_guardian_api = TheGuardianApi(
 			api_key=os.getenv("THE_GUARDIAN_API_KEY"),
-			base_url=os.getenv("THE_GUARDIAN_BASE_URL")
+			base_url=os.getenv("THE_GUARDIAN_BASE_URL"),
+			watermarks=get_shared_watermarks()
 		)
 		self.bbc_api = BBCApi(
 			api_key=os.getenv("BBC_API_KEY"),
-			base_url=os.getenv("BBC_BASE_URL")
+			base_url=os.getenv("BBC_BASE_URL"),
+			watermarks=get_shared_watermarks()
 		)
 		self.nyt_api = NYTNewsApi(
 			api_key=os.getenv("NYT_API_KEY"),
-			base_url=os.getenv("NYT_BASE_URL")
+			base_url=os.getenv("NYT_BASE_URL"),
+			watermarks=get_shared_watermarks()
 		)
 		self.gnews_api = GNewsApi(
 			api_key=os.getenv("GNEWS_API_KEY"),
-			base_url=os.getenv("GNEWS_BASE_URL")
+			base_url=os.getenv("GNEWS_BASE_URL"),
+			watermarks=get_shared_watermarks()
 		)
 		
+		# Fetches every source concurrently when "All" is selected
+		self.fetcher = FanOutFetcher(timeout=10.0)
+		self.failed_sources = []
+		self.data_age = 0.0
+		self.data_stale = False
+		# Articles of stories already listed from another source, by URL of the article shown
+		self.duplicates = {}
+
 		# Initialize processors and visualizers
 		self.processor = NewsProcessor()
 		self.visualizer = NewsVisualizer()
 		self.articles = []
+		self.scraper = None
+		# Articles shown per page of the latest news; those on screen are scraped first
+		self.page_size = 10
+		self.visible_articles = []
 
 	def get_article_details(self, article_url: str) -> NewsArticle:
 		"""
@@ -88,6 +111,9 @@ class AggregatorApp:
 
 			if article_id and article_source:
 				article = self.get_article_details(article_id)
+				# Scrape the full article now, unless it was prefetched or opened before
+				if self.scraper is not None:
+					article = self.scraper.enrich(article)
 
 				if article:
 					st.header(article.title)
@@ -95,6 +121,9 @@ class AggregatorApp:
 						st.image(article.feature_image_url, caption=article.title)
 					st.markdown(article.get_article_full_md(), unsafe_allow_html=True)
 					st.markdown(article.url)
+					others = self.duplicates.get(article.url, [])
+					if others:
+						st.markdown("**Also reported by:** " + ", ".join(f"[{other.source}]({other.url})" for other in others))
 
 	''' Renders each article in the latest news section '''
 
@@ -123,7 +152,11 @@ class AggregatorApp:
 		Renders the latest news section with all fetched articles.
 		"""
 		st.subheader("Latest News")
-		for i, article in enumerate(self.articles):
+		pages = max(1, math.ceil(len(self.articles) / self.page_size))
+		page = st.number_input("Page", min_value=1, max_value=pages, value=1, key="news_page") if pages > 1 else 1
+		start = (page - 1) * self.page_size
+		self.visible_articles = self.articles[start:start + self.page_size]
+		for i, article in enumerate(self.visible_articles, start=start):
 			self.render_article(key=i, article=article)
 
 	''' Renders the data visualization section '''
@@ -134,6 +167,8 @@ class AggregatorApp:
 		articles by day, and word count analysis.
 		"""
 		st.subheader("Data Visualizations")
+		# The articles are put in columns once for all the plots
+		batch = ArticleBatch.from_articles(self.articles)
 
 		col1, col2 = st.columns(2)
 		col3, col4 = st.columns(2)
@@ -141,20 +176,20 @@ class AggregatorApp:
 		with st.container(border=True):
 			with col1:
 				st.markdown("**Source Distribution Chart**")
-				plot = self.visualizer.source_distribution_plot(self.articles)
+				plot = self.visualizer.source_distribution_plot(batch)
 				st.pyplot(plot)
 
 			with col2:
 				st.markdown("**Word Cloud by Category**")
-				plot = self.visualizer.word_cloud_plot(self.articles)
+				plot = self.visualizer.word_cloud_plot(batch)
 				st.pyplot(plot)
 
 			with col3:
-				plot = self.visualizer.articles_by_day_plot(self.articles)
+				plot = self.visualizer.articles_by_day_plot(batch)
 				st.plotly_chart(plot, key="chart_3")
 
 			with col4:
-				plot = self.visualizer.number_of_words_plot(self.articles)
+				plot = self.visualizer.number_of_words_plot(batch)
 				st.plotly_chart(plot, key="chart_4")
 
 	''' Renders the footer with status and last update '''
@@ -167,7 +202,13 @@ class AggregatorApp:
 		today = datetime.today()
 		current_hour = today.strftime('%Y-%m-%d %H:%M:%S')
 		col1_text = f"Status: {len(self.articles)} articles loaded. Source: {source}"
-		col2_text = f"<div style='text-align: right'>Last updated: {current_hour}</div>"
+		collapsed = sum(len(others) for others in self.duplicates.values())
+		if collapsed:
+			col1_text += f" ({collapsed} duplicates hidden)"
+		data_age = f"{int(self.data_age // 60)} min ago" if self.data_age >= 60 else "just now"
+		if self.data_stale:
+			data_age += " (refreshing in background)"
+		col2_text = f"<div style='text-align: right'>Last updated: {current_hour} | Data fetched: {data_age}</div>"
 
 		with col1:
 			st.text(col1_text)
@@ -196,16 +237,22 @@ class AggregatorApp:
 		with st.spinner("Fetching news..."):
 			# When "All" is selected, fetch articles from all APIs
 			if self.source_selected == "All":
-				theguarding_articles = self.the_guardian_api.fetch_articles(category=user_input.category)
-				bbc_articles = self.bbc_api.fetch_articles(category=user_input.category, source=user_input.source)
-				gnews_articles = self.gnews_api.fetch_articles(category=user_input.category)
-				nyt_articles = self.nyt_api.fetch_articles(category=user_input.category)
-				articles = (
-						theguarding_articles +
-						bbc_articles +
-						gnews_articles +
-						nyt_articles
-				)
+				result = self.fetcher.fetch_all({
+					"The Guardian": lambda: self.the_guardian_api.fetch_articles(category=user_input.category),
+					"BBC News": lambda: self.bbc_api.fetch_articles(category=user_input.category, source=user_input.source),
+					"GNews": lambda: self.gnews_api.fetch_articles(category=user_input.category),
+					"New York Times": lambda: self.nyt_api.fetch_articles(category=user_input.category),
+				})
+				articles = result.articles
+				self.failed_sources = result.failed_sources
+				self.data_age = result.max_age
+				self.data_stale = bool(result.stale_sources)
+				if result.failed_sources:
+					st.warning(f"Some sources could not be loaded: {', '.join(result.failed_sources)}")
+				# The same wire story often comes from several sources; it is listed and scraped once
+				deduplicated = collapse_duplicates(articles)
+				articles = deduplicated.articles
+				self.duplicates = deduplicated.duplicates
 			# When "The Guardian" is selected, fetch articles from The Guardian API
 			elif self.source_selected == "The Guardian":
 				articles = self.the_guardian_api.fetch_articles(user_input.category)
@@ -216,10 +263,22 @@ class AggregatorApp:
 			elif self.source_selected == "GNews":
 				articles = self.gnews_api.fetch_articles(user_input.category)
 
-			# Enrich articles with additional information through scraping
+			if self.source_selected != "All":
+				self.duplicates = {}
+				# Cached results report how old their data is
+				self.data_age = getattr(articles, "age", 0.0)
+				self.data_stale = getattr(articles, "stale", False)
+
+			# The list renders from API data alone; articles are scraped when their details are opened,
+			# downloading each page only up to the end of the article body
 			# Additional functions can be added here
-			scraper = ArticleScraper(articles)
-			self.articles = scraper.get_enriched_articles()
+			previous = st.session_state.get("scraper")
+			if previous is not None:
+				# Off-screen articles queued by the previous run may no longer be listed
+				previous.cancel_prefetches()
+			self.scraper = ArticleScraper(articles, lazy=True, streaming=True)
+			st.session_state["scraper"] = self.scraper
+			self.articles = self.scraper.get_enriched_articles()
 
 			# Call rendering functions for each tab
 			with tab1:
@@ -228,5 +287,9 @@ class AggregatorApp:
 			with tab2:
 				self.render_visualizations()
 
+			# Articles on screen are scraped first, the rest of the list afterwards
+			self.scraper.prefetch(self.visible_articles, priority=Priority.INTERACTIVE)
+			self.scraper.prefetch(self.articles, priority=Priority.BACKGROUND)
+
 		# Call the footer rendering function
 		self.render_footer()
\ No newline at end of file
@@ -0,0 +1,329 @@
+from entities.news_article import GNewsArticle, BBCArticle, NewsArticle, TheGuardianArticle, NYTArticle
+from aggregator.api_client import APIClient, BBCApi, GNewsApi, NYTNewsApi, TheGuardianApi
+from aggregator.cache import CacheBackend, CacheEntry, CachedList, get_default_cache, make_cache_key
+from aggregator.rate_limiter import Priority, RequestScheduler, get_shared_scheduler, request_priority
+from aggregator.watermarks import WatermarkStore
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from datetime import datetime
+import asyncio
+import copy
+
+import aiohttp
+import requests
+
+
+class AsyncAPIClient(APIClient):
+    """
+    asyncio counterpart of APIClient. Requests run on the event loop over one pooled
+    aiohttp session, so hundreds of fetches can be in flight without a thread each.
+    Request building and parsing are inherited from the blocking clients, so both
+    return the same `entities.news_article` objects and raise the same errors.
+
+    Use it as an async context manager, or call `close()` when done.
+    """
+
+    def __init__(self, api_key, base_url, session: Optional[aiohttp.ClientSession] = None,
+                 cache: Optional[CacheBackend] = None, stale_while_revalidate: bool = True,
+                 watermarks: Optional[WatermarkStore] = None, scheduler: Optional[RequestScheduler] = None,
+                 timeout: float = 10.0, max_connections: int = 100, max_connections_per_host: int = 20):
+        """
+        Initialize the client. The aiohttp session is created on first use, inside the
+        running event loop, unless one is passed in.
+
+        Args:
+            api_key: API access key
+            base_url: Base URL for API requests
+            session (Optional[aiohttp.ClientSession], optional): Session to send requests with,
+                e.g. one shared by every client of a service. It is not closed by `close()`.
+                Defaults to None.
+            cache (Optional[CacheBackend], optional): Fetch results cache. Defaults to the default cache.
+            stale_while_revalidate (bool, optional): Serve expired results while refreshing. Defaults to True.
+            watermarks (Optional[WatermarkStore], optional): High-water marks for delta fetching.
+                Defaults to None.
+            scheduler (Optional[RequestScheduler], optional): Rate limiter. Defaults to the shared scheduler.
+            timeout (float, optional): Total timeout of a request in seconds. Defaults to 10.0.
+            max_connections (int, optional): Connections open at once. Defaults to 100.
+            max_connections_per_host (int, optional): Connections open at once per host. Defaults to 20.
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.cache = cache if cache is not None else get_default_cache()
+        self.stale_while_revalidate = stale_while_revalidate
+        self.watermarks = watermarks
+        self.scheduler = scheduler or get_shared_scheduler()
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+
+        self._session = session
+        self._owns_session = session is None
+        self._in_flight: dict[str, asyncio.Future] = {}  # Coalesces identical concurrent fetches
+        self._background: set[asyncio.Task] = set()  # Keeps refresh tasks alive until they finish
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The aiohttp session, created on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections,
+                                             limit_per_host=self.max_connections_per_host)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        """Waits for background refreshes and closes the session if the client created it."""
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+
+    async def _cached_fetch(self, key_parts: tuple,
+                            loader: Callable[[], Awaitable[list[NewsArticle]]]) -> CachedList:
+        """
+        Returns the cached result of a fetch, awaiting the loader on a miss. Concurrent
+        misses for the same key share one call to the loader, and expired results are
+        served while a background task refreshes them (see APIClient._cached_fetch).
+
+        Args:
+            key_parts (tuple): Arguments identifying the fetch, e.g. (category, page_size)
+            loader (Callable[[], Awaitable[list[NewsArticle]]]): Coroutine function performing the real fetch
+
+        Returns:
+            CachedList: The fetched articles, annotated with the age of the data
+        """
+        key = make_cache_key(self.provider_key, *key_parts)
+        entry = self.cache.get_entry(key, allow_stale=self.stale_while_revalidate)
+
+        if entry is None:
+            entry = await self._load_once(key, loader)
+        elif entry.is_expired() and key not in self._in_flight:
+            task = asyncio.create_task(self._refresh(key, loader))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+        # Copies of the articles, as in APIClient._cached_fetch
+        return CachedList((copy.copy(article) for article in entry.value),
+                          fetched_at=entry.stored_at, stale=entry.is_expired())
+
+    async def _load_once(self, key: str, loader: Callable[[], Awaitable[list[NewsArticle]]]) -> CacheEntry:
+        """Runs the loader and caches its result, sharing the call with concurrent callers."""
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            return await asyncio.shield(flight)
+
+        flight = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = flight
+        try:
+            entry = self.cache.get_entry(key)
+            if entry is None:
+                entry = self.cache.set(key, list(await loader()))
+            flight.set_result(entry)
+            return entry
+        except BaseException as e:
+            flight.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting for it
+            flight.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _refresh(self, key: str, loader: Callable[[], Awaitable[list[NewsArticle]]]):
+        """Refreshes a stale cache entry, waiting behind requests a user is waiting for."""
+        with request_priority(Priority.BACKGROUND):
+            try:
+                await self._load_once(key, loader)
+            except Exception as e:
+                # Keep serving the stale data; the next request will try again
+                print(f"Error refreshing {key}: {e}")
+
+    async def _acquire(self):
+        """Waits on the event loop until the rate limiter of this client's API key allows a request."""
+        while True:
+            wait = self.scheduler.acquire_nowait(self.provider_key, self.api_key)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def _get_json(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None) -> dict:
+        """
+        Sends a GET request once the rate limiter allows it and decodes the JSON body.
+        A 429 answer pauses the API key for the duration given in its Retry-After header.
+
+        Args:
+            url (str): The URL to request
+            params (Optional[dict], optional): Query parameters; None values are left out. Defaults to None.
+            headers (Optional[dict], optional): Request headers. Defaults to None.
+
+        Returns:
+            dict: The decoded response body
+
+        Raises:
+            aiohttp.ClientError: If the request fails or the status is an error
+            RateLimitExceeded: If the daily quota of the API key is used up
+        """
+        await self._acquire()
+        query = {k: str(v) for k, v in params.items() if v is not None} if params else None
+        async with self.session.get(url, params=query, headers=headers) as response:
+            if response.status == 429:
+                try:
+                    delay = float(response.headers.get("Retry-After", ""))
+                except ValueError:
+                    delay = 1.0
+                self.scheduler.penalize(self.provider_key, self.api_key, retry_after=delay)
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def _fetch_page(self, category: str, page: int, page_size: int,
+                          since: Optional[datetime] = None) -> list[NewsArticle]:
+        """
+        Fetches one page of results from the provider, bypassing the cache.
+
+        Args:
+            category (str): The news category to fetch articles for
+            page (int): The page index, starting at `first_page`
+            page_size (int): Number of articles per page
+            since (Optional[datetime], optional): Only return articles published after this date
+
+        Returns:
+            list[NewsArticle]: The articles on the page
+
+        Raises:
+            requests.exceptions.HTTPError: If the API request fails.
+            KeyError: If the response JSON is missing expected keys.
+        """
+        url, params, headers = self._page_request(category, page, page_size, since)
+        try:
+            return self._parse_page(await self._get_json(url, params=params, headers=headers))
+
+        except (aiohttp.ClientError, asyncio.TimeoutError, requests.exceptions.RequestException) as e:
+            raise requests.exceptions.HTTPError(f"Error fetching news: {e}")
+        except KeyError as e:
+            raise KeyError(f"Error parsing API response: {e}")
+
+    async def iter_articles(self, category: str, max_items: Optional[int] = None,
+                            page_size: Optional[int] = None) -> AsyncIterator[NewsArticle]:
+        """
+        Lazily iterates over the articles of a category, page by page, downloading the
+        next page while the caller handles the current one (see APIClient.iter_articles).
+
+        Args:
+            category (str): The news category to fetch articles for
+            max_items (Optional[int], optional): Maximum number of articles to yield.
+                Defaults to None (until the provider runs out of results).
+            page_size (Optional[int], optional): Articles per request. Defaults to the
+                provider's largest page.
+
+        Yields:
+            NewsArticle: The next article
+        """
+        page_size = min(page_size or self.max_page_size, self.max_page_size)
+        if max_items is not None:
+            page_size = max(min(page_size, max_items), 1)
+
+        page = self.first_page
+        pending: Optional[asyncio.Task] = asyncio.create_task(self._fetch_page(category, page, page_size))
+        yielded = 0
+        try:
+            while pending is not None and (max_items is None or yielded < max_items):
+                articles = await pending
+                pending = None
+                page += 1
+
+                wanted = max_items is None or yielded + len(articles) < max_items
+                if len(articles) >= page_size and wanted and self._serves_page(page, page_size):
+                    pending = asyncio.create_task(self._fetch_page(category, page, page_size))
+
+                for article in articles:
+                    if max_items is not None and yielded >= max_items:
+                        break
+                    yield article
+                    yielded += 1
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+
+class AsyncTheGuardianApi(AsyncAPIClient, TheGuardianApi):
+    async def fetch_articles(self, category: str, _page_size: int = 10) -> list[TheGuardianArticle]:
+        """
+        Fetches the latest news articles from The Guardian API (see TheGuardianApi.fetch_articles).
+
+        Args:
+            category (str): The news category to fetch articles for.
+            _page_size (int, optional): The number of articles to fetch. Defaults to 10.
+
+        Returns:
+            list[TheGuardianArticle]: A list of TheGuardianArticle objects.
+        """
+        return await self._cached_fetch((category, _page_size), lambda: self._fetch_articles(category, _page_size))
+
+    async def _fetch_articles(self, category: str, _page_size: int) -> list[TheGuardianArticle]:
+        """Performs the uncached request behind fetch_articles."""
+        articles = await self._fetch_page(category, self.first_page, _page_size, since=self._since(category))
+        return self._merge_delta(category, articles)
+
+
+class AsyncBBCApi(AsyncAPIClient, BBCApi):
+    async def fetch_articles(self, source: str, category: str, page_size: int = 10) -> list[BBCArticle]:
+        """
+        Fetches news articles from BBC News using the NewsAPI.org service (see BBCApi.fetch_articles).
+
+        Args:
+            source (str): The news source identifier.
+            category (str): The news category to fetch articles for.
+            page_size (int, optional): Number of articles to fetch. Defaults to 10.
+
+        Returns:
+            list[BBCArticle]: A list of BBCArticle objects.
+        """
+        return await self._cached_fetch((category, page_size), lambda: self._fetch_articles(source, category, page_size))
+
+    async def _fetch_articles(self, source: str, category: str, page_size: int) -> list[BBCArticle]:
+        """Performs the uncached request behind fetch_articles."""
+        articles = await self._fetch_page(category, self.first_page, page_size, since=self._since(category))
+        return self._merge_delta(category, articles)
+
+
+class AsyncNYTNewsApi(AsyncAPIClient, NYTNewsApi):
+    async def fetch_articles(self, category: str) -> list[NYTArticle]:
+        """
+        Fetches the latest news articles from The New York Times API (see NYTNewsApi.fetch_articles).
+
+        Args:
+            category (str): The news category to fetch articles for.
+
+        Returns:
+            list[NYTArticle]: A list of NYTArticle objects.
+        """
+        return await self._cached_fetch((category,), lambda: self._fetch_articles(category))
+
+    async def _fetch_articles(self, category: str) -> list[NYTArticle]:
+        """Performs the uncached request behind fetch_articles."""
+        articles = await self._fetch_page(category, self.first_page, self.max_page_size, since=self._since(category))
+        return self._merge_delta(category, articles)
+
+
+class AsyncGNewsApi(AsyncAPIClient, GNewsApi):
+    async def fetch_articles(self, category: str, page_size: int = 10) -> list[GNewsArticle]:
+        """
+        Fetches the latest news articles from GNews API (see GNewsApi.fetch_articles).
+
+        Args:
+            category (str): The news category to fetch articles for.
+            page_size (int, optional): The number of articles to fetch. Defaults to 10.
+
+        Returns:
+            list[GNewsArticle]: A list of GNewsArticle objects.
+        """
+        return await self._cached_fetch((category, page_size), lambda: self._fetch_articles(category, page_size))
+
+    async def _fetch_articles(self, category: str, page_size: int) -> list[GNewsArticle]:
+        """Performs the uncached request behind fetch_articles."""
+        articles = await self._fetch_page(category, self.first_page, page_size, since=self._since(category))
+        return self._merge_delta(category, articles)
@@ -0,0 +1,531 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+
+# Sentinel returned by CacheBackend.get when a key is missing
+MISSING = object()
+
+
+@dataclass
+class CacheEntry:
+    """
+    A cached value together with its bookkeeping data.
+
+    Attributes:
+        key (str): The cache key
+        value (Any): The cached value
+        stored_at (float): Unix time the value was stored
+        expires_at (Optional[float]): Unix time the value expires, None if it never expires
+        size (int): Approximate size of the value in bytes
+    """
+    key: str
+    value: Any
+    stored_at: float
+    expires_at: Optional[float]
+    size: int
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Returns True when the entry has passed its expiry time."""
+        return self.expires_at is not None and (now or time.time()) >= self.expires_at
+
+    @property
+    def age(self) -> float:
+        """Seconds since the value was stored."""
+        return max(time.time() - self.stored_at, 0.0)
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters describing how a cache is performing.
+
+    Attributes:
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that found nothing usable
+        evictions (int): Entries removed to respect the size bounds
+        expirations (int): Entries removed because their TTL passed
+        stale_hits (int): Lookups answered with an expired entry still within the staleness ceiling
+        entries (int): Entries currently stored
+        bytes (int): Approximate bytes currently stored
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    stale_hits: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from the cache (0.0 to 1.0)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def make_cache_key(*parts) -> str:
+    """
+    Builds a readable cache key from its parts without pickling them.
+
+    Args:
+        *parts: Values identifying the cached call, e.g. the client name and arguments
+
+    Returns:
+        str: The cache key
+    """
+    return ":".join(str(part) for part in parts)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimates the memory footprint of a value from its pickled size.
+
+    Args:
+        value (Any): The value to measure
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class CachedList(list):
+    """
+    List of cached results annotated with the freshness of the data.
+
+    Attributes:
+        fetched_at (float): Unix time the data was fetched from the provider
+        stale (bool): True when the data is past its TTL and a refresh is running
+    """
+
+    def __init__(self, items=(), fetched_at: Optional[float] = None, stale: bool = False):
+        super().__init__(items)
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+        self.stale = stale
+
+    @property
+    def age(self) -> float:
+        """Seconds since the data was fetched from the provider."""
+        return max(time.time() - self.fetched_at, 0.0)
+
+
+class CacheBackend:
+    """
+    Base class for cache backends used by the API clients.
+    Subclasses store entries and must implement get_entry, set, delete and clear.
+    """
+
+    def __init__(self, ttl: Optional[float] = 900, max_stale: float = 0):
+        """
+        Initialize the backend.
+
+        Args:
+            ttl (Optional[float], optional): Default time to live in seconds, None to never expire.
+                Defaults to 900.
+            max_stale (float, optional): Seconds an expired entry is kept after its TTL so it can
+                still be served while it is refreshed (stale-while-revalidate). Defaults to 0.
+        """
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._stats = CacheStats()
+        self._lock = threading.RLock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns the cached value for a key if it exists and has not expired.
+
+        Args:
+            key (str): The cache key
+            default (Any, optional): Value returned on a miss. Defaults to None.
+
+        Returns:
+            Any: The cached value or the default
+        """
+        entry = self.get_entry(key)
+        return entry.value if entry is not None else default
+
+    def get_entry(self, key: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        """
+        Returns the entry stored for a key, or None.
+
+        Args:
+            key (str): The cache key
+            allow_stale (bool, optional): Also return expired entries that are still within the
+                staleness ceiling. Defaults to False.
+
+        Returns:
+            Optional[CacheEntry]: The entry, or None on a miss
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> CacheEntry:
+        """
+        Stores a value, using the backend TTL when `ttl` is None.
+
+        Args:
+            key (str): The cache key
+            value (Any): The value to store
+            ttl (Optional[float], optional): Time to live in seconds. Defaults to the backend TTL.
+
+        Returns:
+            CacheEntry: The entry built for the value
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """Removes a key from the cache."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Removes every entry from the cache."""
+        raise NotImplementedError
+
+    @property
+    def stats(self) -> CacheStats:
+        """Returns a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def _is_past_ceiling(self, entry: CacheEntry, now: float) -> bool:
+        """Returns True when an entry is too old to be served even as stale data."""
+        return entry.expires_at is not None and now >= entry.expires_at + self.max_stale
+
+    def _lookup(self, entry: Optional[CacheEntry], allow_stale: bool) -> tuple[Optional[CacheEntry], bool]:
+        """
+        Applies the TTL and staleness rules to a stored entry and updates the counters
+        (lock must be held).
+
+        Args:
+            entry (Optional[CacheEntry]): The stored entry, None if nothing is stored
+            allow_stale (bool): Whether expired entries within the ceiling may be returned
+
+        Returns:
+            tuple[Optional[CacheEntry], bool]: The entry to return (None on a miss) and
+            whether the stored entry should be deleted
+        """
+        now = time.time()
+        if entry is None:
+            self._stats.misses += 1
+            return None, False
+
+        if entry.is_expired(now):
+            if self._is_past_ceiling(entry, now):
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None, True
+            if not allow_stale:
+                self._stats.misses += 1
+                return None, False
+            self._stats.stale_hits += 1
+
+        self._stats.hits += 1
+        return entry, False
+
+    def _new_entry(self, key: str, value: Any, ttl: Optional[float]) -> CacheEntry:
+        """Builds an entry stamped with the current time and the effective TTL."""
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        return CacheEntry(
+            key=key,
+            value=value,
+            stored_at=now,
+            expires_at=now + ttl if ttl is not None else None,
+            size=estimate_size(value)
+        )
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-process LRU cache bounded by number of entries and total bytes.
+    Values are returned by reference, so callers should not mutate them.
+    """
+
+    def __init__(self, ttl: Optional[float] = 900, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 max_stale: float = 0):
+        """
+        Initialize the memory cache.
+
+        Args:
+            ttl (Optional[float], optional): Default time to live in seconds. Defaults to 900.
+            max_entries (int, optional): Maximum number of entries. Defaults to 256.
+            max_bytes (int, optional): Maximum approximate size of all values. Defaults to 64 MiB.
+            max_stale (float, optional): Seconds expired entries stay servable as stale data. Defaults to 0.
+        """
+        super().__init__(ttl=ttl, max_stale=max_stale)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+
+    def get_entry(self, key: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        with self._lock:
+            entry, drop = self._lookup(self._entries.get(key), allow_stale)
+            if drop:
+                self._remove(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> CacheEntry:
+        entry = self._new_entry(key, value, ttl)
+        self.put_entry(entry)
+        return entry
+
+    def put_entry(self, entry: CacheEntry):
+        """
+        Stores a prepared entry, keeping its original timestamps.
+
+        Args:
+            entry (CacheEntry): The entry to store
+        """
+        with self._lock:
+            if entry.key in self._entries:
+                self._remove(entry.key)
+            if entry.size > self.max_bytes:
+                return
+
+            self._entries[entry.key] = entry
+            self._bytes += entry.size
+            self._evict()
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._update_gauges()
+
+    def _remove(self, key: str):
+        """Removes an entry and updates the byte count (lock must be held)."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        self._update_gauges()
+
+    def _evict(self):
+        """Drops least recently used entries until both bounds hold (lock must be held)."""
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._stats.evictions += 1
+        self._update_gauges()
+
+    def _update_gauges(self):
+        self._stats.entries = len(self._entries)
+        self._stats.bytes = self._bytes
+
+
+class DiskCache(CacheBackend):
+    """
+    On-disk cache storing one pickle file per key, bounded by number of entries and
+    total bytes. Survives restarts and can be shared by several worker processes.
+    """
+
+    def __init__(self, directory: str, ttl: Optional[float] = 3600, max_entries: int = 4096,
+                 max_bytes: int = 512 * 1024 * 1024, max_stale: float = 0):
+        """
+        Initialize the disk cache.
+
+        Args:
+            directory (str): Directory where the cache files are stored
+            ttl (Optional[float], optional): Default time to live in seconds. Defaults to 3600.
+            max_entries (int, optional): Maximum number of files. Defaults to 4096.
+            max_bytes (int, optional): Maximum total size of the files. Defaults to 512 MiB.
+            max_stale (float, optional): Seconds expired entries stay servable as stale data. Defaults to 0.
+        """
+        super().__init__(ttl=ttl, max_stale=max_stale)
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        """Returns the file path used to store a key."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.pkl")
+
+    def get_entry(self, key: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, "rb") as f:
+                    stored: Optional[CacheEntry] = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+                stored = None
+
+            if stored is not None and stored.key != key:
+                stored = None  # Hash collision, treat as a miss
+
+            entry, drop = self._lookup(stored, allow_stale)
+            if drop:
+                self._unlink(path)
+            if entry is not None:
+                # Touch the file so that eviction treats it as recently used
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+            return entry
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> CacheEntry:
+        entry = self._new_entry(key, value, ttl)
+        self.put_entry(entry)
+        return entry
+
+    def put_entry(self, entry: CacheEntry):
+        """
+        Stores a prepared entry, keeping its original timestamps.
+
+        Args:
+            entry (CacheEntry): The entry to store
+        """
+        path = self._path(entry.key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Atomic rename so concurrent readers never see a partial file
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._unlink(self._path(key))
+            self._update_gauges(self._list_files())
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in self._list_files():
+                self._unlink(path)
+            self._update_gauges([])
+
+    def _list_files(self) -> list[tuple[str, int, float]]:
+        """Lists the cache files as (path, size, last access) tuples, oldest first."""
+        files = []
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith(".pkl"):
+                    stat = item.stat()
+                    files.append((item.path, stat.st_size, stat.st_mtime))
+        files.sort(key=lambda f: f[2])
+        return files
+
+    def _evict(self):
+        """Deletes least recently used files until both bounds hold (lock must be held)."""
+        files = self._list_files()
+        total = sum(size for _, size, _ in files)
+        while files and (len(files) > self.max_entries or total > self.max_bytes):
+            path, size, _ = files.pop(0)
+            self._unlink(path)
+            total -= size
+            self._stats.evictions += 1
+        self._update_gauges(files)
+
+    def _update_gauges(self, files: list[tuple[str, int, float]]):
+        self._stats.entries = len(files)
+        self._stats.bytes = sum(size for _, size, _ in files)
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class TieredCache(CacheBackend):
+    """
+    Two-level cache: a fast in-memory tier in front of a persistent on-disk tier.
+    Disk hits are promoted to memory with their original timestamps.
+    """
+
+    def __init__(self, memory: MemoryCache, disk: DiskCache):
+        """
+        Initialize the tiered cache.
+
+        Args:
+            memory (MemoryCache): The in-memory tier
+            disk (DiskCache): The on-disk tier
+        """
+        super().__init__(ttl=memory.ttl, max_stale=memory.max_stale)
+        self.memory = memory
+        self.disk = disk
+
+    def get_entry(self, key: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        entry = self.memory.get_entry(key, allow_stale=allow_stale)
+        if entry is None:
+            entry = self.disk.get_entry(key, allow_stale=allow_stale)
+            if entry is not None:
+                self.memory.put_entry(entry)
+
+        with self._lock:
+            if entry is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+                if entry.is_expired():
+                    self._stats.stale_hits += 1
+        return entry
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> CacheEntry:
+        entry = self.memory._new_entry(key, value, ttl)
+        self.memory.put_entry(entry)
+        self.disk.put_entry(entry)
+        return entry
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        stats = super().stats
+        memory, disk = self.memory.stats, self.disk.stats
+        stats.evictions = memory.evictions + disk.evictions
+        stats.expirations = memory.expirations + disk.expirations
+        stats.entries = disk.entries
+        stats.bytes = memory.bytes + disk.bytes
+        return stats
+
+
+_default_cache: Optional[CacheBackend] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> CacheBackend:
+    """
+    Returns the process-wide fetch cache, creating it on first use.
+    When the NEWS_CACHE_DIR environment variable is set, an on-disk tier is added
+    below the in-memory one. NEWS_CACHE_MAX_STALE sets how many seconds an expired
+    feed may still be served while it is refreshed (defaults to one hour).
+
+    Returns:
+        CacheBackend: The shared cache
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            max_stale = float(os.getenv("NEWS_CACHE_MAX_STALE", 3600))
+            memory = MemoryCache(ttl=900, max_stale=max_stale)
+            cache_dir = os.getenv("NEWS_CACHE_DIR")
+            _default_cache = (
+                TieredCache(memory, DiskCache(cache_dir, ttl=900, max_stale=max_stale))
+                if cache_dir else memory
+            )
+        return _default_cache
@@ -0,0 +1,243 @@
+from dataclasses import dataclass, field
+from typing import Hashable, Optional
+import hashlib
+import re
+import numpy as np
+
+from aggregator.planner import TRUNCATED_CONTENT, missing_fields
+from entities.news_article import NewsArticle
+
+_WORD = re.compile(r"[a-z0-9]+")
+_TAG = re.compile(r"<[^>]+>")
+# Words of the content fingerprinted after the title and summary. Providers return different
+# lengths of the same story (a snippet, a description, the whole body), so only its opening is used.
+CONTENT_WORDS = 120
+
+# Hashes of the words seen so far; news vocabulary repeats, so most words are hashed once
+_word_hashes: dict[str, int] = {}
+_MAX_WORD_HASHES = 500_000
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+# Hash functions of the MinHash signatures: h -> (a * h + b) mod 2^64, with odd a
+NUM_PERM = 64
+_rng = np.random.default_rng(0x5EED)
+_PERM_A = (_rng.integers(0, 1 << 63, NUM_PERM, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+_PERM_B = _rng.integers(0, 1 << 63, NUM_PERM, dtype=np.uint64)
+
+
+def _hash_word(word: str) -> int:
+    value = _word_hashes.get(word)
+    if value is None:
+        if len(_word_hashes) >= _MAX_WORD_HASHES:
+            _word_hashes.clear()
+        value = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+        _word_hashes[word] = value
+    return value
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """Scrambles 64-bit values (the splitmix64 finalizer), so that combined hashes spread over all bits."""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def article_text(article: NewsArticle) -> str:
+    """
+    Returns the text an article is fingerprinted from: its title, summary and the opening
+    of its content, without HTML tags.
+
+    Args:
+        article (NewsArticle): The article
+
+    Returns:
+        str: The text
+    """
+    content = getattr(article, "body", None) or article.content or ""
+    content = " ".join(_TAG.sub(" ", TRUNCATED_CONTENT.sub("", content)).split()[:CONTENT_WORDS])
+    summary = _TAG.sub(" ", article.summary or "")
+    return f"{article.title or ''} {summary} {content}"
+
+
+def shingles(text: str) -> np.ndarray:
+    """
+    Hashes the distinct word pairs of a text (its single word, for a one-word text).
+
+    Args:
+        text (str): The text
+
+    Returns:
+        np.ndarray: The 64-bit hashes (uint64), empty for a text without words
+    """
+    words = _WORD.findall(text.lower())
+    known = _word_hashes.get
+    hashes = np.array([known(word) or _hash_word(word) for word in words], dtype=np.uint64)
+    if len(hashes) > 1:
+        with np.errstate(over="ignore"):
+            hashes = _mix(hashes[:-1] * _GOLDEN + hashes[1:])
+    return np.unique(hashes)
+
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """
+    Computes the MinHash signature of a text: for each of NUM_PERM hash functions, the
+    smallest hash of its word pairs. The share of equal values in the signatures of two
+    texts estimates the Jaccard similarity of their word pairs.
+
+    Args:
+        text (str): The text
+
+    Returns:
+        Optional[np.ndarray]: The signature (NUM_PERM uint32 values), None for a text without words
+    """
+    features = shingles(text)
+    if not len(features):
+        return None
+    with np.errstate(over="ignore"):
+        hashed = features[None, :] * _PERM_A[:, None] + _PERM_B[:, None]
+    # The top bits of the hashes are the best mixed
+    return (hashed.min(axis=1) >> np.uint64(32)).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Returns the Jaccard similarity estimated from two signatures."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class NearDuplicateIndex:
+    """
+    Incremental locality-sensitive hashing index of MinHash signatures. A new signature is
+    only compared to the entries agreeing with it on all the values of at least one band
+    (a slice of the signature), so near-duplicates are found without comparing every pair
+    of articles. With 16 bands of 4 values, pairs of texts sharing half of their word
+    pairs are candidates with a 64% chance, and pairs sharing 80% of them with a 99.9%
+    chance. Entries similar enough to each other are put in the same cluster.
+    """
+
+    def __init__(self, threshold: float = 0.5, bands: int = 16):
+        """
+        Initialize an empty index.
+
+        Args:
+            threshold (float, optional): Estimated Jaccard similarity of near-duplicates. Defaults to 0.5.
+            bands (int, optional): Bands the signatures are split into; more bands find less
+                similar candidates. Must divide NUM_PERM. Defaults to 16.
+        """
+        if NUM_PERM % bands:
+            raise ValueError(f"bands must divide the signature length ({NUM_PERM}).")
+        self.threshold = threshold
+        self.rows = NUM_PERM // bands
+        self._tables: list[dict[bytes, list[int]]] = [{} for _ in range(bands)]
+        self._signatures = np.empty((64, NUM_PERM), dtype=np.uint32)
+        self._keys: list[Hashable] = []
+        self._clusters: list[int] = []  # Position of the first entry of each entry's cluster
+        self.comparisons = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        raw = signature.tobytes()
+        width = self.rows * signature.itemsize
+        return [raw[i:i + width] for i in range(0, len(raw), width)]
+
+    def _matches(self, band_keys: list[bytes], signature: np.ndarray) -> np.ndarray:
+        candidates = set()
+        for table, band_key in zip(self._tables, band_keys):
+            candidates.update(table.get(band_key, ()))
+        if not candidates:
+            return np.empty(0, dtype=np.int64)
+        positions = np.fromiter(sorted(candidates), dtype=np.int64, count=len(candidates))
+        self.comparisons += len(positions)
+        shared = np.count_nonzero(self._signatures[positions] == signature, axis=1)
+        return positions[shared >= self.threshold * NUM_PERM]
+
+    def query(self, signature: np.ndarray) -> list[Hashable]:
+        """
+        Finds the entries similar to a signature.
+
+        Args:
+            signature (np.ndarray): The signature
+
+        Returns:
+            list[Hashable]: Keys of the matching entries, in the order they were added
+        """
+        return [self._keys[position] for position in self._matches(self._band_keys(signature), signature)]
+
+    def add(self, key: Hashable, signature: np.ndarray) -> Hashable:
+        """
+        Adds an entry, joining the cluster of its first near-duplicate already in the index.
+
+        Args:
+            key (Hashable): Identifies the entry, e.g. its position in a list of articles
+            signature (np.ndarray): Its MinHash signature
+
+        Returns:
+            Hashable: Key of the first entry of its cluster, `key` itself if it has no near-duplicate
+        """
+        band_keys = self._band_keys(signature)
+        matches = self._matches(band_keys, signature)
+        position = len(self._keys)
+        if position == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+        self._signatures[position] = signature
+        self._clusters.append(self._clusters[matches[0]] if len(matches) else position)
+        self._keys.append(key)
+        for table, band_key in zip(self._tables, band_keys):
+            table.setdefault(band_key, []).append(position)
+        return self._keys[self._clusters[position]]
+
+
+@dataclass
+class DedupResult:
+    """
+    Articles with their near-duplicates collapsed.
+
+    Attributes:
+        articles (list[NewsArticle]): One article per story, at the position of the story's first article
+        duplicates (dict[str, list[NewsArticle]]): The other articles of each story, by URL of the article kept
+    """
+    articles: list[NewsArticle] = field(default_factory=list)
+    duplicates: dict[str, list[NewsArticle]] = field(default_factory=dict)
+
+    @property
+    def collapsed(self) -> int:
+        """Number of articles removed as duplicates."""
+        return sum(len(others) for others in self.duplicates.values())
+
+
+def collapse_duplicates(articles: list[NewsArticle], threshold: float = 0.5,
+                        index: Optional[NearDuplicateIndex] = None) -> DedupResult:
+    """
+    Keeps one article of each story reported by several sources. Of each cluster of
+    near-duplicates, the first article that needs no scraping is kept (see
+    `planner.missing_fields`), or the first article when all of them do, so that fewer
+    pages are downloaded.
+
+    Args:
+        articles (list[NewsArticle]): The articles, e.g. of every source concatenated
+        threshold (float, optional): Estimated Jaccard similarity of near-duplicates. Defaults to 0.5.
+        index (Optional[NearDuplicateIndex], optional): Index to add the articles to. Defaults to a new one.
+
+    Returns:
+        DedupResult: The articles kept and the duplicates of each
+    """
+    index = index if index is not None else NearDuplicateIndex(threshold)
+    clusters: dict[Hashable, list[NewsArticle]] = {}
+    offset = len(index)
+    for i, article in enumerate(articles):
+        signature = minhash(article_text(article))
+        # Articles without text are never duplicates of each other
+        root = index.add(offset + i, signature) if signature is not None else ("empty", i)
+        clusters.setdefault(root, []).append(article)
+
+    result = DedupResult()
+    for members in clusters.values():
+        kept = next((article for article in members if not missing_fields(article)), members[0])
+        result.articles.append(kept)
+        others = [article for article in members if article is not kept]
+        if others:
+            result.duplicates[kept.url] = others
+    return result
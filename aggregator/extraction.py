@@ -0,0 +1,278 @@
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer, Tag
+from bs4.filter import ElementFilter
+from collections.abc import Mapping
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Optional
+from requests.structures import CaseInsensitiveDict
+import codecs
+import requests
+
+# lxml builds the tree several times faster than the pure Python parser; it is optional
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+class AnyOf(ElementFilter):
+    """
+    Parse filter keeping the tags matched by any of several strainers, with their whole
+    subtree. Text outside the kept tags is dropped.
+    """
+
+    def __init__(self, *strainers: SoupStrainer):
+        self.strainers = strainers
+
+    @property
+    def includes_everything(self) -> bool:
+        return False
+
+    @property
+    def excludes_everything(self) -> bool:
+        return False
+
+    def allow_tag_creation(self, nsprefix: Optional[str], name: str, attrs: Optional[dict]) -> bool:
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+
+# The parts of each site's pages the extractors read; everything else is skipped while parsing
+GUARDIAN_BODY = SoupStrainer("div", class_="article-body-viewer-selector")
+NYTIMES_FIELDS = AnyOf(
+    SoupStrainer(["article", "h1", "img", "p"]),
+    SoupStrainer(attrs={"itemprop": "name"}),
+)
+BBC_FIELDS = AnyOf(
+    SoupStrainer(["meta", "title"]),
+    SoupStrainer("div", attrs={"data-component": "text-block"}),
+)
+
+
+def declared_encoding(response: requests.Response) -> Optional[str]:
+    """
+    Returns the charset declared in the Content-Type header of a response. Unlike
+    `response.encoding`, no ISO-8859-1 default is assumed for text without a charset,
+    since that would override a <meta charset> in the page.
+
+    Args:
+        response (requests.Response): The page response
+
+    Returns:
+        Optional[str]: The declared charset, None if there is none
+    """
+    headers = getattr(response, "headers", None)
+    content_type = headers.get("Content-Type") if isinstance(headers, Mapping) else None
+    if not isinstance(content_type, str):
+        return None
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset" and value:
+            return value.strip("\"' ")
+    return None
+
+
+def parse_page(response: requests.Response, parse_only: Optional[ElementFilter] = None) -> BeautifulSoup:
+    """
+    Parses a downloaded page with the fastest parser installed. Only the tags matched by
+    `parse_only` are built, and a charset declared by the server is used instead of
+    sniffing the encoding from the bytes.
+
+    Args:
+        response (requests.Response): The page response
+        parse_only (Optional[ElementFilter], optional): Filter of the tags to build. Defaults to the whole page.
+
+    Returns:
+        BeautifulSoup: The parsed page
+    """
+    content = response.content
+    encoding = declared_encoding(response) if isinstance(content, bytes) else None
+    return BeautifulSoup(content, HTML_PARSER, parse_only=parse_only, from_encoding=encoding)
+
+
+def detach_page(response: requests.Response) -> requests.Response:
+    """
+    Copies what the extractors read from a downloaded page (status, headers, URL,
+    reason and body) into a response that can be sent to another process.
+
+    Args:
+        response (requests.Response): The page response
+
+    Returns:
+        requests.Response: The copy
+    """
+    page = requests.Response()
+    status_code = getattr(response, "status_code", None)
+    page.status_code = status_code if isinstance(status_code, int) else 200
+    headers = getattr(response, "headers", None)
+    page.headers = CaseInsensitiveDict(headers if isinstance(headers, Mapping) else {})
+    url = getattr(response, "url", None)
+    page.url = url if isinstance(url, str) else None
+    reason = getattr(response, "reason", None)
+    page.reason = reason if isinstance(reason, str) else None
+    page._content = response.content
+    page._content_consumed = True
+    return page
+
+
+@dataclass(frozen=True)
+class ElementSpec:
+    """
+    Identifies an element by tag name and attribute values. A "class" value matches any
+    element having that class among others.
+
+    Attributes:
+        name (str): Tag name
+        attrs (tuple[tuple[str, str], ...]): Required attribute values
+    """
+    name: str
+    attrs: tuple[tuple[str, str], ...] = ()
+
+    def matches(self, name: str, attrs: dict[str, Optional[str]]) -> bool:
+        if name != self.name:
+            return False
+        for key, value in self.attrs:
+            actual = attrs.get(key) or ""
+            if actual != value and not (key == "class" and value in actual.split()):
+                return False
+        return True
+
+
+# The element closing last among those each site's extractor reads; the rest of the page is not needed
+GUARDIAN_STOP = ElementSpec("div", (("class", "article-body-viewer-selector"),))
+NYTIMES_STOP = ElementSpec("article")
+BBC_STOP = ElementSpec("div", (("data-component", "text-block"),))
+
+
+class PageScanner(HTMLParser):
+    """
+    Incremental HTML tokenizer fed with the chunks of a page as they are downloaded,
+    reporting once the element holding the last extracted field has been closed.
+    """
+
+    def __init__(self, stop: ElementSpec, encoding: Optional[str] = None):
+        """
+        Args:
+            stop (ElementSpec): Element whose end completes the fields to extract
+            encoding (Optional[str], optional): Charset of the page. Defaults to UTF-8.
+        """
+        super().__init__(convert_charrefs=False)
+        self.stop = stop
+        self.done = False
+        self._depth = 0
+        try:
+            self._decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        except LookupError:
+            self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def feed_bytes(self, chunk: bytes) -> bool:
+        """
+        Scans the next chunk of the page.
+
+        Returns:
+            bool: True once the stop element has been closed
+        """
+        if not self.done:
+            self.feed(self._decoder.decode(chunk))
+        return self.done
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self._depth:
+            if tag == self.stop.name:
+                self._depth += 1
+        elif self.stop.matches(tag, dict(attrs)):
+            self._depth = 1
+
+    def handle_endtag(self, tag):
+        if self._depth and tag == self.stop.name:
+            self._depth -= 1
+            self.done = self._depth == 0
+
+
+# Tags never holding the main text of a page, skipped with their subtree
+BOILERPLATE_TAGS = frozenset({
+    "script", "style", "noscript", "template", "iframe", "svg", "nav", "header", "footer",
+    "aside", "form", "button", "select",
+})
+# Tags holding the paragraphs of an article
+PARAGRAPH_TAGS = frozenset({"p", "pre", "blockquote"})
+# Share of a paragraph's score given to its parent, grandparent and great-grandparent
+_ANCESTOR_WEIGHTS = (1.0, 1 / 2, 1 / 6)
+
+
+def main_content(soup: BeautifulSoup, min_paragraph: int = 25) -> str:
+    """
+    Extracts the main text of any HTML page, in time linear in its size. Every paragraph
+    of at least `min_paragraph` characters scores its nearest ancestors by its length;
+    the highest scoring element, weighted down by the share of its text inside links
+    (menus, related stories), is taken as the article body.
+
+    Args:
+        soup (BeautifulSoup): The parsed page
+        min_paragraph (int, optional): Characters a paragraph needs to count as article
+            text. Defaults to 25.
+
+    Returns:
+        str: The paragraphs of the main content separated by blank lines, empty if none was found
+    """
+    # Tags in document order, without boilerplate subtrees, and the length of their own text
+    order: list[Tag] = []
+    text: dict[int, int] = {}
+    stack: list[Tag] = [soup]
+    while stack:
+        tag = stack.pop()
+        order.append(tag)
+        own = 0
+        for child in reversed(tag.contents):
+            if isinstance(child, Tag):
+                if child.name not in BOILERPLATE_TAGS:
+                    stack.append(child)
+            elif type(child) is NavigableString:
+                own += len(child.strip())
+        text[id(tag)] = own
+
+    # Children come after their parent in document order, so walking it backwards
+    # completes every subtree before its root
+    links: dict[int, int] = {}
+    size: dict[int, int] = {}
+    score: dict[int, float] = {}
+    for tag in reversed(order):
+        key = id(tag)
+        links[key] = text[key] if tag.name == "a" else links.get(key, 0)
+        size[key] = size.get(key, 0) + 1
+        parent = tag.parent
+        if parent is None:
+            continue
+        parent_key = id(parent)
+        text[parent_key] += text[key]
+        links[parent_key] = links.get(parent_key, 0) + links[key]
+        size[parent_key] = size.get(parent_key, 0) + size[key]
+
+        if tag.name in PARAGRAPH_TAGS and text[key] >= min_paragraph:
+            points = 1 + min(text[key] / 100, 3)
+            ancestor = parent
+            for weight in _ANCESTOR_WEIGHTS:
+                if ancestor is None:
+                    break
+                score[id(ancestor)] = score.get(id(ancestor), 0.0) + points * weight
+                ancestor = ancestor.parent
+
+    if not score:
+        return ""
+    index = {id(tag): i for i, tag in enumerate(order)}
+    best = max(score, key=lambda key: score[key] * (1 - links[key] / max(text[key], 1)))
+
+    start = index[best]
+    paragraphs = []
+    for tag in order[start:start + size[best]]:
+        key = id(tag)
+        # Paragraphs nested in a kept paragraph (e.g. in a quote) are part of its text
+        if tag.name in PARAGRAPH_TAGS and tag.parent.name not in PARAGRAPH_TAGS \
+                and text[key] and links[key] < text[key] / 2:
+            paragraphs.append(tag.get_text(" ", strip=True))
+    return "\n\n".join(paragraphs)
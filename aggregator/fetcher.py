@@ -0,0 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import time
+
+from entities.news_article import NewsArticle
+
+
+@dataclass
+class FanOutResult:
+    """
+    Outcome of a fan-out fetch across several news sources.
+
+    Attributes:
+        articles (list[NewsArticle]): Articles from every source that finished in time,
+            concatenated in the order the sources were given
+        failed_sources (list[str]): Sources that raised an error or missed their deadline
+        errors (dict[str, str]): Error description for each failed source
+        durations (dict[str, float]): Seconds each successful source took to answer
+        data_age (dict[str, float]): Age in seconds of the data each successful source returned,
+            0 for data fetched just now
+        stale_sources (list[str]): Sources that answered with stale cached data while a
+            refresh runs in the background
+    """
+    articles: list[NewsArticle] = field(default_factory=list)
+    failed_sources: list[str] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+    durations: dict[str, float] = field(default_factory=dict)
+    data_age: dict[str, float] = field(default_factory=dict)
+    stale_sources: list[str] = field(default_factory=list)
+
+    @property
+    def max_age(self) -> float:
+        """Age in seconds of the oldest data shown."""
+        return max(self.data_age.values(), default=0.0)
+
+
+class FanOutFetcher:
+    """
+    Runs the fetch of several news sources at the same time and collects whatever
+    finishes before each source's deadline, so one slow provider does not set the
+    latency of the whole page.
+    """
+
+    def __init__(self, timeout: float = 10.0, max_workers: Optional[int] = None):
+        """
+        Initialize the fetcher.
+
+        Args:
+            timeout (float, optional): Default deadline in seconds for every source. Defaults to 10.0.
+            max_workers (Optional[int], optional): Maximum number of concurrent fetches.
+                Defaults to one worker per source.
+        """
+        self.timeout = timeout
+        self.max_workers = max_workers
+
+    def fetch_all(self, tasks: dict[str, Callable[[], list[NewsArticle]]],
+                  deadlines: Optional[dict[str, float]] = None) -> FanOutResult:
+        """
+        Starts every fetch at once and waits for each one until its deadline.
+
+        Args:
+            tasks (dict[str, Callable[[], list[NewsArticle]]]): Fetch function for each source name
+            deadlines (Optional[dict[str, float]], optional): Per-source deadline in seconds,
+                measured from the moment the fan-out starts. Sources without an entry use
+                the default timeout.
+
+        Returns:
+            FanOutResult: Articles from the sources that finished in time and the list of
+            sources that failed or timed out
+        """
+        result = FanOutResult()
+        if not tasks:
+            return result
+
+        deadlines = deadlines or {}
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers or len(tasks),
+            thread_name_prefix="fanout-fetch"
+        )
+        started = time.monotonic()
+        futures = {source: executor.submit(self._timed, task) for source, task in tasks.items()}
+
+        try:
+            for source, future in futures.items():
+                remaining = deadlines.get(source, self.timeout) - (time.monotonic() - started)
+                try:
+                    articles, elapsed = future.result(timeout=max(remaining, 0))
+                    result.articles.extend(articles)
+                    result.durations[source] = elapsed
+                    # Cached fetches report how old their data is
+                    result.data_age[source] = getattr(articles, "age", 0.0)
+                    if getattr(articles, "stale", False):
+                        result.stale_sources.append(source)
+                except FutureTimeoutError:
+                    future.cancel()
+                    result.failed_sources.append(source)
+                    result.errors[source] = f"Timed out after {deadlines.get(source, self.timeout)}s"
+                except Exception as e:
+                    result.failed_sources.append(source)
+                    result.errors[source] = str(e) or e.__class__.__name__
+        finally:
+            # Do not wait for sources that missed their deadline; their threads finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return result
+
+    @staticmethod
+    def _timed(task: Callable[[], list[NewsArticle]]) -> tuple[list[NewsArticle], float]:
+        """
+        Runs a fetch task and measures how long it took.
+
+        Args:
+            task (Callable[[], list[NewsArticle]]): The fetch function to run
+
+        Returns:
+            tuple[list[NewsArticle], float]: The fetched articles and the elapsed seconds
+        """
+        started = time.monotonic()
+        articles = task()
+        return (articles if articles is not None else []), time.monotonic() - started
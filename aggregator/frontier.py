@@ -0,0 +1,145 @@
+from aggregator.rate_limiter import Priority
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+import heapq
+import itertools
+import threading
+
+
+@dataclass
+class _Task:
+    fn: Callable[[], Any]
+    future: Future
+    priority: int
+    sequence: int
+
+
+class CrawlFrontier:
+    """
+    Priority queue of pages waiting to be scraped, worked by a fixed set of threads.
+    Tasks run by priority (pages on screen before off-screen ones), then in the order
+    they were submitted. Submitting a queued key again with a more urgent priority moves
+    it up, and queued background tasks can be cancelled when they stop being relevant.
+    """
+
+    def __init__(self, workers: int = 4, thread_name_prefix: str = "frontier"):
+        """
+        Initialize the frontier and start its worker threads.
+
+        Args:
+            workers (int, optional): Tasks run at once. Defaults to 4.
+            thread_name_prefix (str, optional): Name prefix of the worker threads. Defaults to "frontier".
+        """
+        self._cond = threading.Condition()
+        self._heap: list[tuple[int, int, Hashable]] = []
+        self._tasks: dict[Hashable, _Task] = {}  # Queued tasks by key, not yet started
+        self._sequence = itertools.count()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{thread_name_prefix}_{i}", daemon=True)
+            for i in range(max(workers, 1))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, key: Hashable, fn: Callable[[], Any], priority: Priority = Priority.BACKGROUND) -> Future:
+        """
+        Queues a task, unless one with the same key is already queued, in which case
+        that task is returned and moved up if `priority` is more urgent.
+
+        Args:
+            key (Hashable): Identifies the task, e.g. the page URL
+            fn (Callable[[], Any]): The work to run
+            priority (Priority, optional): Lower values run first. Defaults to Priority.BACKGROUND.
+
+        Returns:
+            Future: The future of the task
+        """
+        with self._cond:
+            task = self._tasks.get(key)
+            if task is not None and not task.future.cancelled():
+                if priority < task.priority:
+                    task.priority = int(priority)
+                    task.sequence = next(self._sequence)
+                    heapq.heappush(self._heap, (task.priority, task.sequence, key))
+                    self._cond.notify()
+                return task.future
+
+            task = _Task(fn, Future(), int(priority), next(self._sequence))
+            self._tasks[key] = task
+            heapq.heappush(self._heap, (task.priority, task.sequence, key))
+            self._cond.notify()
+            return task.future
+
+    def cancel(self, key: Hashable, min_priority: Priority = Priority.INTERACTIVE) -> bool:
+        """
+        Cancels a queued task whose priority is `min_priority` or less urgent. Running
+        tasks are not interrupted.
+
+        Returns:
+            bool: True if the task was cancelled
+        """
+        with self._cond:
+            task = self._tasks.get(key)
+            if task is None or task.priority < min_priority:
+                return False
+            del self._tasks[key]
+        # Done callbacks run here, outside the lock
+        return task.future.cancel()
+
+    def cancel_background(self) -> int:
+        """
+        Cancels every queued background task.
+
+        Returns:
+            int: Number of tasks cancelled
+        """
+        with self._cond:
+            keys = [key for key, task in self._tasks.items() if task.priority >= Priority.BACKGROUND]
+        return sum(self.cancel(key, Priority.BACKGROUND) for key in keys)
+
+    def pending(self) -> int:
+        """Returns the number of queued tasks."""
+        with self._cond:
+            return len(self._tasks)
+
+    def _next_task(self) -> _Task:
+        """Waits for the most urgent queued task and removes it from the queue."""
+        with self._cond:
+            while True:
+                while self._heap:
+                    priority, sequence, key = heapq.heappop(self._heap)
+                    task = self._tasks.get(key)
+                    # Entries left behind by cancelled or moved up tasks are skipped
+                    if task is not None and task.sequence == sequence:
+                        del self._tasks[key]
+                        return task
+                self._cond.wait()
+
+    def _work(self):
+        while True:
+            task = self._next_task()
+            if not task.future.set_running_or_notify_cancel():
+                continue
+            try:
+                task.future.set_result(task.fn())
+            except BaseException as e:
+                task.future.set_exception(e)
+
+
+_shared_frontier: Optional[CrawlFrontier] = None
+_shared_frontier_lock = threading.Lock()
+
+
+def get_shared_frontier() -> CrawlFrontier:
+    """
+    Returns the process-wide crawl frontier, creating it on first use.
+
+    Returns:
+        CrawlFrontier: The shared frontier
+    """
+    global _shared_frontier
+    with _shared_frontier_lock:
+        if _shared_frontier is None:
+            _shared_frontier = CrawlFrontier(workers=4, thread_name_prefix="prefetch")
+        return _shared_frontier
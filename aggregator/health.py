@@ -0,0 +1,309 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+import threading
+import time
+
+import requests
+
+T = TypeVar("T")
+
+# Runs the duplicate of a hedged request; shared by every provider
+_hedge_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while a provider's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated errors. The circuit opens after `failure_threshold`
+    consecutive failures; after `recovery_timeout` seconds a single trial request is
+    let through (half-open) and its outcome closes or reopens the circuit.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Initialize a closed circuit.
+
+        Args:
+            failure_threshold (int, optional): Consecutive failures that open the circuit. Defaults to 5.
+            recovery_timeout (float, optional): Seconds the circuit stays open. Defaults to 30.0.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        """The current state: "closed", "open" or "half-open"."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Tells whether a request may be sent now. While half-open, only the first caller
+        gets through.
+
+        Returns:
+            bool: True if the request may be sent
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if time.monotonic() - self._opened_at < self.recovery_timeout or self._trial_running:
+                return False
+            self._state = self.HALF_OPEN
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        """Closes the circuit and resets the failure count."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        """Counts a failure, opening the circuit at the threshold or when a trial request fails."""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class LatencyTracker:
+    """Keeps the latencies of the most recent successful requests."""
+
+    def __init__(self, window: int = 200):
+        """
+        Args:
+            window (int, optional): Number of samples kept. Defaults to 200.
+        """
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float):
+        """Records the latency of a request."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Returns the p-th percentile (nearest rank) of the recorded latencies.
+
+        Args:
+            p (float): The percentile, between 0 and 100
+
+        Returns:
+            Optional[float]: The latency in seconds, None if nothing was recorded
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(int(round(p / 100 * len(samples))) - 1, 0))
+        return samples[index]
+
+
+@dataclass
+class HealthStats:
+    """
+    Health of a single provider.
+
+    Attributes:
+        name (str): The provider (host) name
+        state (str): State of the circuit breaker
+        requests (int): Requests sent
+        failures (int): Requests that raised or answered with a 5xx status
+        rejected (int): Requests failed fast while the circuit was open
+        hedged (int): Requests duplicated because the first attempt was slow
+        hedge_wins (int): Hedged requests answered first by the duplicate
+        p50 (Optional[float]): Median latency in seconds
+        p95 (Optional[float]): 95th percentile latency in seconds
+    """
+    name: str
+    state: str
+    requests: int = 0
+    failures: int = 0
+    rejected: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+
+
+class ProviderHealth:
+    """
+    Circuit breaker, latency tracking and request hedging for a single provider.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 hedge_quantile: float = 95, min_hedge_samples: int = 20):
+        """
+        Initialize the provider's health.
+
+        Args:
+            name (str): The provider (host) name
+            failure_threshold (int, optional): Consecutive failures that open the circuit. Defaults to 5.
+            recovery_timeout (float, optional): Seconds the circuit stays open. Defaults to 30.0.
+            hedge_quantile (float, optional): Latency percentile after which a hedged request is
+                duplicated. Defaults to 95.
+            min_hedge_samples (int, optional): Latencies needed before requests are hedged. Defaults to 20.
+        """
+        self.name = name
+        self.breaker = CircuitBreaker(failure_threshold, recovery_timeout)
+        self.latency = LatencyTracker()
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_samples = min_hedge_samples
+        self._lock = threading.Lock()
+        self._counts = {"requests": 0, "failures": 0, "rejected": 0, "hedged": 0, "hedge_wins": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def call(self, send: Callable[[], T], hedge: bool = False) -> T:
+        """
+        Sends a request unless the circuit is open, and records its outcome.
+
+        Args:
+            send (Callable[[], T]): Function sending the request and returning the response
+            hedge (bool, optional): Whether the request is idempotent and may be duplicated
+                when it takes longer than the provider's usual worst case. Defaults to False.
+
+        Returns:
+            T: The response
+
+        Raises:
+            CircuitOpenError: If the provider is failing and the circuit is open
+        """
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open); failing fast.")
+
+        self._count("requests")
+        started = time.monotonic()
+        try:
+            response = self._send_hedged(send) if hedge else send()
+        except Exception:
+            self._count("failures")
+            self.breaker.record_failure()
+            raise
+
+        status = getattr(response, "status_code", None)
+        if isinstance(status, int) and status >= 500:
+            self._count("failures")
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+            self.latency.add(time.monotonic() - started)
+        return response
+
+    def _send_hedged(self, send: Callable[[], T]) -> T:
+        """
+        Sends the request and, if no answer arrived within the hedge quantile of recent
+        latencies, sends a duplicate and returns whichever succeeds first.
+        """
+        delay = self.latency.percentile(self.hedge_quantile) \
+            if len(self.latency) >= self.min_hedge_samples else None
+        if delay is None:
+            return send()
+
+        first = _hedge_executor.submit(send)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+
+        self._count("hedged")
+        second = _hedge_executor.submit(send)
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        self._count("hedge_wins")
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def stats(self) -> HealthStats:
+        """
+        Reports the provider's health.
+
+        Returns:
+            HealthStats: Counters, circuit state and latency percentiles
+        """
+        with self._lock:
+            counts = dict(self._counts)
+        return HealthStats(
+            name=self.name,
+            state=self.breaker.state,
+            p50=self.latency.percentile(50),
+            p95=self.latency.percentile(95),
+            **counts,
+        )
+
+
+class HealthRegistry:
+    """
+    Tracks the health of every provider contacted through a session pool, one
+    ProviderHealth per host.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 hedge_quantile: float = 95, min_hedge_samples: int = 20):
+        """
+        Initialize the registry. The arguments are passed to every ProviderHealth.
+
+        Args:
+            failure_threshold (int, optional): Consecutive failures that open a circuit. Defaults to 5.
+            recovery_timeout (float, optional): Seconds a circuit stays open. Defaults to 30.0.
+            hedge_quantile (float, optional): Latency percentile after which hedged requests are
+                duplicated. Defaults to 95.
+            min_hedge_samples (int, optional): Latencies needed before requests are hedged. Defaults to 20.
+        """
+        self.options = dict(
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            hedge_quantile=hedge_quantile,
+            min_hedge_samples=min_hedge_samples,
+        )
+        self._lock = threading.Lock()
+        self._providers: dict[str, ProviderHealth] = {}
+
+    def get(self, name: str) -> ProviderHealth:
+        """Returns the health of a provider, creating it on first use."""
+        with self._lock:
+            if name not in self._providers:
+                self._providers[name] = ProviderHealth(name, **self.options)
+            return self._providers[name]
+
+    def snapshot(self) -> dict[str, HealthStats]:
+        """
+        Reports the health of every provider.
+
+        Returns:
+            dict[str, HealthStats]: Health per provider name
+        """
+        with self._lock:
+            providers = list(self._providers.values())
+        return {provider.name: provider.stats() for provider in providers}
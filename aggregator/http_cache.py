@@ -0,0 +1,179 @@
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from aggregator.cache import CacheBackend, DiskCache, MemoryCache
+
+# Query parameters holding credentials; they are left out of cache keys
+_CREDENTIAL_PARAMS = {"api-key", "apikey", "api_key", "token"}
+
+
+@dataclass
+class CachedResponse:
+    """
+    A stored HTTP response body with the validators needed to revalidate it.
+
+    Attributes:
+        url (str): Final URL of the response
+        content (bytes): The response body
+        headers (dict[str, str]): The response headers
+        encoding (Optional[str]): Encoding declared by the server
+        etag (Optional[str]): Value of the ETag header
+        last_modified (Optional[str]): Value of the Last-Modified header
+        stored_at (float): Unix time the body was downloaded or last revalidated
+    """
+    url: str
+    content: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+    encoding: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = field(default_factory=time.time)
+
+    @property
+    def validator(self) -> str:
+        """Identifies this version of the resource (the ETag, or else the Last-Modified date)."""
+        return self.etag or self.last_modified or ""
+
+
+def request_key(url: str, params: Optional[dict] = None) -> str:
+    """
+    Builds the cache key of a GET request from its URL and query parameters, leaving out
+    credentials so that keys do not leak API keys to disk.
+
+    Args:
+        url (str): The request URL, possibly with a query string
+        params (Optional[dict], optional): Extra query parameters. Defaults to None.
+
+    Returns:
+        str: The normalized URL used as cache key
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(k, str(v)) for k, v in (params or {}).items() if v is not None]
+    query = sorted((k, v) for k, v in query if k.lower() not in _CREDENTIAL_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ""))
+
+
+class HTTPCache:
+    """
+    Validator-aware HTTP cache. Stores bodies together with their ETag/Last-Modified
+    headers so a later request can be sent as a conditional GET, and a 304 Not Modified
+    answer can be served from the stored body without downloading it again.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        """
+        Initialize the HTTP cache.
+
+        Args:
+            backend (Optional[CacheBackend], optional): Where the bodies are stored. Entries never
+                expire by TTL since they are revalidated on every use. Defaults to a memory cache
+                of up to 128 MiB.
+        """
+        self.backend = backend or MemoryCache(ttl=None, max_entries=2048, max_bytes=128 * 1024 * 1024)
+        self._lock = threading.Lock()
+        self.revalidated = 0  # 304 answers served from the cache
+        self.downloaded = 0  # Full bodies downloaded and stored
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        """Returns the stored response for a request key, or None."""
+        return self.backend.get(key)
+
+    def conditional_headers(self, cached: Optional[CachedResponse]) -> dict[str, str]:
+        """
+        Builds the If-None-Match/If-Modified-Since headers for a stored response.
+
+        Args:
+            cached (Optional[CachedResponse]): The stored response, None if nothing is stored
+
+        Returns:
+            dict[str, str]: The conditional request headers
+        """
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def store(self, key: str, response: requests.Response) -> Optional[CachedResponse]:
+        """
+        Stores a 200 response if it carries a validator.
+
+        Args:
+            key (str): The request key
+            response (requests.Response): The response to store
+
+        Returns:
+            Optional[CachedResponse]: The stored response, None if it could not be revalidated later
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        etag = etag if isinstance(etag, str) else None
+        last_modified = last_modified if isinstance(last_modified, str) else None
+        if response.status_code != 200 or not (etag or last_modified) or not isinstance(response.content, bytes):
+            return None
+
+        cached = CachedResponse(
+            url=response.url,
+            content=response.content,
+            headers=dict(response.headers),
+            encoding=response.encoding,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self.backend.set(key, cached)
+        with self._lock:
+            self.downloaded += 1
+        return cached
+
+    def not_modified(self, key: str, cached: CachedResponse, response: requests.Response) -> requests.Response:
+        """
+        Turns a 304 answer into a full response built from the stored body.
+
+        Args:
+            key (str): The request key
+            cached (CachedResponse): The stored response being revalidated
+            response (requests.Response): The 304 response
+
+        Returns:
+            requests.Response: A 200 response with the stored body and `from_cache` set to True
+        """
+        cached.stored_at = time.time()
+        self.backend.set(key, cached)
+        with self._lock:
+            self.revalidated += 1
+
+        restored = requests.Response()
+        restored.status_code = 200
+        restored._content = cached.content
+        restored.headers = CaseInsensitiveDict(cached.headers)
+        restored.encoding = cached.encoding
+        restored.url = cached.url
+        restored.request = response.request
+        restored.reason = "OK"
+        restored.from_cache = True
+        restored.validator = cached.validator
+        return restored
+
+
+def default_http_cache() -> HTTPCache:
+    """
+    Builds the HTTP cache used by the shared session pool: on disk under
+    NEWS_CACHE_DIR/http when that variable is set, in memory otherwise.
+
+    Returns:
+        HTTPCache: The HTTP cache
+    """
+    cache_dir = os.getenv("NEWS_CACHE_DIR")
+    if cache_dir:
+        return HTTPCache(DiskCache(os.path.join(cache_dir, "http"), ttl=None))
+    return HTTPCache()
@@ -0,0 +1,293 @@
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from aggregator.health import HealthRegistry
+from aggregator.http_cache import HTTPCache, default_http_cache, request_key
+
+# (connect, read) timeout in seconds applied to requests that do not set one
+DEFAULT_TIMEOUT = (3.05, 10.0)
+
+
+@dataclass
+class ConnectionStats:
+    """
+    Connection reuse statistics for a single host.
+
+    Attributes:
+        host (str): Host name the statistics belong to
+        requests (int): Number of requests sent to the host through the pool
+        new_connections (int): Number of TCP connections that had to be opened
+    """
+    host: str
+    requests: int = 0
+    new_connections: int = 0
+
+    @property
+    def reused_connections(self) -> int:
+        """Number of requests that were served over an already open connection."""
+        return max(self.requests - self.new_connections, 0)
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests that reused an open connection (0.0 to 1.0)."""
+        return self.reused_connections / self.requests if self.requests else 0.0
+
+
+class _CountingConnectionMixin:
+    """Calls `on_socket` every time the connection opens a new socket."""
+    on_socket = None
+
+    def _new_conn(self):
+        sock = super()._new_conn()
+        if self.on_socket is not None:
+            self.on_socket()
+        return sock
+
+
+class _CountingHTTPConnection(_CountingConnectionMixin, HTTPConnection):
+    pass
+
+
+class _CountingHTTPSConnection(_CountingConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _CountingPoolMixin:
+    """
+    Counts the sockets opened by a connection pool. urllib3 only counts connection
+    objects, which are silently reconnected when the server closes the socket.
+    """
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn.on_socket = self._record_socket
+        return conn
+
+    def _record_socket(self):
+        self.num_sockets = getattr(self, "num_sockets", 0) + 1
+
+
+class _CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report how many sockets they opened."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+class HTTPSessionPool:
+    """
+    Shared HTTP session with pooled keep-alive connections and retry adapters.
+    Used by the API clients and the article scraper so that repeated requests to
+    the same host skip the TCP and TLS handshake.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        host_pool_sizes: Optional[dict[str, int]] = None,
+        max_retries: int = 2,
+        backoff_factor: float = 0.3,
+        status_forcelist: tuple[int, ...] = (500, 502, 503, 504),
+        keep_alive: bool = True,
+        http_cache: Optional[HTTPCache] = None,
+        timeout: Optional[tuple[float, float]] = DEFAULT_TIMEOUT,
+        health: Optional[HealthRegistry] = None,
+    ):
+        """
+        Initialize the session pool.
+
+        Args:
+            pool_connections (int, optional): Number of host pools to keep. Defaults to 10.
+            pool_maxsize (int, optional): Connections kept open per host. Defaults to 10.
+            host_pool_sizes (Optional[dict[str, int]], optional): Connections kept open for
+                specific hosts, e.g. {"www.nytimes.com": 20}. Defaults to None.
+            max_retries (int, optional): Retries for failed connections and retryable
+                status codes. Defaults to 2.
+            backoff_factor (float, optional): Backoff factor between retries. Defaults to 0.3.
+            status_forcelist (tuple[int, ...], optional): Status codes that trigger a retry.
+            keep_alive (bool, optional): Whether to keep connections open between requests.
+                Defaults to True.
+            http_cache (Optional[HTTPCache], optional): Cache of response bodies and validators.
+                When set, repeated GETs are sent as conditional requests. Defaults to None.
+            timeout (Optional[tuple[float, float]], optional): (connect, read) timeout in seconds
+                for requests that do not set one. Defaults to DEFAULT_TIMEOUT.
+            health (Optional[HealthRegistry], optional): Per-host circuit breakers and latency
+                tracking. When set, requests to a failing host fail fast and slow idempotent
+                requests may be hedged. Defaults to None.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_sizes = dict(host_pool_sizes or {})
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = status_forcelist
+        self.keep_alive = keep_alive
+        self.http_cache = http_cache
+        self.timeout = timeout
+        self.health = health
+
+        self._lock = threading.Lock()
+        self._request_counts: dict[str, int] = {}
+        self._adapters: list[_CountingHTTPAdapter] = []
+        self.session = self._build_session()
+
+    def _build_retry(self) -> Retry:
+        """Builds the retry policy shared by all adapters (GET requests only)."""
+        return Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.status_forcelist,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,
+        )
+
+    def _build_adapter(self, maxsize: int) -> HTTPAdapter:
+        """Builds a pooled adapter keeping up to `maxsize` connections per host."""
+        adapter = _CountingHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=maxsize,
+            max_retries=self._build_retry(),
+        )
+        self._adapters.append(adapter)
+        return adapter
+
+    def _build_session(self) -> requests.Session:
+        """Creates the session and mounts the default and per-host adapters."""
+        session = requests.Session()
+        session.mount("http://", self._build_adapter(self.pool_maxsize))
+        session.mount("https://", self._build_adapter(self.pool_maxsize))
+
+        # requests picks the adapter with the longest matching prefix
+        for host, size in self.host_pool_sizes.items():
+            session.mount(f"https://{host}", self._build_adapter(size))
+            session.mount(f"http://{host}", self._build_adapter(size))
+
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def get(self, url: str, hedge: bool = False, **kwargs) -> requests.Response:
+        """
+        Sends a GET request through the pooled session.
+
+        When the pool has an HTTP cache and a validated copy of the resource is stored,
+        the request carries If-None-Match/If-Modified-Since and a 304 answer is turned
+        into a response built from the stored body. Responses carry `from_cache` (True
+        when the body was not downloaded again) and `validator` (the ETag or Last-Modified
+        value identifying the body, empty when the server sent none).
+
+        When the pool has a health registry, requests to a host whose circuit is open
+        fail fast with CircuitOpenError, and a hedged request is sent a second time if it
+        takes longer than the host's 95th percentile latency.
+
+        Args:
+            url (str): The URL to request
+            hedge (bool, optional): Whether the request may be duplicated when slow. Only
+                used for requests that are safe to send twice. Defaults to False.
+            **kwargs: Any keyword argument accepted by requests.Session.get
+
+        Returns:
+            requests.Response: The response
+        """
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            self._request_counts[host] = self._request_counts.get(host, 0) + 1
+
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        if self.health is None:
+            return self._send(url, **kwargs)
+        # Streamed bodies are read after the call returns, so they cannot be hedged
+        return self.health.get(host).call(lambda: self._send(url, **kwargs), hedge=hedge and not kwargs.get("stream"))
+
+    def _send(self, url: str, **kwargs) -> requests.Response:
+        """Sends the request, revalidating it against the HTTP cache when there is one."""
+        if self.http_cache is None or kwargs.get("stream"):
+            return self.session.get(url, **kwargs)
+
+        key = request_key(url, kwargs.get("params"))
+        cached = self.http_cache.lookup(key)
+        if cached is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **self.http_cache.conditional_headers(cached)}
+
+        response = self.session.get(url, **kwargs)
+        if cached is not None and response.status_code == 304:
+            return self.http_cache.not_modified(key, cached, response)
+
+        stored = self.http_cache.store(key, response)
+        response.from_cache = False
+        response.validator = stored.validator if stored is not None else ""
+        return response
+
+    def stats(self) -> dict[str, ConnectionStats]:
+        """
+        Reports connection reuse per host.
+
+        Returns:
+            dict[str, ConnectionStats]: Statistics for every host contacted through the pool
+        """
+        with self._lock:
+            stats = {host: ConnectionStats(host=host, requests=count)
+                     for host, count in self._request_counts.items()}
+
+        for adapter in self._adapters:
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                entry = stats.setdefault(pool.host, ConnectionStats(host=pool.host))
+                entry.new_connections += getattr(pool, "num_sockets", 0)
+        return stats
+
+    def close(self):
+        """Closes every pooled connection."""
+        self.session.close()
+
+
+_shared_pool: Optional[HTTPSessionPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_pool() -> HTTPSessionPool:
+    """
+    Returns the process-wide session pool, creating it on first use.
+
+    Returns:
+        HTTPSessionPool: The shared session pool
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = HTTPSessionPool(
+                host_pool_sizes={
+                    "www.theguardian.com": 20,
+                    "www.nytimes.com": 20,
+                    "www.bbc.com": 20,
+                    "www.bbc.co.uk": 20,
+                },
+                http_cache=default_http_cache(),
+                health=HealthRegistry(),
+            )
+        return _shared_pool
@@ -0,0 +1,295 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Data file record: magic, length of the compressed payload. The payload is a JSON line
+# describing the page followed by the page body.
+_RECORD = struct.Struct("<4sI")
+_RECORD_MAGIC = b"PGRC"
+# Index file: header (magic, slot count, pages stored), then an open-addressing hash
+# table of slots (URL digest, record offset, record length)
+_INDEX_HEADER = struct.Struct("<4sIQ")
+_INDEX_MAGIC = b"PGIX"
+_SLOT = struct.Struct("<16sQI4x")
+_EMPTY = bytes(16)
+
+
+def url_digest(url: str) -> bytes:
+    """Returns the 16-byte digest identifying a URL in the index."""
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+
+
+@dataclass
+class ArchivedPage:
+    """
+    A page as downloaded by the scraper.
+
+    Attributes:
+        url (str): URL of the page
+        source (str): News source of the article the page belongs to
+        fetched_at (float): Unix time the page was downloaded
+        status_code (int): HTTP status of the response
+        headers (dict): Response headers kept for extraction (Content-Type)
+        content (bytes): The page body
+        truncated (bool): Whether only the beginning of the page was downloaded
+    """
+    url: str
+    source: str
+    fetched_at: float
+    status_code: int
+    headers: dict = field(default_factory=dict)
+    content: bytes = b""
+    truncated: bool = False
+
+    def to_response(self) -> requests.Response:
+        """Rebuilds a response the extraction functions can read."""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.url = self.url
+        response._content = self.content
+        response._content_consumed = True
+        return response
+
+
+class PageArchive:
+    """
+    Append-only archive of downloaded pages, so that extraction can be run again offline
+    after an extractor is fixed. Pages are zlib-compressed and appended to `pages.dat`;
+    `index.dat` is a memory-mapped hash table from URL to the offset of the latest copy
+    of each page, so a lookup reads one slot and one record. Older copies stay in the data
+    file until it is rewritten.
+    """
+
+    def __init__(self, directory: str, initial_slots: int = 4096, compression_level: int = 6):
+        """
+        Open (or create) the archive.
+
+        Args:
+            directory (str): Directory holding pages.dat and index.dat
+            initial_slots (int, optional): Slots of a new index; it doubles when half full. Defaults to 4096.
+            compression_level (int, optional): zlib level of new records. Defaults to 6.
+        """
+        self.directory = directory
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._data_path = os.path.join(directory, "pages.dat")
+        self._index_path = os.path.join(directory, "index.dat")
+
+        self._data = open(self._data_path, "a+b")
+        self._index_file = None
+        self._index: Optional[mmap.mmap] = None
+        if os.path.exists(self._index_path) and self._index_is_valid():
+            self._open_index()
+        else:
+            self._rebuild_index(max(initial_slots, 8))
+
+    def _index_is_valid(self) -> bool:
+        with open(self._index_path, "rb") as f:
+            header = f.read(_INDEX_HEADER.size)
+            if len(header) < _INDEX_HEADER.size:
+                return False
+            magic, slots, _ = _INDEX_HEADER.unpack(header)
+            return magic == _INDEX_MAGIC and os.path.getsize(self._index_path) == _INDEX_HEADER.size + slots * _SLOT.size
+
+    def _open_index(self):
+        self._index_file = open(self._index_path, "r+b")
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+        _, self._slots, self._count = _INDEX_HEADER.unpack_from(self._index, 0)
+
+    def _close_index(self):
+        if self._index is not None:
+            self._index.close()
+            self._index_file.close()
+            self._index = None
+
+    def _find_slot(self, digest: bytes) -> tuple[int, bool]:
+        """Returns the position of a digest's slot, and whether it holds the digest (lock must be held)."""
+        slot = int.from_bytes(digest[:8], "little") % self._slots
+        while True:
+            position = _INDEX_HEADER.size + slot * _SLOT.size
+            stored = self._index[position:position + 16]
+            if stored == digest:
+                return position, True
+            if stored == _EMPTY:
+                return position, False
+            slot = (slot + 1) % self._slots
+
+    def _index_put(self, digest: bytes, offset: int, length: int):
+        """Points a digest at a record, growing the index when half full (lock must be held)."""
+        position, found = self._find_slot(digest)
+        _SLOT.pack_into(self._index, position, digest, offset, length)
+        if not found:
+            self._count += 1
+            _INDEX_HEADER.pack_into(self._index, 0, _INDEX_MAGIC, self._slots, self._count)
+            if self._count * 2 > self._slots:
+                self._write_index(self._entries(), self._slots * 2)
+
+    def _entries(self) -> dict[bytes, tuple[int, int]]:
+        """Reads every used slot of the index (lock must be held)."""
+        entries = {}
+        for slot in range(self._slots):
+            digest, offset, length = _SLOT.unpack_from(self._index, _INDEX_HEADER.size + slot * _SLOT.size)
+            if digest != _EMPTY:
+                entries[digest] = (offset, length)
+        return entries
+
+    def _rebuild_index(self, slots: int):
+        """Indexes the latest record of every URL in the data file, e.g. after the index was lost (lock must be held)."""
+        entries: dict[bytes, tuple[int, int]] = {}
+        for offset, length, payload in self._scan():
+            meta = json.loads(payload.split(b"\n", 1)[0])
+            entries[url_digest(meta["url"])] = (offset, length)
+        self._write_index(entries, slots)
+
+    def _write_index(self, entries: dict[bytes, tuple[int, int]], slots: int):
+        """Writes a new index holding `entries` and swaps it in (lock must be held)."""
+        while len(entries) * 2 > slots:
+            slots *= 2
+        table = bytearray(_INDEX_HEADER.size + slots * _SLOT.size)
+        _INDEX_HEADER.pack_into(table, 0, _INDEX_MAGIC, slots, len(entries))
+        for digest, (offset, length) in entries.items():
+            slot = int.from_bytes(digest[:8], "little") % slots
+            while table[_INDEX_HEADER.size + slot * _SLOT.size:_INDEX_HEADER.size + slot * _SLOT.size + 16] != _EMPTY:
+                slot = (slot + 1) % slots
+            _SLOT.pack_into(table, _INDEX_HEADER.size + slot * _SLOT.size, digest, offset, length)
+
+        temporary = self._index_path + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(table)
+        self._close_index()
+        os.replace(temporary, self._index_path)
+        self._open_index()
+
+    def _scan(self) -> Iterator[tuple[int, int, bytes]]:
+        """Yields the offset, length and decompressed payload of every record in the data file."""
+        self._data.flush()
+        offset = 0
+        size = os.path.getsize(self._data_path)
+        while offset + _RECORD.size <= size:
+            magic, length = _RECORD.unpack(os.pread(self._data.fileno(), _RECORD.size, offset))
+            if magic != _RECORD_MAGIC or offset + _RECORD.size + length > size:
+                break  # A record cut short by a crash
+            compressed = os.pread(self._data.fileno(), length, offset + _RECORD.size)
+            yield offset, _RECORD.size + length, zlib.decompress(compressed)
+            offset += _RECORD.size + length
+
+    def put(self, url: str, response: requests.Response, source: str = "") -> bool:
+        """
+        Archives a downloaded page, replacing the copy returned by `get` for its URL.
+
+        Args:
+            url (str): URL of the page
+            response (requests.Response): The page response
+            source (str, optional): News source of the article. Defaults to "".
+
+        Returns:
+            bool: False if the response has no body to archive
+        """
+        content = getattr(response, "content", None)
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        if not isinstance(content, bytes):
+            return False
+
+        headers = getattr(response, "headers", None)
+        content_type = headers.get("Content-Type") if isinstance(headers, Mapping) else None
+        status_code = getattr(response, "status_code", None)
+        meta = {
+            "url": url,
+            "source": source,
+            "fetched_at": time.time(),
+            "status_code": status_code if isinstance(status_code, int) else 200,
+            "headers": {"Content-Type": content_type} if isinstance(content_type, str) else {},
+            "truncated": getattr(response, "truncated", False) is True,
+        }
+        payload = zlib.compress(json.dumps(meta).encode("utf-8") + b"\n" + content, self.compression_level)
+        record = _RECORD.pack(_RECORD_MAGIC, len(payload)) + payload
+
+        with self._lock:
+            self._data.seek(0, os.SEEK_END)
+            offset = self._data.tell()
+            self._data.write(record)
+            self._data.flush()
+            self._index_put(url_digest(url), offset, len(record))
+        return True
+
+    def get(self, url: str) -> Optional[ArchivedPage]:
+        """
+        Reads the latest archived copy of a page.
+
+        Args:
+            url (str): URL of the page
+
+        Returns:
+            Optional[ArchivedPage]: The page, None if it was never archived
+        """
+        with self._lock:
+            position, found = self._find_slot(url_digest(url))
+            if not found:
+                return None
+            _, offset, length = _SLOT.unpack_from(self._index, position)
+        return self._read(offset, length)
+
+    def _read(self, offset: int, length: int) -> ArchivedPage:
+        record = os.pread(self._data.fileno(), length, offset)
+        meta, content = zlib.decompress(record[_RECORD.size:]).split(b"\n", 1)
+        return ArchivedPage(content=content, **json.loads(meta))
+
+    def pages(self) -> Iterator[ArchivedPage]:
+        """
+        Yields the latest copy of every archived page, in the order they are stored on
+        disk so that the data file is read sequentially.
+        """
+        with self._lock:
+            entries = sorted(self._entries().values())
+        for offset, length in entries:
+            yield self._read(offset, length)
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return self._find_slot(url_digest(url))[1]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count
+
+    def close(self):
+        """Closes the data and index files."""
+        with self._lock:
+            self._close_index()
+            self._data.close()
+
+
+_default_archive: Optional[PageArchive] = None
+_default_archive_lock = threading.Lock()
+
+
+def get_default_archive() -> Optional[PageArchive]:
+    """
+    Returns the process-wide page archive in NEWS_ARCHIVE_DIR, or None when the variable
+    is not set.
+
+    Returns:
+        Optional[PageArchive]: The shared archive, or None
+    """
+    global _default_archive
+    directory = os.getenv("NEWS_ARCHIVE_DIR")
+    if not directory:
+        return None
+    with _default_archive_lock:
+        if _default_archive is None:
+            _default_archive = PageArchive(directory)
+        return _default_archive
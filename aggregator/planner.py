@@ -0,0 +1,79 @@
+from dataclasses import dataclass, field
+from entities.news_article import NewsArticle
+import re
+
+# Fields the scraper of each source fills in that the provider's API may already have
+# returned; an article is only downloaded while one of them is still empty. Pages of
+# other sources are scraped for their main text.
+SCRAPED_FIELDS: dict[str, tuple[str, ...]] = {
+    "The Guardian": ("content",),
+    "New York Times": ("author", "content", "title", "feature_image_url"),
+    "BBC News": ("body",),
+    "GNews": ("content",),
+}
+DEFAULT_SCRAPED_FIELDS = ("content",)
+
+# Ending of the content cut short by the GNews API, e.g. "... [2345 chars]"
+TRUNCATED_CONTENT = re.compile(r"\[\d+ chars\]\s*$")
+
+
+def missing_fields(article: NewsArticle) -> tuple[str, ...]:
+    """
+    Lists the scraped fields an article is still missing.
+
+    Args:
+        article (NewsArticle): The article to check
+
+    Returns:
+        tuple[str, ...]: Names of the empty fields, empty when nothing needs to be scraped
+    """
+    if not article.url:
+        return ()
+    names = SCRAPED_FIELDS.get(article.source, DEFAULT_SCRAPED_FIELDS)
+    return tuple(name for name in names if _is_missing(getattr(article, name, None)))
+
+
+def _is_missing(value) -> bool:
+    """Returns True for an empty field, or text the API truncated."""
+    return value in (None, "") or (isinstance(value, str) and TRUNCATED_CONTENT.search(value) is not None)
+
+
+@dataclass
+class EnrichmentPlan:
+    """
+    Which articles need their page downloaded to be enriched.
+
+    Attributes:
+        to_fetch (list[NewsArticle]): Articles missing at least one scraped field
+        skipped (list[NewsArticle]): Articles that already have every field (or have no URL)
+        missing (dict[str, tuple[str, ...]]): Missing fields by article URL, for the articles to fetch
+    """
+    to_fetch: list[NewsArticle] = field(default_factory=list)
+    skipped: list[NewsArticle] = field(default_factory=list)
+    missing: dict[str, tuple[str, ...]] = field(default_factory=dict)
+
+    @property
+    def requests_saved(self) -> int:
+        """Page downloads avoided, one per skipped article that has a page."""
+        return sum(1 for article in self.skipped if article.url)
+
+
+def plan_enrichment(articles: list[NewsArticle]) -> EnrichmentPlan:
+    """
+    Decides per article whether its page has to be downloaded.
+
+    Args:
+        articles (list[NewsArticle]): The articles to enrich
+
+    Returns:
+        EnrichmentPlan: The articles to fetch and those skipped
+    """
+    plan = EnrichmentPlan()
+    for article in articles:
+        missing = missing_fields(article)
+        if missing:
+            plan.to_fetch.append(article)
+            plan.missing[article.url] = missing
+        else:
+            plan.skipped.append(article)
+    return plan
@@ -0,0 +1,319 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import IntEnum
+from typing import Hashable, Optional
+import heapq
+import itertools
+import threading
+import time
+
+import requests
+
+
+class Priority(IntEnum):
+    """Scheduling priority of a request; lower values are served first."""
+    INTERACTIVE = 0  # A user is waiting for the page
+    BACKGROUND = 10  # Cache refreshes, prefetching and batch ingestion
+
+
+_current_priority: ContextVar[Priority] = ContextVar("request_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """
+    Runs the enclosed requests with the given priority.
+
+    Args:
+        priority (Priority): The priority to use inside the block
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """Returns the priority of requests made from the current context."""
+    return _current_priority.get()
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """Raised when a request cannot be scheduled within the provider's quota."""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    Published quota of a provider for a single API key.
+
+    Attributes:
+        per_second (float): Sustained requests per second
+        burst (int): Requests that may be sent back to back
+        per_day (Optional[int]): Requests per UTC day, None if unlimited
+    """
+    per_second: float
+    burst: int = 1
+    per_day: Optional[int] = None
+
+
+@dataclass
+class Budget:
+    """
+    Remaining request budget of an API key.
+
+    Attributes:
+        tokens (float): Requests that can be sent right now
+        daily_remaining (Optional[int]): Requests left today, None if unlimited
+        resets_at (Optional[datetime]): When the daily quota resets
+        waiting (int): Requests queued for a token
+    """
+    tokens: float
+    daily_remaining: Optional[int]
+    resets_at: Optional[datetime]
+    waiting: int
+
+
+# Free/developer tier quotas published by each provider
+DEFAULT_LIMITS: dict[str, RateLimit] = {
+    "TheGuardianApi": RateLimit(per_second=1, burst=1, per_day=500),
+    "BBCApi": RateLimit(per_second=1, burst=2, per_day=100),  # NewsAPI.org developer plan
+    "NYTNewsApi": RateLimit(per_second=5 / 60, burst=5, per_day=500),
+    "GNewsApi": RateLimit(per_second=1, burst=1, per_day=100),
+}
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate` tokens per second up to `capacity`,
+    with an optional daily cap.
+    """
+
+    def __init__(self, limit: RateLimit):
+        """
+        Initialize a full bucket.
+
+        Args:
+            limit (RateLimit): The quota the bucket enforces
+        """
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.day = self._today()
+        self.used_today = 0
+
+    @staticmethod
+    def _today():
+        return datetime.now(timezone.utc).date()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.limit.burst, self.tokens + (now - self.updated) * self.limit.per_second)
+        self.updated = now
+        today = self._today()
+        if today != self.day:
+            self.day = today
+            self.used_today = 0
+
+    def daily_remaining(self) -> Optional[int]:
+        """Returns the requests left today, None if there is no daily cap."""
+        if self.limit.per_day is None:
+            return None
+        self._refill(time.monotonic())
+        return max(self.limit.per_day - self.used_today, 0)
+
+    def try_acquire(self) -> float:
+        """
+        Takes a token if one is available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the seconds to wait before retrying
+
+        Raises:
+            RateLimitExceeded: If the daily quota is used up
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if self.limit.per_day is not None and self.used_today >= self.limit.per_day:
+            raise RateLimitExceeded("Daily request quota exhausted.")
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.used_today += 1
+            return 0.0
+        return (1 - self.tokens) / self.limit.per_second
+
+
+class RequestScheduler:
+    """
+    Schedules API requests against per-key token buckets. When requests have to
+    wait for a token, they are served by priority (interactive before background)
+    and then in arrival order, so bursts are smoothed to the provider's quota
+    instead of being answered with 429s.
+    """
+
+    def __init__(self, limits: Optional[dict[str, RateLimit]] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            limits (Optional[dict[str, RateLimit]], optional): Quota per provider name. Providers
+                without an entry are not limited. Defaults to None.
+        """
+        self.limits = dict(limits or {})
+        self._cond = threading.Condition()
+        self._buckets: dict[Hashable, TokenBucket] = {}
+        self._queues: dict[Hashable, list] = {}
+        self._sequence = itertools.count()
+        self.sent: dict[Hashable, int] = {}
+
+    def _bucket(self, provider: str, key: Hashable) -> Optional[TokenBucket]:
+        """Returns the bucket of an API key, creating it on first use (lock must be held)."""
+        limit = self.limits.get(provider)
+        if limit is None:
+            return None
+        bucket_key = (provider, key)
+        if bucket_key not in self._buckets:
+            self._buckets[bucket_key] = TokenBucket(limit)
+        return self._buckets[bucket_key]
+
+    def acquire(self, provider: str, key: Hashable = None, priority: Optional[Priority] = None,
+                timeout: Optional[float] = None):
+        """
+        Blocks until a request for the provider and API key may be sent.
+
+        Args:
+            provider (str): The provider name, e.g. "GNewsApi"
+            key (Hashable, optional): The API key the quota belongs to. Defaults to None.
+            priority (Optional[Priority], optional): Defaults to the priority of the current context.
+            timeout (Optional[float], optional): Maximum seconds to wait. Defaults to None.
+
+        Raises:
+            RateLimitExceeded: If the daily quota is used up or the timeout passes
+        """
+        priority = current_priority() if priority is None else priority
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        bucket_key = (provider, key)
+
+        with self._cond:
+            bucket = self._bucket(provider, key)
+            if bucket is None:
+                self.sent[bucket_key] = self.sent.get(bucket_key, 0) + 1
+                return
+
+            ticket = (int(priority), next(self._sequence))
+            queue = self._queues.setdefault(bucket_key, [])
+            heapq.heappush(queue, ticket)
+            try:
+                while True:
+                    wait = None
+                    if queue[0] == ticket:
+                        wait = bucket.try_acquire()
+                        if wait == 0:
+                            self.sent[bucket_key] = self.sent.get(bucket_key, 0) + 1
+                            return
+
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise RateLimitExceeded(f"Timed out waiting for {provider} rate limit.")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(timeout=wait)
+            finally:
+                queue.remove(ticket)
+                heapq.heapify(queue)
+                # Let the next request in line check for a token
+                self._cond.notify_all()
+
+    def acquire_nowait(self, provider: str, key: Hashable = None) -> float:
+        """
+        Takes a token without blocking, for callers that wait on an event loop.
+        Requests already queued in `acquire` keep their turn.
+
+        Args:
+            provider (str): The provider name
+            key (Hashable, optional): The API key. Defaults to None.
+
+        Returns:
+            float: 0 if the request may be sent, otherwise the seconds to wait before trying again
+
+        Raises:
+            RateLimitExceeded: If the daily quota is used up
+        """
+        bucket_key = (provider, key)
+        with self._cond:
+            bucket = self._bucket(provider, key)
+            if bucket is not None:
+                if self._queues.get(bucket_key):
+                    return 1 / bucket.limit.per_second
+                wait = bucket.try_acquire()
+                if wait > 0:
+                    return wait
+            self.sent[bucket_key] = self.sent.get(bucket_key, 0) + 1
+            return 0.0
+
+    def penalize(self, provider: str, key: Hashable = None, retry_after: float = 1.0):
+        """
+        Pauses a key after the provider answered 429 Too Many Requests.
+
+        Args:
+            provider (str): The provider name
+            key (Hashable, optional): The API key. Defaults to None.
+            retry_after (float, optional): Seconds to pause. Defaults to 1.0.
+        """
+        with self._cond:
+            bucket = self._bucket(provider, key)
+            if bucket is not None:
+                bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + retry_after)
+                bucket.tokens = 0
+
+    def remaining(self, provider: str, key: Hashable = None) -> Budget:
+        """
+        Reports the remaining budget of an API key.
+
+        Args:
+            provider (str): The provider name
+            key (Hashable, optional): The API key. Defaults to None.
+
+        Returns:
+            Budget: The remaining budget
+        """
+        with self._cond:
+            bucket = self._bucket(provider, key)
+            waiting = len(self._queues.get((provider, key), []))
+            if bucket is None:
+                return Budget(tokens=float("inf"), daily_remaining=None, resets_at=None, waiting=waiting)
+
+            bucket._refill(time.monotonic())
+            resets_at = None
+            if bucket.limit.per_day is not None:
+                midnight = datetime.combine(bucket.day + timedelta(days=1), datetime.min.time())
+                resets_at = midnight.replace(tzinfo=timezone.utc)
+            return Budget(
+                tokens=bucket.tokens,
+                daily_remaining=bucket.daily_remaining(),
+                resets_at=resets_at,
+                waiting=waiting,
+            )
+
+
+_shared_scheduler: Optional[RequestScheduler] = None
+_shared_scheduler_lock = threading.Lock()
+
+
+def get_shared_scheduler() -> RequestScheduler:
+    """
+    Returns the process-wide scheduler enforcing the providers' published quotas.
+
+    Returns:
+        RequestScheduler: The shared scheduler
+    """
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = RequestScheduler(limits=DEFAULT_LIMITS)
+        return _shared_scheduler
@@ -0,0 +1,259 @@
+from dataclasses import dataclass
+from typing import Optional, Union
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def content_hash(content: Union[bytes, str, None]) -> str:
+    """
+    Returns the SHA-256 hex digest of a page body.
+
+    Args:
+        content (Union[bytes, str, None]): The page body
+
+    Returns:
+        str: The digest, empty for a missing body
+    """
+    if not isinstance(content, (bytes, str)):
+        return ""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+@dataclass
+class ScrapeRecord:
+    """
+    Fields scraped from an article page.
+
+    Attributes:
+        url (str): URL of the page
+        extractor (str): Name of the extraction function that produced the fields
+        fields (dict): The scraped fields
+        content_hash (str): SHA-256 of the page body the fields were extracted from
+        fetched_at (float): Unix time the page was last downloaded
+        size (int): Size of the stored fields in bytes
+    """
+    url: str
+    extractor: str
+    fields: dict
+    content_hash: str
+    fetched_at: float
+    size: int
+
+    @property
+    def age(self) -> float:
+        """Seconds since the page was last downloaded."""
+        return time.time() - self.fetched_at
+
+
+@dataclass
+class ScrapeStoreStats:
+    """
+    Usage statistics of a scrape store.
+
+    Attributes:
+        hits (int): Lookups answered with a fresh record
+        misses (int): Lookups with no record, or only an expired one
+        evictions (int): Records removed to stay under the size limit
+        entries (int): Records currently stored
+        bytes (int): Total size of the stored fields
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class ScrapeStore:
+    """
+    Persistent SQLite store of scrape results keyed by URL, so that articles already
+    seen are enriched with a lookup instead of a download and a parse. Records older
+    than `max_age` are scraped again. If the new download has the same content hash,
+    the stored fields are reused without parsing. The least recently used records are
+    evicted once the store grows beyond `max_bytes`.
+    """
+
+    def __init__(self, path: str = ":memory:", max_age: Optional[float] = 7 * 24 * 3600,
+                 max_bytes: int = 64 * 1024 * 1024):
+        """
+        Open (or create) the store.
+
+        Args:
+            path (str, optional): SQLite database file. Defaults to ":memory:".
+            max_age (Optional[float], optional): Seconds a record is served without downloading
+                the page again, None to keep records until evicted. Defaults to 7 days.
+            max_bytes (int, optional): Maximum total size of the stored fields. Defaults to 64 MiB.
+        """
+        self.path = path
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = ScrapeStoreStats()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scrapes (
+                url TEXT NOT NULL,
+                extractor TEXT NOT NULL,
+                fields TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (url, extractor)
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS scrapes_accessed_at ON scrapes (accessed_at)")
+        self._db.commit()
+
+    def is_fresh(self, record: ScrapeRecord) -> bool:
+        """Returns True while a record is younger than `max_age`."""
+        return self.max_age is None or record.age < self.max_age
+
+    def get(self, url: str, extractor: str, allow_expired: bool = False) -> Optional[ScrapeRecord]:
+        """
+        Looks up the scrape result of a page.
+
+        Args:
+            url (str): URL of the page
+            extractor (str): Name of the extraction function
+            allow_expired (bool, optional): Also return records older than `max_age`, e.g. to
+                compare their content hash with a new download. Defaults to False.
+
+        Returns:
+            Optional[ScrapeRecord]: The record, None if there is none (or it expired)
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fields, content_hash, fetched_at, size FROM scrapes WHERE url = ? AND extractor = ?",
+                (url, extractor),
+            ).fetchone()
+            record = None
+            if row is not None:
+                record = ScrapeRecord(url, extractor, json.loads(row[0]), row[1], row[2], row[3])
+
+            fresh = record is not None and self.is_fresh(record)
+            if fresh:
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+            if record is not None and (fresh or allow_expired):
+                self._db.execute(
+                    "UPDATE scrapes SET accessed_at = ? WHERE url = ? AND extractor = ?",
+                    (time.time(), url, extractor),
+                )
+                self._db.commit()
+                return record
+            return None
+
+    def put(self, url: str, extractor: str, fields: dict, page_hash: str) -> ScrapeRecord:
+        """
+        Stores the scrape result of a page, evicting old records if the store grew too large.
+
+        Args:
+            url (str): URL of the page
+            extractor (str): Name of the extraction function
+            fields (dict): The scraped fields (JSON serializable)
+            page_hash (str): Content hash of the page body
+
+        Returns:
+            ScrapeRecord: The stored record
+        """
+        payload = json.dumps(fields)
+        now = time.time()
+        record = ScrapeRecord(url, extractor, dict(fields), page_hash, now, len(payload.encode("utf-8")))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO scrapes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, extractor, payload, page_hash, now, now, record.size),
+            )
+            self._evict()
+            self._db.commit()
+        return record
+
+    def touch(self, record: ScrapeRecord):
+        """Marks a record as downloaded now, after a new download had the same content hash."""
+        record.fetched_at = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE scrapes SET fetched_at = ?, accessed_at = ? WHERE url = ? AND extractor = ?",
+                (record.fetched_at, record.fetched_at, record.url, record.extractor),
+            )
+            self._db.commit()
+
+    def _evict(self):
+        """Deletes the least recently used records until the store fits `max_bytes` (lock must be held)."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM scrapes").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT url, extractor, size FROM scrapes ORDER BY accessed_at").fetchall()
+        for url, extractor, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM scrapes WHERE url = ? AND extractor = ?", (url, extractor))
+            total -= size
+            self._stats.evictions += 1
+
+    def delete(self, url: str):
+        """Removes every record of a URL."""
+        with self._lock:
+            self._db.execute("DELETE FROM scrapes WHERE url = ?", (url,))
+            self._db.commit()
+
+    def clear(self):
+        """Removes every record."""
+        with self._lock:
+            self._db.execute("DELETE FROM scrapes")
+            self._db.commit()
+
+    def stats(self) -> ScrapeStoreStats:
+        """
+        Reports the store's usage.
+
+        Returns:
+            ScrapeStoreStats: Hit/miss counters and the current size
+        """
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM scrapes").fetchone()
+            return ScrapeStoreStats(self._stats.hits, self._stats.misses, self._stats.evictions, entries, size)
+
+    def close(self):
+        """Closes the database."""
+        with self._lock:
+            self._db.close()
+
+
+_default_store: Optional[ScrapeStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_scrape_store() -> Optional[ScrapeStore]:
+    """
+    Returns the process-wide scrape store at NEWS_CACHE_DIR/scrapes.sqlite3, with its
+    maximum age in seconds taken from NEWS_SCRAPE_MAX_AGE (7 days by default). Returns
+    None when NEWS_CACHE_DIR is not set, since a store that does not survive restarts
+    adds nothing over the in-memory caches.
+
+    Returns:
+        Optional[ScrapeStore]: The shared store, or None
+    """
+    global _default_store
+    cache_dir = os.getenv("NEWS_CACHE_DIR")
+    if not cache_dir:
+        return None
+    with _default_store_lock:
+        if _default_store is None:
+            max_age = float(os.getenv("NEWS_SCRAPE_MAX_AGE", 7 * 24 * 3600))
+            _default_store = ScrapeStore(os.path.join(cache_dir, "scrapes.sqlite3"), max_age=max_age)
+        return _default_store
@@ -1,21 +1,172 @@
 from entities.news_article import NewsArticle, NYTArticle
-from bs4 import BeautifulSoup
+from aggregator.http_session import HTTPSessionPool, get_shared_pool
+from aggregator.singleflight import SingleFlight, get_shared_group
+from aggregator.cache import CacheBackend, MemoryCache, make_cache_key
+from aggregator.scrape_store import ScrapeStore, content_hash, get_default_scrape_store
+from aggregator.planner import EnrichmentPlan, missing_fields, plan_enrichment
+from aggregator.frontier import CrawlFrontier, get_shared_frontier
+from aggregator.rate_limiter import Priority
+from aggregator.page_archive import ArchivedPage, PageArchive, get_default_archive
+from aggregator.extraction import (
+    BBC_FIELDS, BBC_STOP, GUARDIAN_BODY, GUARDIAN_STOP, NYTIMES_FIELDS, NYTIMES_STOP,
+    ElementSpec, PageScanner, declared_encoding, detach_page, main_content, parse_page,
+)
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional, Union
+from urllib.parse import urlsplit
+import os
+import queue
+import threading
+import time
 import requests
 
+# Extraction results of validated pages, shared by every scraper so that a page answered
+# with 304 Not Modified is not parsed again
+_extraction_cache = MemoryCache(ttl=None, max_entries=2048, max_bytes=32 * 1024 * 1024)
+
+# Fields scraped on demand, keyed by source and URL, so that reopening an article (or the
+# rerun of the page that follows) does not scrape it again
+_enrichment_memo = MemoryCache(ttl=3600, max_entries=1024, max_bytes=32 * 1024 * 1024)
+
+# Pages downloaded at once from a single news site, matched on the end of the host name
+DEFAULT_HOST_LIMITS = {
+    "theguardian.com": 4,
+    "nytimes.com": 4,
+    "bbc.co.uk": 4,
+    "bbc.com": 4,
+}
+
+# Bytes read from the network at a time when streaming pages
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Failure recorded for an archived page holding only the beginning of the page
+TRUNCATED_PAGE = "Archived page is truncated"
+
+
+def _is_success(response: requests.Response) -> bool:
+    """Returns True for a 2xx response (or one without a numeric status)."""
+    status = getattr(response, "status_code", None)
+    return not isinstance(status, int) or 200 <= status < 300
+
+
+def _unusable_page(page: ArchivedPage) -> Optional[str]:
+    """Returns why an archived page cannot be extracted again, None if it can."""
+    if page.truncated:
+        return TRUNCATED_PAGE
+    if not 200 <= page.status_code < 300:
+        return f"Archived page has status {page.status_code}"
+    return None
+
+
+def _conditional_headers(response: requests.Response) -> dict[str, str]:
+    """Builds the If-None-Match/If-Modified-Since headers revalidating a downloaded page."""
+    headers = {}
+    if response.headers.get("ETag"):
+        headers["If-None-Match"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        headers["If-Modified-Since"] = response.headers["Last-Modified"]
+    return headers
+
+
+class _ParseJob:
+    """A downloaded page left for the parse stage, with the saving of its extracted fields."""
+
+    def __init__(self, run: Callable[[], dict]):
+        self.run = run
+
+
 class ArticleScraper:
     """
     Class responsible for enriching news articles with additional content through web scraping.
-    Supports multiple news sources including The Guardian, New York Times, GNews, and BBC News.
+    Supports multiple news sources including The Guardian, New York Times, GNews, and BBC News;
+    pages of GNews and any other source are scraped for their main text.
     """
 
-    def __init__(self, articles: list[NewsArticle]):
+    def __init__(self, articles: list[NewsArticle], session_pool: Optional[HTTPSessionPool] = None,
+                 flight: Optional[SingleFlight] = None, extraction_cache: Optional[CacheBackend] = None,
+                 max_workers: int = 8, host_limits: Optional[dict[str, int]] = None, timeout: float = 15.0,
+                 scrape_store: Optional[ScrapeStore] = None, lazy: bool = False,
+                 enrichment_memo: Optional[CacheBackend] = None, streaming: bool = False,
+                 byte_budget: int = 512 * 1024, parse_pool: Optional[Executor] = None,
+                 parse_queue_size: Optional[int] = None, frontier: Optional[CrawlFrontier] = None,
+                 archive: Optional[PageArchive] = None, parse_workers: Optional[int] = None):
         """
-        Initialize the ArticleScraper with a list of articles to enrich.
+        Initialize the ArticleScraper with a list of articles to enrich. Unless `lazy` is set,
+        every article is enriched right away. Articles whose API data already holds every
+        field their scraper fills in are not downloaded.
 
         Args:
             articles (list[NewsArticle]): List of news articles to be enriched with additional content
+            session_pool (Optional[HTTPSessionPool]): Connection pool used to download the pages.
+                Defaults to the shared pool.
+            flight (Optional[SingleFlight]): Group used to share concurrent downloads of the same
+                URL. Defaults to the shared group.
+            extraction_cache (Optional[CacheBackend]): Extraction results keyed by URL and page
+                validator, reused when a page has not been modified. Defaults to the shared cache.
+            max_workers (int): Articles enriched at once. 1 enriches them one by one. Defaults to 8.
+            host_limits (Optional[dict[str, int]]): Articles enriched at once per site, keyed by
+                domain (e.g. {"nytimes.com": 2}). Defaults to DEFAULT_HOST_LIMITS.
+            timeout (float): Seconds after which the enrichment of an article is abandoned.
+                Defaults to 15.0.
+            scrape_store (Optional[ScrapeStore]): Persistent scrape results keyed by URL; articles
+                scraped recently are enriched from it without a download. Defaults to the store
+                under NEWS_CACHE_DIR, if set.
+            lazy (bool): Leave the articles untouched until `enrich` (or `prefetch`) is called
+                for them. Defaults to False.
+            enrichment_memo (Optional[CacheBackend]): Fields scraped by `enrich` and `prefetch`,
+                keyed by source and URL. Defaults to the shared memo.
+            streaming (bool): Download pages in chunks and stop as soon as the fields to
+                extract have been received, or `byte_budget` bytes were read. Streamed pages
+                bypass the HTTP cache; they are revalidated with the ETag or Last-Modified
+                value of their last download instead. Defaults to False.
+            byte_budget (int): Maximum bytes read from a streamed page. Defaults to 512 KiB.
+            parse_pool (Optional[Executor]): Executor parsing downloaded pages, e.g. a
+                ProcessPoolExecutor with the "spawn" context, so that parsing large batches
+                runs on every core. `enrich_articles` then runs in two stages: the
+                `max_workers` threads only download, freeing the site's slot as soon as a
+                page is received, and hand the pages through a queue to `parse_workers`
+                threads feeding the pool. Defaults to parsing on the downloading thread.
+            parse_queue_size (Optional[int]): Downloaded pages waiting for the parse stage;
+                downloads pause while the queue is full. Also caps the pages handed to the
+                pool at once by `reextract_archive`. Defaults to twice the number of CPUs.
+            frontier (Optional[CrawlFrontier]): Priority queue running `prefetch`. Defaults
+                to the shared frontier.
+            archive (Optional[PageArchive]): Archive every page downloaded in full is appended
+                to, so that `reextract` and `reextract_archive` can run the extractors again
+                offline. Error responses and streamed pages whose download stopped early are
+                not archived.
+                Defaults to the archive in NEWS_ARCHIVE_DIR, if set.
+            parse_workers (Optional[int]): Pages of the parse stage parsed at once. Defaults
+                to the number of CPUs.
         """
         self.articles: list[NewsArticle] = articles
+        self.session_pool = session_pool or get_shared_pool()
+        self.flight = flight or get_shared_group()
+        self.extraction_cache = extraction_cache if extraction_cache is not None else _extraction_cache
+        self.parses_skipped = 0  # Pages answered with 304 whose extraction was reused
+        self.max_workers = max(max_workers, 1)
+        self.host_limits = dict(DEFAULT_HOST_LIMITS if host_limits is None else host_limits)
+        self.timeout = timeout
+        self.failures: dict[str, str] = {}  # Error message per article URL that could not be enriched
+        self.scrape_store = scrape_store if scrape_store is not None else get_default_scrape_store()
+        self.store_hits = 0  # Articles enriched from the scrape store without a download
+        self._lock = threading.Lock()
+        self._host_slots = {domain: threading.BoundedSemaphore(limit) for domain, limit in self.host_limits.items()}
+        self.enrichment_memo = enrichment_memo if enrichment_memo is not None else _enrichment_memo
+        self._prefetches: dict[str, Future] = {}  # Background enrichments by memo key
+        self.frontier = frontier or get_shared_frontier()
+        self.archive = archive if archive is not None else get_default_archive()
+        self.streaming = streaming
+        self.byte_budget = byte_budget
+        self.bytes_read = 0  # Bytes of streamed pages downloaded
+        self.early_stops = 0  # Streamed pages whose download stopped before their end
+        self.parse_pool = parse_pool
+        self.plan = EnrichmentPlan()  # Articles downloaded and skipped by the last `enrich_articles`
+        self.requests_saved = 0  # Page downloads skipped because the article had every field
+        self.parse_queue_size = max(parse_queue_size or 2 * (os.cpu_count() or 1), 1)
+        self.parse_workers = max(parse_workers or os.cpu_count() or 1, 1)
+        self._parse_slots = threading.BoundedSemaphore(self.parse_queue_size)
+        self._local = threading.local()  # Whether the current download defers parsing to its caller
 
         # Dictionary mapping news sources to their respective scraping functions
         self.scrapers = {
@@ -24,29 +175,520 @@ class ArticleScraper:
             "GNews": self.scraping_GNews,
             "BBC News": self.scraping_bbc
         }
+        # Extraction function used by each scraping function, to re-run it on archived pages
+        self.extractors = {
+            "The Guardian": self._extract_guardian,
+            "New York Times": self._extract_nytimes,
+            "BBC News": self._extract_bbc,
+        }
+
+        if not lazy:
+            self.enrich_articles()
+
+    def _memo_key(self, article: NewsArticle) -> str:
+        """Identifies the scraped fields of an article in the enrichment memo."""
+        return make_cache_key(article.source, article.url)
+
+    def _scraper_for(self, article: NewsArticle) -> Callable[[NewsArticle], dict]:
+        """Returns the scraping function of an article's source, the generic one for other sources."""
+        return self.scrapers.get(article.source, self.scraping_generic)
+
+    def _scrape_fields(self, article: NewsArticle) -> dict:
+        """Scrapes the fields of an article and memoizes them."""
+        fields = self._run_scraper(self._scraper_for(article), article, {})
+        self.enrichment_memo.set(self._memo_key(article), dict(fields))
+        return fields
+
+    def enrich(self, article: NewsArticle) -> NewsArticle:
+        """
+        Enriches a single article on demand, e.g. when its detail view is opened. Fields
+        scraped before (by this or an earlier scraper, or by `prefetch`) are applied
+        without scraping the page again. Failures are recorded in `failures` and leave the
+        article unchanged.
+
+        Args:
+            article (NewsArticle): The article to enrich
+
+        Returns:
+            NewsArticle: The same article, enriched
+        """
+        if not missing_fields(article):
+            with self._lock:
+                self.requests_saved += 1
+            return article
+
+        key = self._memo_key(article)
+        fields = self.enrichment_memo.get(key)
+        try:
+            if fields is None:
+                with self._lock:
+                    pending = self._prefetches.get(key)
+                if pending is not None and not pending.cancel():
+                    fields = pending.result(timeout=self.timeout)
+                else:
+                    fields = self._scrape_fields(article)
+        except Exception as e:
+            self.failures[article.url] = str(e)
+            print(f"Error scraping {article.source} ({article.url}): {e}")
+            return article
+
+        # Update article attributes with enriched data
+        for name, value in fields.items():
+            setattr(article, name, value)
+        return article
+
+    def prefetch(self, articles: list[NewsArticle], priority: Priority = Priority.BACKGROUND):
+        """
+        Scrapes articles in the background so that opening them later is instant. The
+        articles are not modified until `enrich` is called for them. They are queued on
+        the crawl frontier, behind articles prefetched with a more urgent priority;
+        articles already queued are moved up if `priority` is more urgent.
 
-        self.enrich_articles()
+        Args:
+            articles (list[NewsArticle]): Articles the user is likely to open next
+            priority (Priority, optional): Priority.INTERACTIVE for articles on screen,
+                Priority.BACKGROUND for the others. Defaults to Priority.BACKGROUND.
+        """
+        for article in articles:
+            key = self._memo_key(article)
+            if not missing_fields(article) or self.enrichment_memo.get(key) is not None:
+                continue
+            with self._lock:
+                future = self.frontier.submit(key, lambda article=article: self._scrape_fields(article), priority)
+                known = self._prefetches.get(key) is future
+                self._prefetches[key] = future
+            if not known:
+                # Finished prefetches are served from the memo; failed ones are retried on demand
+                future.add_done_callback(lambda f, key=key: self._forget_prefetch(key, f))
+
+    def cancel_prefetches(self) -> int:
+        """
+        Cancels the background prefetches of this scraper that have not started yet, e.g.
+        when the list they were queued for is replaced. Articles prefetched with
+        Priority.INTERACTIVE are still scraped.
+
+        Returns:
+            int: Number of prefetches cancelled
+        """
+        with self._lock:
+            keys = list(self._prefetches)
+        return sum(self.frontier.cancel(key, Priority.BACKGROUND) for key in keys)
+
+    def _forget_prefetch(self, key: str, future: Future):
+        with self._lock:
+            if self._prefetches.get(key) is future:
+                del self._prefetches[key]
 
     def enrich_articles(self):
         """
         Enriches all articles with additional content by applying the appropriate scraping function
-        based on the article's source.
+        based on the article's source. Articles that already have every field their scraper
+        fills in are skipped; `plan` records which were downloaded and `requests_saved`
+        counts the downloads avoided.
+
+        Pages are downloaded and parsed by up to `max_workers` threads, with at most
+        `host_limits[domain]` at once per site. With a `parse_pool`, those threads only
+        download, and the pages are parsed by a separate stage reading them from a queue
+        of `parse_queue_size`, so that downloads go on while pages are parsed. The timeout
+        of an article covers both stages. The results are applied in the order of the
+        articles once every page is done, so the outcome is the same as enriching them one
+        by one. Articles that fail or take longer than `timeout` are left unchanged and
+        their error is recorded in `failures`.
+        """
+        self.plan = plan_enrichment(self.articles)
+        with self._lock:
+            self.requests_saved += self.plan.requests_saved
+
+        parse_queue = None
+        if self.parse_pool is not None:
+            parse_queue = queue.Queue(maxsize=self.parse_queue_size)
+            for _ in range(self.parse_workers):
+                threading.Thread(target=self._parse_stage, args=(parse_queue,), name="parse", daemon=True).start()
+
+        jobs: list[tuple[NewsArticle, Future, dict]] = []
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="enrich")
+        try:
+            for article in self.plan.to_fetch:
+                scraper = self._scraper_for(article)
+                timing = {}
+                future = executor.submit(self._run_scraper, scraper, article, timing, parse_queue)
+                jobs.append((article, future, timing))
+
+            results = [self._wait_for(future, timing) for _, future, timing in jobs]
+        finally:
+            # Pages still downloading after their timeout are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+            if parse_queue is not None:
+                self._stop_parse_stage(parse_queue, [future for _, future, _ in jobs])
+
+        for (article, _, _), (enriched_data, error) in zip(jobs, results):
+            if error is not None:
+                self.failures[article.url] = error
+                print(f"Error scraping {article.source} ({article.url}): {error}")
+                continue
+
+            # Update article attributes with enriched data
+            for key, value in enriched_data.items():
+                setattr(article, key, value)
+
+    def _host_slot(self, url: str) -> Optional[threading.BoundedSemaphore]:
+        """Returns the semaphore capping concurrent downloads from the site of a URL, if any."""
+        host = (urlsplit(url).hostname or "").lower()
+        for domain, slot in self._host_slots.items():
+            if host == domain or host.endswith(f".{domain}"):
+                return slot
+        return None
+
+    def _run_scraper(self, scraper: Callable[[NewsArticle], dict], article: NewsArticle, timing: dict,
+                     parse_queue: Optional[queue.Queue] = None) -> Union[dict, Future]:
         """
-        for article in self.articles:
-            scraper = self.scrapers.get(article.source)
+        Applies a scraping function on a worker thread, within the cap of the article's site.
+        With a parse pool, the page is parsed once the site's slot is released: it is put on
+        `parse_queue` when given, waiting while the queue is full, and parsed on this thread
+        otherwise.
 
-            if scraper:
-                try:
-                    # Apply scraping function to get enriched data
-                    enriched_data = scraper(article)
+        Returns:
+            Union[dict, Future]: The scraped fields, or the future of the parse stage
+        """
+        slot = self._host_slot(article.url or "")
+        if slot is not None:
+            slot.acquire()
+        self._local.defer_parse = self.parse_pool is not None
+        try:
+            # The timeout starts once the article gets its turn
+            timing["started"] = time.monotonic()
+            result = scraper(article)
+        finally:
+            self._local.defer_parse = False
+            if slot is not None:
+                slot.release()
+
+        if not isinstance(result, _ParseJob):
+            return result
+        if parse_queue is None:
+            return result.run()
+        parsed = Future()
+        parse_queue.put((result, parsed))
+        return parsed
+
+    @staticmethod
+    def _parse_stage(parse_queue: queue.Queue):
+        """Runs the parse jobs put on the queue by the download stage, until it gets None."""
+        while True:
+            item = parse_queue.get()
+            if item is None:
+                return
+            job, parsed = item
+            # Articles that timed out while queued are skipped
+            if not parsed.set_running_or_notify_cancel():
+                continue
+            try:
+                parsed.set_result(job.run())
+            except Exception as e:
+                parsed.set_exception(e)
+
+    def _stop_parse_stage(self, parse_queue: queue.Queue, downloads: list[Future]):
+        """Stops the parse threads once no download can put another page on the queue."""
+        def stop():
+            wait(downloads)
+            for _ in range(self.parse_workers):
+                parse_queue.put(None)
+
+        threading.Thread(target=stop, name="parse-stop", daemon=True).start()
+
+    def _wait_for(self, future: Future, timing: dict) -> tuple[Optional[dict], Optional[str]]:
+        """
+        Waits for the enrichment of an article.
 
-                    # Update article attributes with enriched data
-                    for key, value in enriched_data.items():
-                        setattr(article, key, value)
+        Returns:
+            tuple[Optional[dict], Optional[str]]: The scraped fields, or the error message
+        """
+        while True:
+            while not future.done():
+                started = timing.get("started")
+                remaining = self.timeout if started is None else started + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    future.cancel()
+                    return None, f"Timed out after {self.timeout}s"
+                # Loops again if the article was still queued behind others of the same site
+                wait([future], timeout=remaining)
+
+            try:
+                result = future.result()
+            except Exception as e:
+                return None, str(e)
+            if not isinstance(result, Future):
+                return result, None
+            # The page was downloaded and handed to the parse stage
+            future = result
+
+    def _fetch_page(self, url: str, stop: Optional[ElementSpec] = None, **kwargs) -> requests.Response:
+        """
+        Downloads an article page through the shared connection pool. Concurrent
+        downloads of the same URL share one request, and a slow download is hedged
+        since page GETs are safe to repeat. In streaming mode, the download stops once
+        the `stop` element has been received.
+
+        Args:
+            url (str): URL of the page to download
+            stop (Optional[ElementSpec]): Element after which the rest of the page is not needed
+            **kwargs: Any keyword argument accepted by requests.Session.get
+
+        Returns:
+            requests.Response: The page response
+        """
+        key = ("GET", url, repr(sorted(kwargs.get("headers", {}).items())))
+        if self.streaming and stop is not None:
+            return self.flight.do(key + (stop,), lambda: self._stream_page(url, stop, **kwargs))
+        return self.flight.do(key, lambda: self.session_pool.get(url, hedge=True, **kwargs))
+
+    def _stream_page(self, url: str, stop: ElementSpec, **kwargs) -> requests.Response:
+        """
+        Downloads the beginning of a page, up to the end of the `stop` element or
+        `byte_budget` bytes, and closes the connection without reading the rest.
+
+        Returns:
+            requests.Response: The response, with `content` holding the bytes read,
+                `truncated` set when the download stopped before the end of the page and
+                `validator` the ETag or Last-Modified value of a 200 response
+        """
+        response = self.session_pool.get(url, stream=True, **kwargs)
+        scanner = PageScanner(stop, declared_encoding(response))
+        chunks = []
+        size = 0
+        truncated = False
+        try:
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                chunks.append(chunk)
+                size += len(chunk)
+                if scanner.feed_bytes(chunk) or size >= self.byte_budget:
+                    truncated = True
+                    break
+        finally:
+            response.close()
+
+        response._content = b"".join(chunks)[:self.byte_budget]
+        response._content_consumed = True
+        response.truncated = truncated
+        # Streamed bodies bypass the HTTP cache, so the page is validated by the scraper.
+        # Only a full 200 answer identifies the page the ETag or Last-Modified value belongs to.
+        response.from_cache = False
+        response.validator = (response.headers.get("ETag") or response.headers.get("Last-Modified") or "") \
+            if response.status_code == 200 else ""
+        with self._lock:
+            self.bytes_read += size
+            self.early_stops += truncated
+        return response
+
+    def _scrape_page(self, article: NewsArticle, extract: Callable[[NewsArticle, requests.Response], dict],
+                     stop: Optional[ElementSpec] = None, **kwargs) -> dict:
+        """
+        Downloads an article page and extracts its fields. Pages scraped recently are served
+        from the scrape store without a download. When the server answers that the page has
+        not been modified since the last visit, or the downloaded page has the same content
+        hash as the stored one, the previous extraction result is reused and the page is not
+        parsed again. Streamed pages are revalidated with the ETag or Last-Modified value of
+        their last download. Only 2xx responses are extracted and saved.
+
+        Args:
+            article (NewsArticle): The article to scrape
+            extract (Callable[[NewsArticle, requests.Response], dict]): Extraction function for the source
+            stop (Optional[ElementSpec]): Element closing last among those `extract` reads
+            **kwargs: Any keyword argument accepted by requests.Session.get
+
+        Returns:
+            dict: Dictionary containing the scraped content
+
+        Raises:
+            requests.HTTPError: If the server answered with an error status
+        """
+        stored = None
+        if self.scrape_store is not None:
+            stored = self.scrape_store.get(article.url, extract.__name__, allow_expired=True)
+            if stored is not None and self.scrape_store.is_fresh(stored):
+                with self._lock:
+                    self.store_hits += 1
+                return dict(stored.fields)
+
+        streamed = self.streaming and stop is not None
+        validators_key = make_cache_key("validators", extract.__name__, article.url)
+        previous = None  # Extraction result of the last streamed download, if still cached
+        if streamed:
+            conditional = self.extraction_cache.get(validators_key)
+            if conditional:
+                validator = conditional.get("If-None-Match") or conditional.get("If-Modified-Since")
+                previous = self.extraction_cache.get(make_cache_key(extract.__name__, article.url, validator))
+            if previous is not None:
+                kwargs["headers"] = {**kwargs.get("headers", {}), **conditional}
+
+        response = self._fetch_page(article.url, stop=stop, **kwargs)
+        if previous is not None and response.status_code == 304:
+            with self._lock:
+                self.parses_skipped += 1
+            if stored is not None:
+                self.scrape_store.touch(stored)
+            return dict(previous)
+
+        # Streamed pages cut short would be re-extracted from their beginning only
+        if self.archive is not None and _is_success(response) \
+                and getattr(response, "from_cache", False) is not True \
+                and getattr(response, "truncated", False) is not True:
+            self.archive.put(article.url, response, article.source)
+
+        if not _is_success(response):
+            # Error pages must not be stored and served in place of the article
+            raise requests.HTTPError(f"{response.status_code} error for url: {article.url}", response=response)
+
+        validator = getattr(response, "validator", None)
+        memo_key = make_cache_key(extract.__name__, article.url, validator) \
+            if isinstance(validator, str) and validator else None
+
+        if memo_key and getattr(response, "from_cache", False) is True:
+            cached = self.extraction_cache.get(memo_key)
+            if cached is not None:
+                with self._lock:
+                    self.parses_skipped += 1
+                if stored is not None:
+                    self.scrape_store.touch(stored)
+                return dict(cached)
+
+        page_hash = content_hash(response.content) if self.scrape_store is not None else ""
+        if stored is not None and stored.content_hash == page_hash:
+            with self._lock:
+                self.parses_skipped += 1
+            self.scrape_store.touch(stored)
+            return dict(stored.fields)
+
+        def save(result: dict) -> dict:
+            if memo_key:
+                self.extraction_cache.set(memo_key, dict(result))
+                if streamed and response.status_code == 200:
+                    self.extraction_cache.set(validators_key, _conditional_headers(response))
+            if self.scrape_store is not None:
+                self.scrape_store.put(article.url, extract.__name__, result, page_hash)
+            return result
+
+        if self.parse_pool is None:
+            return save(extract(article, response))
+        page = detach_page(response)
+        job = _ParseJob(lambda: save(self.parse_pool.submit(extract, article, page).result()))
+        # Pages downloaded by `_run_scraper` are parsed after the site's slot is released
+        return job if getattr(self._local, "defer_parse", False) else job.run()
+
+    def _submit_parse(self, extract: Callable[[NewsArticle, requests.Response], dict], article: NewsArticle,
+                      response: requests.Response) -> Future:
+        """Hands an archived page to the parse pool, waiting while `parse_queue_size` pages are already there."""
+        self._parse_slots.acquire()
+        try:
+            future = self.parse_pool.submit(extract, article, detach_page(response))
+        except BaseException:
+            self._parse_slots.release()
+            raise
+        future.add_done_callback(lambda _: self._parse_slots.release())
+        return future
+
+    def _extractor_for(self, source: str) -> Callable[[NewsArticle, requests.Response], dict]:
+        """Returns the extraction function of a source, the generic one for other sources."""
+        return self.extractors.get(source, self._extract_main_content)
+
+    def reextract(self, articles: Optional[list[NewsArticle]] = None) -> int:
+        """
+        Runs the extractors again on the archived pages of articles, without any download,
+        e.g. after an extractor was fixed. The articles, the enrichment memo and the scrape
+        store get the new fields. Articles without an archived page are left unchanged, as
+        are those whose page was archived truncated or with an error status; the latter are
+        recorded in `failures`.
+
+        Args:
+            articles (Optional[list[NewsArticle]]): The articles to extract again. Defaults to
+                the scraper's articles.
+
+        Returns:
+            int: Number of articles extracted again
+        """
+        if self.archive is None:
+            return 0
+        count = 0
+        for article in self.articles if articles is None else articles:
+            page = self.archive.get(article.url)
+            if page is None:
+                continue
+            error = _unusable_page(page)
+            if error is not None:
+                self.failures[article.url] = error
+                continue
+            try:
+                fields = self._reextract_page(article, page)
+            except Exception as e:
+                self.failures[article.url] = str(e)
+                continue
+            for name, value in fields.items():
+                setattr(article, name, value)
+            count += 1
+        return count
+
+    def reextract_archive(self) -> dict[str, dict]:
+        """
+        Runs the extractors again on every archived page, reading the archive
+        sequentially; with a `parse_pool`, pages are extracted on every core. Pages of the
+        scraper's articles are extracted for them, and the enrichment memo and the scrape
+        store get the new fields, as with `reextract`; the articles themselves are left
+        unchanged. Other pages are extracted as if for an article holding no fields yet
+        and only returned, since their fields could overwrite those an API returned. Pages
+        archived truncated or with an error status are skipped and recorded in `failures`.
+
+        Returns:
+            dict[str, dict]: Extracted fields by page URL
+        """
+        if self.archive is None:
+            return {}
+        known = {self._memo_key(article): article for article in self.articles if article.url}
+        results: dict[str, dict] = {}
+        pending: list[tuple[NewsArticle, bool, str, Future]] = []
+        for page in self.archive.pages():
+            error = _unusable_page(page)
+            if error is not None:
+                self.failures[page.url] = error
+                continue
+            article = known.get(make_cache_key(page.source, page.url))
+            save = article is not None
+            if article is None:
+                article = NewsArticle(title="", feature_image_url=None, content=None, summary="", author=None,
+                                      source=page.source, date="", url=page.url)
+            if self.parse_pool is None:
+                try:
+                    results[page.url] = self._reextract_page(article, page, save)
                 except Exception as e:
-                    print(f"Error scraping {article.source} ({article.url}): {e}")
+                    self.failures[page.url] = str(e)
             else:
-                print(f"No scraper available for source: {article.source}")
+                extract = self._extractor_for(page.source)
+                future = self._submit_parse(extract, article, page.to_response())
+                pending.append((article, save, content_hash(page.content), future))
+
+        for article, save, page_hash, future in pending:
+            try:
+                fields = future.result()
+            except Exception as e:
+                self.failures[article.url] = str(e)
+                continue
+            if save:
+                self._save_fields(article, self._extractor_for(article.source), page_hash, fields)
+            results[article.url] = fields
+        return results
+
+    def _reextract_page(self, article: NewsArticle, page: ArchivedPage, save: bool = True) -> dict:
+        """Extracts the fields of an article from its archived page, saving them unless `save` is False."""
+        extract = self._extractor_for(article.source)
+        fields = extract(article, page.to_response())
+        if save:
+            self._save_fields(article, extract, content_hash(page.content), fields)
+        return fields
+
+    def _save_fields(self, article: NewsArticle, extract: Callable, page_hash: str, fields: dict):
+        """Replaces the previously scraped fields of an article in the enrichment memo and scrape store."""
+        self.enrichment_memo.set(self._memo_key(article), dict(fields))
+        if self.scrape_store is not None:
+            self.scrape_store.put(article.url, extract.__name__, fields, page_hash)
 
     def get_enriched_articles(self) -> list[NewsArticle]:
         """
@@ -67,12 +709,16 @@ class ArticleScraper:
         Returns:
             dict: Dictionary containing the scraped content
         """
-        response = requests.get(article.url)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        return self._scrape_page(article, self._extract_guardian, stop=GUARDIAN_STOP)
+
+    @staticmethod
+    def _extract_guardian(article: NewsArticle, response: requests.Response) -> dict:
+        """Extracts the body of a downloaded The Guardian page."""
+        soup = parse_page(response, GUARDIAN_BODY)
+        body = soup.find('div', class_='article-body-viewer-selector')
 
         return {
-            "content": soup.find('div', class_='article-body-viewer-selector').text.strip() 
-                      if soup.find('div', class_='article-body-viewer-selector') else None,
+            "content": body.text.strip() if body else None,
         }
 
     def scraping_nytimes(self, article: NYTArticle) -> dict:
@@ -85,8 +731,12 @@ class ArticleScraper:
         Returns:
             dict: Dictionary containing the scraped content including author, content, title, and image
         """
-        response = requests.get(article.url)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        return self._scrape_page(article, self._extract_nytimes, stop=NYTIMES_STOP)
+
+    @staticmethod
+    def _extract_nytimes(article: NYTArticle, response: requests.Response) -> dict:
+        """Extracts the fields missing from a New York Times article from its downloaded page."""
+        soup = parse_page(response, NYTIMES_FIELDS)
         scrapping_results = {}
 
         # Scrape author if not available
@@ -104,7 +754,7 @@ class ArticleScraper:
 
         # Scrape title if not available
         if article.title is None or article.title == '':
-            if article.main != '':
+            if getattr(article, 'main', '') != '':
                 scrapping_results['title'] = article.main
             else:
                 scrapping_results['title'] = soup.find('h1', attrs={'data-testid': 'headline'}).text.strip()
@@ -115,17 +765,35 @@ class ArticleScraper:
 
         return scrapping_results
 
-    def scraping_GNews(self, url: str) -> dict:
+    def scraping_GNews(self, article: NewsArticle) -> dict:
         """
-        Scrapes content from a GNews article.
+        Scrapes content from a GNews article, whose page is on the publisher's site.
 
         Args:
-            url (str): URL of the article to scrape
+            article (NewsArticle): The article to scrape
 
         Returns:
             dict: Dictionary containing the scraped content
         """
-        return {}
+        return self.scraping_generic(article)
+
+    def scraping_generic(self, article: NewsArticle) -> dict:
+        """
+        Scrapes the main text of an article from a site without a dedicated scraper.
+
+        Args:
+            article (NewsArticle): The article to scrape
+
+        Returns:
+            dict: Dictionary containing the scraped content, empty if no main text was found
+        """
+        return self._scrape_page(article, self._extract_main_content)
+
+    @staticmethod
+    def _extract_main_content(article: NewsArticle, response: requests.Response) -> dict:
+        """Extracts the main text of a downloaded page of any site."""
+        content = main_content(parse_page(response))
+        return {"content": content} if content else {}
 
     def scraping_bbc(self, article: NewsArticle) -> dict:
         """
@@ -136,43 +804,41 @@ class ArticleScraper:
 
         Returns:
             dict: Dictionary containing the scraped content including title, description, image, and body
+
+        Raises:
+            requests.RequestException: If the page could not be downloaded, so that the failure
+                is recorded instead of fields set to None
         """
-        try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            response = requests.get(article.url, headers=headers)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            # Extract meta information
-            title = soup.find("meta", property="og:title") or soup.find("title")
-            title_text = title["content"] if title else "No title found"
-
-            description = soup.find("meta", property="og:description") or soup.find("meta", name="description")
-            description_text = description["content"] if description else "No description found"
-
-            image = soup.find("meta", property="og:image")
-            image_url = image["content"] if image else "No image found"
-
-            # Extract article body
-            body = soup.find("div", {"data-component": "text-block"})
-            paragraphs = body.find_all("p") if body else []
-            body_text = "\n".join([p.get_text() for p in paragraphs])
-
-            return {
-                "title": title_text,
-                "description": description_text,
-                "image_url": image_url,
-                "body": body_text
-            }
-
-        except requests.RequestException as e:
-            print(f"Error fetching BBC article: {e}")
-            return {
-                "title": None,
-                "description": None,
-                "image_url": None,
-                "body": None
-            }
\ No newline at end of file
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        }
+        return self._scrape_page(article, self._extract_bbc, stop=BBC_STOP, headers=headers)
+
+    @staticmethod
+    def _extract_bbc(article: NewsArticle, response: requests.Response) -> dict:
+        """Extracts title, description, image and body from a downloaded BBC News page."""
+        response.raise_for_status()
+
+        soup = parse_page(response, BBC_FIELDS)
+
+        # Extract meta information
+        title = soup.find("meta", property="og:title") or soup.find("title")
+        title_text = (title.get_text() if title.name == "title" else title["content"]) if title else "No title found"
+
+        description = soup.find("meta", property="og:description") or soup.find("meta", attrs={"name": "description"})
+        description_text = description["content"] if description else "No description found"
+
+        image = soup.find("meta", property="og:image")
+        image_url = image["content"] if image else "No image found"
+
+        # Extract article body
+        body = soup.find("div", {"data-component": "text-block"})
+        paragraphs = body.find_all("p") if body else []
+        body_text = "\n".join([p.get_text() for p in paragraphs])
+
+        return {
+            "title": title_text,
+            "description": description_text,
+            "image_url": image_url,
+            "body": body_text
+        }
@@ -0,0 +1,98 @@
+from typing import Any, Callable, Hashable, Optional
+import threading
+
+
+class _Call:
+    """An in-flight call whose result is shared by every caller of the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is running, other
+    callers with the same key wait for it and receive its result (or its exception)
+    instead of starting their own request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.executed = 0  # Calls that actually ran
+        self.coalesced = 0  # Calls that reused another caller's result
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Runs `fn` unless a call with the same key is already in flight, in which
+        case waits for that call and returns its result.
+
+        Args:
+            key (Hashable): Identifies identical calls, e.g. a cache key or a URL
+            fn (Callable[[], Any]): The function to run
+
+        Returns:
+            Any: The result of the call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def is_running(self, key: Hashable) -> bool:
+        """Returns True while a call for the key is in flight."""
+        with self._lock:
+            return key in self._calls
+
+    def in_flight(self) -> int:
+        """Returns the number of keys currently being fetched."""
+        with self._lock:
+            return len(self._calls)
+
+
+_shared_group: Optional[SingleFlight] = None
+_shared_group_lock = threading.Lock()
+
+
+def get_shared_group() -> SingleFlight:
+    """
+    Returns the process-wide single-flight group, shared by every Streamlit session.
+
+    Returns:
+        SingleFlight: The shared group
+    """
+    global _shared_group
+    with _shared_group_lock:
+        if _shared_group is None:
+            _shared_group = SingleFlight()
+        return _shared_group
@@ -1,13 +1,22 @@
-from datetime import datetime
+from typing import Union
+import numpy as np
 import pandas as pd
 import seaborn as sns
+from entities.article_batch import ArticleBatch
 from entities.news_article import NewsArticle
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 from aggregator.processor import NewsProcessor
 import streamlit as st
 import plotly.express as px
-from collections import Counter
+
+# Articles to plot, as a list or already in columns
+Articles = Union[ArticleBatch, list[NewsArticle]]
+
+
+def as_batch(articles: Articles) -> ArticleBatch:
+    """Returns the articles in columns, converting a list of articles."""
+    return articles if isinstance(articles, ArticleBatch) else ArticleBatch.from_articles(articles)
 
 
 class NewsVisualizer:
@@ -15,30 +24,26 @@ class NewsVisualizer:
     Class responsible for creating various visualizations of news article data.
     Provides methods for generating source distribution charts, word clouds,
     article timeline analysis, and word count analysis.
+
+    Every plot accepts an ArticleBatch; building it once and passing it to all of them
+    avoids converting the article list for each plot.
     """
 
     def __init__(self):
         self.processor = NewsProcessor()
 
-    def source_distribution_plot(self, articles: list[NewsArticle]):
+    def source_distribution_plot(self, articles: Articles):
         """
         Creates a bar plot showing the distribution of articles by source.
 
         Args:
-            articles (list[NewsArticle]): List of news articles to analyze
+            articles (ArticleBatch | list[NewsArticle]): News articles to analyze
 
         Returns:
             matplotlib.figure.Figure: Bar plot showing article distribution by source
         """
-        sources = [a.source for a in articles]
-        source_counter = {}
-        for s in sources:
-            if s in source_counter.keys():
-                source_counter[s] += 1
-            else:
-                source_counter[s] = 1
-        df = pd.DataFrame(data=zip(source_counter.keys(), source_counter.values()), 
-                         columns=['source', 'total articles']).sort_values(by='total articles', ascending=False)
+        source_counts = as_batch(articles).source_counts()
+        df = pd.DataFrame({'source': list(source_counts.keys()), 'total articles': list(source_counts.values())})
         fig, _ = plt.subplots(figsize=(10, 6))
         sns.despine(fig)
         sns.barplot(
@@ -50,18 +55,19 @@ class NewsVisualizer:
         )
         return fig
 
-    def word_cloud_plot(self, articles):
+    def word_cloud_plot(self, articles: Articles):
         """
         Generates a word cloud visualization from article summaries.
 
         Args:
-            articles (list[NewsArticle]): List of news articles to analyze
+            articles (ArticleBatch | list[NewsArticle]): News articles to analyze
 
         Returns:
             matplotlib.figure.Figure: Word cloud visualization or None if insufficient data
         """
         # Combine all summaries
-        merge_text = " ".join(article.summary for article in articles if article.summary)
+        summaries = as_batch(articles).summary
+        merge_text = " ".join(summaries[summaries != ""])
         clean_text = self.processor.clean_articles_for_wordcloud(merge_text)
 
         if not clean_text.strip():
@@ -90,44 +96,26 @@ class NewsVisualizer:
         ax.axis('off')
         return fig
 
-    def articles_by_day_plot(self, articles):
+    def articles_by_day_plot(self, articles: Articles):
         """
         Creates a bar plot showing the number of articles published per month by year.
 
         Args:
-            articles (list[NewsArticle]): List of news articles to analyze
+            articles (ArticleBatch | list[NewsArticle]): News articles to analyze
 
         Returns:
             plotly.graph_objects.Figure: Interactive bar plot showing article distribution over time
         """
-        # Count articles per day
-        article_calendar = Counter()
-        for article in articles:
-            if article.date:
-                date = datetime.fromisoformat(article.date.replace("Z", "")).date()
-                article_calendar[date] += 1
-        
-        # Prepare data for analysis
-        calendar_data = pd.DataFrame.from_dict(article_calendar, orient='index', columns=['count'])
-        calendar_data.index = pd.to_datetime(calendar_data.index)
-        calendar_data = calendar_data.resample('D').sum().fillna(0)
-        
-        # Aggregate data by month and year
-        calendar_data['month'] = calendar_data.index.month
-        calendar_data['month_name'] = calendar_data.index.strftime('%B')
-        calendar_data['year'] = calendar_data.index.year
-        
-        # Create monthly aggregation
-        monthly_data = []
-        for (year, month_name), group in calendar_data.groupby(['year', 'month_name']):
-            monthly_data.append({
-                'Year': int(year),
-                'Month': month_name,
-                'Number of Articles': group['count'].sum()
-            })
-        
-        monthly_df = pd.DataFrame(monthly_data)
-        
+        # Count articles per month, from the first month with articles to the last
+        months, counts = as_batch(articles).monthly_counts()
+        month_numbers = months.astype(np.int64)
+        month_names = pd.DatetimeIndex(months).strftime('%B') if len(months) else []
+        monthly_df = pd.DataFrame({
+            'Year': month_numbers // 12 + 1970,
+            'Month': month_names,
+            'Number of Articles': counts
+        })
+
         # Sort months chronologically
         month_order = ['January', 'February', 'March', 'April', 'May', 'June',
                       'July', 'August', 'September', 'October', 'November', 'December']
@@ -159,39 +147,27 @@ class NewsVisualizer:
         
         return fig
 
-    def number_of_words_plot(self, articles, max_articles=40):
+    def number_of_words_plot(self, articles: Articles, max_articles=40):
         """
         Creates a horizontal bar plot showing the word count for each article.
 
         Args:
-            articles (list[NewsArticle]): List of news articles to analyze
+            articles (ArticleBatch | list[NewsArticle]): News articles to analyze
             max_articles (int, optional): Maximum number of articles to display. Defaults to 40.
 
         Returns:
             plotly.graph_objects.Figure: Interactive bar plot showing word counts per article
         """
-        # Group articles by source
-        source_groups = {}
-        for article in articles:
-            source = article.source if hasattr(article, 'source') and article.source else "Unknown"
-            if source not in source_groups:
-                source_groups[source] = []
-                source_groups[source].append(article)
-
         # Select articles for visualization
-        articles_to_plot = articles[:max_articles]
+        batch = as_batch(articles[:max_articles])
 
-        # Calculate word counts for each article
+        # Label each article with the first words of its title
         try:
-            word_counts = [
-                {
-                    "Article": " ".join(article.title.split()[:2]) if hasattr(article, 'title') and article.title else f"Article {i+1}",
-                    "Word Count": len(article.body.split()) if hasattr(article, 'body') and article.source == "bbc"
-                                else len(article.content.split()) if hasattr(article, 'content') else 0,
-                    "Source": article.source if hasattr(article, 'source') and article.source else "Unknown"
-                }
-                for i, article in enumerate(articles_to_plot)
-            ]
+            word_counts = {
+                "Article": [" ".join(title.split()[:2]) or f"Article {i+1}" for i, title in enumerate(batch.title)],
+                "Word Count": batch.word_count,
+                "Source": batch.source
+            }
 
             # Create visualization
             df = pd.DataFrame(word_counts)
@@ -0,0 +1,169 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+import os
+import pickle
+import threading
+import time
+
+from entities.news_article import NewsArticle
+from entities.timestamps import parse_timestamp
+
+
+# Sort key of articles without a publication date, older than any date
+_NO_TIMESTAMP = float("-inf")
+
+
+def parse_published_at(date: Optional[str]) -> Optional[datetime]:
+    """
+    Parses a provider publication date into an aware UTC datetime.
+    Accepts ISO-8601 strings with a "Z" suffix or a numeric offset (e.g. "+0000").
+
+    Args:
+        date (Optional[str]): The raw publication date
+
+    Returns:
+        Optional[datetime]: The parsed date, None if it is missing or malformed
+    """
+    timestamp = parse_timestamp(date)
+    return datetime.fromtimestamp(timestamp, timezone.utc) if timestamp is not None else None
+
+
+@dataclass
+class Watermark:
+    """
+    High-water mark and accumulated articles of one (source, category) feed.
+
+    Attributes:
+        latest (Optional[datetime]): Publication date of the newest article seen
+        latest_id (Optional[str]): URL of the newest article seen
+        articles (list[NewsArticle]): Every article collected so far, newest first
+        updated_at (float): Unix time of the last merge
+    """
+    latest: Optional[datetime] = None
+    latest_id: Optional[str] = None
+    articles: list[NewsArticle] = field(default_factory=list)
+    updated_at: float = field(default_factory=time.time)
+
+
+class WatermarkStore:
+    """
+    Keeps a high-water mark per (source, category) so that refreshes only ask the
+    providers for articles newer than the newest one already held, and merges the new
+    articles into the existing set.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_articles: int = 500):
+        """
+        Initialize the store.
+
+        Args:
+            path (Optional[str], optional): File where the marks and articles are persisted.
+                Defaults to None (kept in memory only).
+            max_articles (int, optional): Maximum articles kept per feed. Defaults to 500.
+        """
+        self.path = path
+        self.max_articles = max_articles
+        self._lock = threading.Lock()
+        self._marks: dict[tuple[str, str], Watermark] = self._load()
+
+    def _load(self) -> dict[tuple[str, str], Watermark]:
+        """Reads the persisted marks, starting empty if the file is missing or unreadable."""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return {}
+
+    def _save(self):
+        """Persists the marks atomically (lock must be held)."""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self._marks, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def get(self, source: str, category: str) -> Optional[Watermark]:
+        """
+        Returns the mark of a feed.
+
+        Args:
+            source (str): The source identifier
+            category (str): The news category
+
+        Returns:
+            Optional[Watermark]: The mark, None if the feed has never been fetched
+        """
+        with self._lock:
+            return self._marks.get((source, category.lower()))
+
+    def since(self, source: str, category: str) -> Optional[datetime]:
+        """Returns the publication date of the newest article held for a feed, or None."""
+        mark = self.get(source, category)
+        return mark.latest if mark else None
+
+    def merge(self, source: str, category: str, new_articles: list[NewsArticle]) -> list[NewsArticle]:
+        """
+        Merges newly fetched articles into the feed, skipping ones already held, and moves
+        the mark forward.
+
+        Args:
+            source (str): The source identifier
+            category (str): The news category
+            new_articles (list[NewsArticle]): Articles returned by the delta fetch
+
+        Returns:
+            list[NewsArticle]: The merged set, newest first
+        """
+        key = (source, category.lower())
+        with self._lock:
+            mark = self._marks.get(key) or Watermark()
+            known = {article.url for article in mark.articles}
+            fresh = [article for article in new_articles if article.url not in known]
+
+            merged = fresh + mark.articles
+            # Articles parse their date once; the stable sort keeps the provider's order for
+            # articles without one
+            merged.sort(key=lambda a: a.timestamp if a.timestamp is not None else _NO_TIMESTAMP, reverse=True)
+            merged = merged[:self.max_articles]
+
+            newest = next((a for a in merged if a.timestamp is not None), None)
+            self._marks[key] = Watermark(
+                latest=datetime.fromtimestamp(newest.timestamp, timezone.utc) if newest else mark.latest,
+                latest_id=newest.url if newest else mark.latest_id,
+                articles=merged,
+            )
+            self._save()
+            return list(merged)
+
+    def clear(self):
+        """Forgets every mark, so the next fetch of each feed is a full one."""
+        with self._lock:
+            self._marks = {}
+            self._save()
+
+
+_shared_store: Optional[WatermarkStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_shared_watermarks() -> WatermarkStore:
+    """
+    Returns the process-wide watermark store, persisted under NEWS_CACHE_DIR when set.
+
+    Returns:
+        WatermarkStore: The shared store
+    """
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            cache_dir = os.getenv("NEWS_CACHE_DIR")
+            path = None
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+                path = os.path.join(cache_dir, "watermarks.pkl")
+            _shared_store = WatermarkStore(path=path)
+        return _shared_store
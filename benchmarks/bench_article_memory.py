@@ -0,0 +1,87 @@
+"""
+Measures the memory held per article once API responses are parsed into article
+objects, with the provider payloads dropped (the default) and kept (`keep_raw`).
+Run from the repository root:
+
+    python -m benchmarks.bench_article_memory [--articles N]
+"""
+from entities.news_article import NewsArticle, NYTArticle, TheGuardianArticle
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+
+WORDS = "government minister election climate market report people city council energy technology".split()
+
+
+def text(words: int) -> str:
+    return " ".join(random.choice(WORDS) for _ in range(words))
+
+
+def guardian_payload(i: int) -> dict:
+    """A search result as returned with show-fields=all."""
+    body = "".join(f"<p>{text(60)}</p>" for _ in range(12))
+    return {
+        "id": f"world/2024/mar/20/story-{i}", "type": "article", "sectionId": "world", "sectionName": "World news",
+        "webPublicationDate": "2024-03-20T10:00:00Z", "webTitle": text(10),
+        "webUrl": f"https://www.theguardian.com/world/2024/mar/20/story-{i}",
+        "apiUrl": f"https://content.guardianapis.com/world/2024/mar/20/story-{i}", "isHosted": False,
+        "pillarId": "pillar/news", "pillarName": "News",
+        "fields": {
+            "headline": text(10), "standfirst": f"<p>{text(30)}</p>", "trailText": text(30), "byline": "Staff",
+            "main": f"<figure>{text(20)}</figure>", "body": body, "bodyText": text(720), "wordcount": "720",
+            "thumbnail": f"https://media.guim.co.uk/{i}/500.jpg", "shortUrl": f"https://www.theguardian.com/p/{i}",
+        },
+    }
+
+
+def nyt_payload(i: int) -> dict:
+    """An article search document."""
+    abstract = text(30)
+    return {
+        "abstract": abstract, "snippet": abstract, "document_type": "article", "_id": f"nyt://article/{i}",
+        "byline": {"original": "By Staff", "person": [{"firstname": "Staff", "role": "reported", "rank": 1}]},
+        "headline": {"main": text(10), "kicker": "The Morning", "print_headline": text(10), "seo": text(10)},
+        "keywords": [{"name": "subject", "value": random.choice(WORDS).title(), "rank": r, "major": "N"} for r in range(8)],
+        "multimedia": {"caption": text(20), "credit": "Photo", "default": {"url": f"https://static01.nyt.com/{i}.jpg",
+                                                                             "height": 400, "width": 600},
+                       "thumbnail": {"url": f"https://static01.nyt.com/{i}-thumb.jpg", "height": 75, "width": 75}},
+        "news_desk": "Foreign", "print_page": "1", "print_section": "A", "pub_date": "2024-03-20T10:00:00Z",
+        "section_name": "World", "source": "The New York Times", "subsection_name": "Europe",
+        "type_of_material": "News", "uri": f"nyt://article/{i}", "web_url": f"https://www.nytimes.com/{i}.html",
+        "word_count": 900,
+    }
+
+
+def measure(cls: type[NewsArticle], payloads: list[str], keep_raw: bool) -> float:
+    """Returns the bytes still allocated per article after parsing the payloads into articles."""
+    cls.keep_raw = keep_raw
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    articles = [cls(**json.loads(payload)) for payload in payloads]
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    cls.keep_raw = False
+    del articles
+    return held / len(payloads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--articles", type=int, default=2000, help="Articles built per measurement")
+    args = parser.parse_args()
+    random.seed(1)
+
+    print(f"{'articles':<22}{'kept raw':>12}{'compact':>12}{'saved':>8}")
+    for cls, make in [(TheGuardianArticle, guardian_payload), (NYTArticle, nyt_payload)]:
+        payloads = [json.dumps(make(i)) for i in range(args.articles)]
+        raw = measure(cls, payloads, keep_raw=True)
+        compact = measure(cls, payloads, keep_raw=False)
+        print(f"{cls.__name__:<22}{raw / 1024:>10.1f}KB{compact / 1024:>10.1f}KB{1 - compact / raw:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measures near-duplicate detection over a synthetic corpus of articles, a share of which
+are reworded copies of other articles (the same wire story from several sources). Reports
+the time to sign and index the articles, the candidates compared against the pairs a
+brute-force search would compare, and how many of the copies were found. Run from the
+repository root:
+
+    python -m benchmarks.bench_dedup [--articles N] [--duplicates SHARE]
+"""
+from aggregator.dedup import NearDuplicateIndex, article_text, minhash
+from entities.news_article import NewsArticle
+import argparse
+import random
+import time
+
+SOURCES = ["The Guardian", "BBC News", "GNews", "New York Times"]
+
+
+def vocabulary(size: int) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(random.choices(letters, k=random.randint(3, 9))) for _ in range(size)]
+
+
+def reword(words: list[str], words_pool: list[str], share: float) -> list[str]:
+    """Replaces a share of the words, and sometimes drops the last ones, as another outlet would."""
+    words = [random.choice(words_pool) if random.random() < share else word for word in words]
+    if random.random() < 0.5:
+        words = words[:len(words) - random.randint(1, 5)]
+    return words
+
+
+def corpus(articles: int, duplicate_share: float) -> tuple[list[NewsArticle], list[int]]:
+    """Returns the articles and, for each, the index of the story it tells."""
+    words = vocabulary(20_000)
+    stories = []
+    result, story_of = [], []
+    for i in range(articles):
+        if stories and random.random() < duplicate_share:
+            story = random.randrange(len(stories))
+            title, summary = stories[story]
+            title, summary = reword(title, words, 0.1), reword(summary, words, 0.1)
+        else:
+            story = len(stories)
+            title, summary = random.choices(words, k=10), random.choices(words, k=40)
+            stories.append((title, summary))
+        result.append(NewsArticle(
+            title=" ".join(title), feature_image_url=None, content=None, summary=" ".join(summary), author=None,
+            source=random.choice(SOURCES), date="2024-03-20T10:00:00Z", url=f"https://example.com/{i}"
+        ))
+        story_of.append(story)
+    return result, story_of
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--articles", type=int, default=100_000, help="Articles in the corpus")
+    parser.add_argument("--duplicates", type=float, default=0.3, help="Share of articles copying an earlier story")
+    args = parser.parse_args()
+
+    random.seed(7)
+    articles, story_of = corpus(args.articles, args.duplicates)
+
+    started = time.perf_counter()
+    signatures = [minhash(article_text(article)) for article in articles]
+    signed = time.perf_counter() - started
+
+    index = NearDuplicateIndex()
+    started = time.perf_counter()
+    roots = [index.add(i, signature) for i, signature in enumerate(signatures)]
+    indexed = time.perf_counter() - started
+
+    first_of_story: dict[int, int] = {}
+    found = wrong = expected = 0
+    for i, story in enumerate(story_of):
+        first = first_of_story.setdefault(story, i)
+        if first != i:
+            expected += 1
+            found += story_of[roots[i]] == story
+        wrong += roots[i] != i and story_of[roots[i]] != story
+
+    pairs = len(articles) * (len(articles) - 1) // 2
+    print(f"{len(articles)} articles, {expected} copies of earlier stories")
+    print(f"signatures:  {signed:.2f}s ({len(articles) / signed:,.0f} articles/s)")
+    print(f"index:       {indexed:.2f}s ({len(articles) / indexed:,.0f} articles/s)")
+    print(f"comparisons: {index.comparisons:,} against {pairs:,} for every pair")
+    print(f"copies found: {found / max(expected, 1):.1%}, articles merged into another story: {wrong}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Compares the time taken to extract the fields of saved article pages by the scraper's
+extractors against a full html.parser parse of each page (how the pages were
+extracted before). Run from the repository root:
+
+    python -m benchmarks.bench_extraction [--rounds N]
+"""
+from aggregator.extraction import HTML_PARSER
+from aggregator.scraper import ArticleScraper
+from bs4 import BeautifulSoup
+from entities.news_article import NewsArticle, NYTArticle
+import argparse
+import os
+import time
+import requests
+
+FIXTURES = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "fixtures", "pages")
+
+
+def full_parse_guardian(article, response):
+    soup = BeautifulSoup(response.content, 'html.parser')
+    return {
+        "content": soup.find('div', class_='article-body-viewer-selector').text.strip()
+                  if soup.find('div', class_='article-body-viewer-selector') else None,
+    }
+
+
+def full_parse_nytimes(article, response):
+    soup = BeautifulSoup(response.content, 'html.parser')
+    results = {}
+    if not article.author:
+        results["author"] = ' '.join([a.text.strip().title() for a in soup.find_all(attrs={"itemprop": "name"})])
+    if not article.content:
+        article_tag = soup.find('article')
+        results['content'] = ' '.join(p.text.strip() for p in (article_tag or soup).find_all('p'))
+    if not article.title:
+        results['title'] = article.main or soup.find('h1', attrs={'data-testid': 'headline'}).text.strip()
+    if not article.feature_image_url:
+        results['feature_image_url'] = soup.find('img').get('src')
+    return results
+
+
+def full_parse_bbc(article, response):
+    soup = BeautifulSoup(response.content, "html.parser")
+    title = soup.find("meta", property="og:title") or soup.find("title")
+    description = soup.find("meta", property="og:description") or soup.find("meta", attrs={"name": "description"})
+    image = soup.find("meta", property="og:image")
+    body = soup.find("div", {"data-component": "text-block"})
+    return {
+        "title": title["content"] if title else "No title found",
+        "description": description["content"] if description else "No description found",
+        "image_url": image["content"] if image else "No image found",
+        "body": "\n".join([p.get_text() for p in (body.find_all("p") if body else [])]),
+    }
+
+
+def load_page(name: str) -> requests.Response:
+    """Builds a response holding a saved page, as served with a declared charset."""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "text/html; charset=utf-8"
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        response._content = f.read()
+    return response
+
+
+def timed(extract, article, response, rounds: int) -> tuple[float, dict]:
+    result = extract(article, response)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        extract(article, response)
+    return (time.perf_counter() - started) / rounds, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=20, help="Extractions timed per page")
+    args = parser.parse_args()
+
+    scraper = ArticleScraper([], lazy=True)
+    article = NewsArticle(title="", feature_image_url=None, content=None, summary="", author=None,
+                          source="", date="", url="")
+    nyt_article = NYTArticle(
+        abstract="", byline={"original": None}, document_type="article", headline={"main": ""}, _id="",
+        keywords=[], multimedia={}, news_desk="", print_page="", print_section="", pub_date="",
+        section_name="", snippet="", source="New York Times", subsection_name="", type_of_material="",
+        uri="", web_url="", word_count=0
+    )
+    nyt_article.title = ""
+    cases = [
+        ("guardian.html", article, full_parse_guardian, scraper._extract_guardian),
+        ("nytimes.html", nyt_article, full_parse_nytimes, scraper._extract_nytimes),
+        ("bbc.html", article, full_parse_bbc, scraper._extract_bbc),
+    ]
+
+    print(f"Parser: {HTML_PARSER}, {args.rounds} rounds per page")
+    print(f"{'page':<16}{'size':>10}{'full parse':>14}{'extractor':>14}{'speedup':>10}")
+    for name, article, baseline, extractor in cases:
+        response = load_page(name)
+        before, expected = timed(baseline, article, response, args.rounds)
+        after, result = timed(extractor, article, response, args.rounds)
+        if result != expected:
+            raise SystemExit(f"{name}: extractor result differs from the full parse")
+        print(f"{name:<16}{len(response.content) // 1024:>8}KB{before * 1000:>12.1f}ms"
+              f"{after * 1000:>12.1f}ms{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Measures the throughput of the generic main-content extractor, in pages per second,
+over the saved pages in tests/fixtures/pages. Run from the repository root:
+
+    python -m benchmarks.bench_main_content [--rounds N]
+"""
+from aggregator.extraction import HTML_PARSER, main_content
+from bs4 import BeautifulSoup
+import argparse
+import glob
+import os
+import time
+
+FIXTURES = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "fixtures", "pages")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rounds", type=int, default=10, help="Passes over the corpus")
+    args = parser.parse_args()
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*.html"))):
+        with open(path, "rb") as f:
+            pages.append((os.path.basename(path), f.read()))
+    total_bytes = sum(len(content) for _, content in pages)
+
+    soups = [BeautifulSoup(content, HTML_PARSER) for _, content in pages]
+    for (name, _), soup in zip(pages, soups):
+        print(f"{name:<16}{len(main_content(soup)):>8} characters of main text")
+
+    count = len(pages) * args.rounds
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        for soup in soups:
+            main_content(soup)
+    scoring = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        for _, content in pages:
+            main_content(BeautifulSoup(content, HTML_PARSER))
+    end_to_end = time.perf_counter() - started
+
+    print(f"\nParser: {HTML_PARSER}, {len(pages)} pages ({total_bytes // 1024} KB), {args.rounds} rounds")
+    print(f"Scoring only:     {count / scoring:8.1f} pages/s")
+    print(f"Parse and score:  {count / end_to_end:8.1f} pages/s ({total_bytes * args.rounds / end_to_end / 2 ** 20:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
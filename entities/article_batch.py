@@ -0,0 +1,249 @@
+from typing import Any, Callable, Iterable, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+
+from entities.news_article import NewsArticle
+from entities.timestamps import parse_timestamp
+
+# Row of the columns: title, source, timestamp, text, summary, url, author, word count reported by the API
+_Row = tuple[str, str, Optional[int], Optional[str], str, str, str, int]
+# Integer value of NaT in datetime64 arrays
+_NAT = np.iinfo(np.int64).min
+
+UNKNOWN_SOURCE = "Unknown"
+
+
+def _text(value: Any) -> str:
+    return value if isinstance(value, str) else ""
+
+
+def _count(value: Any) -> int:
+    """Returns a word count reported by an API, 0 if it is missing or not a number."""
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _article_row(article: NewsArticle) -> _Row:
+    # BBC articles keep the scraped page in `body` and the API description in `content`
+    text = getattr(article, "body", None) or article.content
+    return (
+        _text(article.title), article.source or UNKNOWN_SOURCE, article.timestamp, text, _text(article.summary),
+        _text(article.url), _text(article.author), _count(getattr(article, "word_count", 0)),
+    )
+
+
+def _guardian_rows(payload: dict) -> Iterable[_Row]:
+    if "response" not in payload or "results" not in payload["response"]:
+        raise KeyError("Unexpected response structure from The Guardian API.")
+    for item in payload["response"]["results"]:
+        fields = item.get("fields") or {}
+        yield (
+            _text(item.get("webTitle")), "The Guardian", parse_timestamp(item.get("webPublicationDate")),
+            fields.get("body"), _text(fields.get("body")), _text(item.get("webUrl")), _text(fields.get("byline")), 0,
+        )
+
+
+def _nyt_rows(payload: dict) -> Iterable[_Row]:
+    if "response" not in payload or "docs" not in payload["response"]:
+        raise KeyError("Unexpected response structure from New York Times API.")
+    for item in payload["response"]["docs"]:
+        headline = item.get("headline") or {}
+        byline = item.get("byline") or {}
+        yield (
+            _text(headline.get("print_headline")), "New York Times", parse_timestamp(item.get("pub_date")), None,
+            _text(item.get("abstract")), _text(item.get("web_url")), _text(byline.get("original")),
+            _count(item.get("word_count")),
+        )
+
+
+def _newsapi_rows(payload: dict) -> Iterable[_Row]:
+    if "articles" not in payload:
+        raise KeyError("Unexpected response structure from NewsAPI.org.")
+    for item in payload["articles"]:
+        source = (item.get("source") or {}).get("name") or "BBC News"
+        yield (
+            _text(item.get("title")), source, parse_timestamp(item.get("publishedAt")), item.get("description"),
+            _text(item.get("description")), _text(item.get("url")), "", 0,
+        )
+
+
+def _gnews_rows(payload: dict) -> Iterable[_Row]:
+    if "articles" not in payload:
+        raise KeyError("Unexpected response structure from GNews API.")
+    for item in payload["articles"]:
+        yield (
+            _text(item.get("title")), "GNews", parse_timestamp(item.get("publishedAt")), item.get("content"),
+            _text(item.get("description")), _text(item.get("url")), "", 0,
+        )
+
+
+# Reads the rows of one page of API results, by the source the articles are stored under
+API_ROWS: dict[str, Callable[[dict], Iterable[_Row]]] = {
+    "The Guardian": _guardian_rows,
+    "New York Times": _nyt_rows,
+    "BBC News": _newsapi_rows,
+    "GNews": _gnews_rows,
+}
+
+
+class ArticleBatch:
+    """
+    Column-oriented copy of a list of articles for analytics. Every field is one NumPy
+    array indexed by article, so counting, filtering and bucketing the articles are
+    array operations rather than a loop over objects. Publication times are the
+    timestamps the articles parsed when they were created, and sources are stored as
+    small integer codes into `sources`.
+
+    Attributes:
+        title (np.ndarray): Titles (object), empty when missing
+        summary (np.ndarray): Summaries (object), empty when missing
+        url (np.ndarray): Article URLs (object)
+        author (np.ndarray): Authors (object), empty when missing
+        sources (np.ndarray): Distinct source names (object), sorted
+        source_codes (np.ndarray): Index into `sources` of each article's source (int16)
+        published (np.ndarray): Publication time in UTC (datetime64[s]), NaT when missing or unreadable
+        word_count (np.ndarray): Words in the article text (int32), or the count reported
+            by the API for articles without text (New York Times)
+    """
+
+    def __init__(self, title: np.ndarray, summary: np.ndarray, url: np.ndarray, author: np.ndarray,
+                 sources: np.ndarray, source_codes: np.ndarray, published: np.ndarray, word_count: np.ndarray):
+        self.title = title
+        self.summary = summary
+        self.url = url
+        self.author = author
+        self.sources = sources
+        self.source_codes = source_codes
+        self.published = published
+        self.word_count = word_count
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[_Row]) -> "ArticleBatch":
+        """
+        Builds a batch from (title, source, timestamp, text, summary, url, author, API word count) rows.
+
+        Args:
+            rows (Iterable[tuple]): One row per article
+
+        Returns:
+            ArticleBatch: The batch
+        """
+        rows = list(rows)
+        n = len(rows)
+        columns = list(zip(*rows)) if rows else [()] * 8
+        title, source, timestamp, text, summary, url, author, reported = columns
+
+        def strings(values) -> np.ndarray:
+            array = np.empty(n, dtype=object)
+            array[:] = values
+            return array
+
+        sources, codes = np.unique(strings(source), return_inverse=True)
+        published = np.fromiter((_NAT if t is None else t for t in timestamp), dtype=np.int64, count=n)
+        words = np.fromiter((len(t.split()) if isinstance(t, str) else 0 for t in text), dtype=np.int32, count=n)
+        reported = np.fromiter(reported, dtype=np.int32, count=n)
+        return cls(
+            title=strings(title),
+            summary=strings(summary),
+            url=strings(url),
+            author=strings(author),
+            sources=sources,
+            source_codes=codes.astype(np.int16),
+            published=published.view("datetime64[s]"),
+            word_count=np.where(words > 0, words, reported),
+        )
+
+    @classmethod
+    def from_articles(cls, articles: Sequence[NewsArticle]) -> "ArticleBatch":
+        """
+        Builds a batch from article objects.
+
+        Args:
+            articles (Sequence[NewsArticle]): The articles
+
+        Returns:
+            ArticleBatch: The batch, in the order of the articles
+        """
+        return cls.from_rows(_article_row(article) for article in articles)
+
+    @classmethod
+    def from_api_json(cls, source: str, payload: dict) -> "ArticleBatch":
+        """
+        Builds a batch straight from one page of API results, without creating article
+        objects.
+
+        Args:
+            source (str): The provider, one of the keys of API_ROWS
+            payload (dict): The decoded JSON response
+
+        Returns:
+            ArticleBatch: The batch, in the order of the results
+
+        Raises:
+            ValueError: If the provider is unknown
+            KeyError: If the response does not have the provider's structure
+        """
+        if source not in API_ROWS:
+            raise ValueError(f"No API results reader for source {source!r}.")
+        return cls.from_rows(API_ROWS[source](payload))
+
+    def __len__(self) -> int:
+        return len(self.title)
+
+    def __getitem__(self, index: Union[slice, np.ndarray, Sequence[int]]) -> "ArticleBatch":
+        """Selects articles by slice, index array or boolean mask."""
+        return ArticleBatch(
+            title=self.title[index], summary=self.summary[index], url=self.url[index], author=self.author[index],
+            sources=self.sources, source_codes=self.source_codes[index], published=self.published[index],
+            word_count=self.word_count[index],
+        )
+
+    @property
+    def source(self) -> np.ndarray:
+        """Source name of each article (object)."""
+        return self.sources[self.source_codes]
+
+    def source_counts(self) -> dict[str, int]:
+        """
+        Counts the articles of each source.
+
+        Returns:
+            dict[str, int]: Articles by source, the largest count first
+        """
+        counts = np.bincount(self.source_codes, minlength=len(self.sources))
+        order = np.argsort(-counts, kind="stable")
+        return {self.sources[i]: int(counts[i]) for i in order if counts[i]}
+
+    def monthly_counts(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Counts the articles published in every month from the first to the last
+        publication date, months without articles included.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The months (datetime64[M]) and their article counts
+        """
+        months = self.published[~np.isnat(self.published)].astype("datetime64[M]")
+        if not len(months):
+            return np.array([], dtype="datetime64[M]"), np.array([], dtype=np.int64)
+        first = months.min()
+        counts = np.bincount((months - first).astype(np.int64))
+        return first + np.arange(len(counts)), counts
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Returns the columns as a DataFrame, with the source as a categorical column.
+
+        Returns:
+            pd.DataFrame: One row per article
+        """
+        return pd.DataFrame({
+            "title": self.title,
+            "source": pd.Categorical.from_codes(self.source_codes, categories=self.sources),
+            "published": self.published,
+            "word_count": self.word_count,
+            "summary": self.summary,
+            "url": self.url,
+            "author": self.author,
+        })
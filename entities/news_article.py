@@ -1,12 +1,38 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, ClassVar
 from dataclasses import dataclass, fields
+from entities.timestamps import parse_timestamp
+import sys
+
+
+def _shared(value):
+    """
+    Returns one shared copy of a short string that repeats across articles (section
+    names, desks, material types), so that each article does not hold its own.
+    """
+    if isinstance(value, str) and len(value) <= 64:
+        return sys.intern(value)
+    return value
 
 
 class NewsArticle:
     """
     Base class for news articles that provides common functionality and attributes
     for different news sources.
+
+    Articles use __slots__ rather than a per-instance __dict__, since whole article lists
+    are held in memory for every session. The provider payloads they are built from are
+    dropped once the article fields are taken from them, unless `keep_raw` is set on the
+    class (e.g. `NYTArticle.keep_raw = True`), in which case they are kept in `raw`.
+
+    The publication date is kept as given by the provider in `date`, for display, and
+    parsed once into `timestamp`, seconds since the Unix epoch in UTC (None when the
+    date is missing or malformed), for sorting, filtering and bucketing.
     """
+    __slots__ = ("title", "feature_image_url", "content", "summary", "author", "source", "date", "timestamp",
+                 "url", "raw", "__weakref__")
+
+    # Whether new articles keep the provider payload they were built from
+    keep_raw: ClassVar[bool] = False
 
     def __init__(self, title: str, feature_image_url: str, content: Optional[str], summary: str, 
                  author: Optional[str], source: str, date: str, url: str):
@@ -28,9 +54,25 @@ class NewsArticle:
         self.content = content
         self.summary = summary
         self.author = author
-        self.source = source
+        self.source = _shared(source)
         self.date = date
+        self.timestamp = parse_timestamp(date)
         self.url = url
+        self.raw = None
+
+    def to_dict(self) -> dict:
+        """
+        Returns the stored attributes of the article, as `vars()` would without slots.
+
+        Returns:
+            dict: Attribute values by name
+        """
+        values = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if name != "__weakref__" and hasattr(self, name):
+                    values[name] = getattr(self, name)
+        return values
 
     def __repr__(self):
         """Returns a string representation of the article."""
@@ -74,12 +116,14 @@ class NewsArticle:
         Returns:
             str: Truncated summary with ellipsis
         """
-        if self.summary is None:
+        # The article is left unchanged, since cached articles are rendered again on every rerun
+        summary = self.summary
+        if summary is None:
             if self.content:
-                self.summary = self.content[:limit] + "..."
+                summary = self.content[:limit] + "..."
         else:
-            self.summary = self.summary[:limit] + "..."
-        return f"{self.summary}"
+            summary = summary[:limit] + "..."
+        return f"{summary}"
 
 
 class TheGuardianArticle(NewsArticle):
@@ -87,6 +131,7 @@ class TheGuardianArticle(NewsArticle):
     Class representing an article from The Guardian news source.
     Extends the base NewsArticle class with Guardian-specific attributes.
     """
+    __slots__ = ("id", "type", "sectionId", "sectionName", "apiUrl", "isHosted", "pillarId", "pillarName")
 
     def __init__(
         self,
@@ -131,15 +176,31 @@ class TheGuardianArticle(NewsArticle):
             url=webUrl
         )
         self.id = id
-        self.type = type
-        self.sectionId = sectionId
-        self.sectionName = sectionName
-        self.webUrl = webUrl
+        self.type = _shared(type)
+        self.sectionId = _shared(sectionId)
+        self.sectionName = _shared(sectionName)
         self.apiUrl = apiUrl
         self.isHosted = isHosted
-        self.pillarId = pillarId
-        self.pillarName = pillarName
-        self.fields = fields  
+        self.pillarId = _shared(pillarId)
+        self.pillarName = _shared(pillarName)
+        if self.keep_raw:
+            self.raw = fields
+
+    @property
+    def webUrl(self) -> str:
+        """The article URL, as named by the API."""
+        return self.url
+
+    @property
+    def fields(self) -> dict:
+        """
+        The "fields" payload of the API. Without `keep_raw`, only the fields the article
+        was built from are returned, since "show-fields=all" also carries copies of the
+        body (bodyText, main) that are not used.
+        """
+        if self.raw is not None:
+            return self.raw
+        return {"thumbnail": self.feature_image_url, "body": self.content, "byline": self.author}
 
     def __repr__(self):
         """Returns a string representation of the Guardian article."""
@@ -151,6 +212,9 @@ class NYTArticle(NewsArticle):
     Class representing an article from The New York Times.
     Extends the base NewsArticle class with NYT-specific attributes.
     """
+    __slots__ = ("document_type", "_id", "keyword_values", "news_desk", "print_page", "print_section",
+                 "section_name", "snippet", "subsection_name", "type_of_material", "uri", "word_count",
+                 "main", "kicker")
 
     def __init__(
         self, 
@@ -208,23 +272,52 @@ class NYTArticle(NewsArticle):
             date=pub_date, 
             url=web_url
         )
-        self.byline = byline
-        self.document_type = document_type
-        self.headline = headline
+        self.document_type = _shared(document_type)
         self._id = _id
-        self.keywords = keywords
-        self.multimedia = multimedia
-        self.news_desk = news_desk
+        # Keyword values only; the full keyword entries are kept with `keep_raw`
+        self.keyword_values = tuple(_shared(k.get('value')) for k in keywords or () if isinstance(k, dict))
+        self.news_desk = _shared(news_desk)
         self.print_page = print_page
-        self.print_section = print_section
-        self.section_name = section_name
-        self.snippet = snippet
-        self.subsection_name = subsection_name
-        self.type_of_material = type_of_material
+        self.print_section = _shared(print_section)
+        self.section_name = _shared(section_name)
+        # The API's snippet usually repeats the abstract
+        self.snippet = abstract if snippet == abstract else snippet
+        self.subsection_name = _shared(subsection_name)
+        self.type_of_material = _shared(type_of_material)
         self.uri = uri
         self.word_count = word_count
-        self.main = self.headline.get('main')
-        self.kicker = self.headline.get('kicker')
+        self.main = headline.get('main')
+        self.kicker = _shared(headline.get('kicker'))
+        if self.keep_raw:
+            self.raw = {"byline": byline, "headline": headline, "keywords": keywords, "multimedia": multimedia}
+
+    @property
+    def headline(self) -> dict:
+        """The "headline" payload of the API, reduced to the parts kept without `keep_raw`."""
+        if self.raw is not None:
+            return self.raw["headline"]
+        return {"main": self.main, "kicker": self.kicker, "print_headline": self.title}
+
+    @property
+    def byline(self) -> dict:
+        """The "byline" payload of the API, reduced to the parts kept without `keep_raw`."""
+        if self.raw is not None:
+            return self.raw["byline"]
+        return {"original": self.author}
+
+    @property
+    def multimedia(self) -> dict:
+        """The "multimedia" payload of the API, reduced to the parts kept without `keep_raw`."""
+        if self.raw is not None:
+            return self.raw["multimedia"]
+        return {"default": {"url": self.feature_image_url}}
+
+    @property
+    def keywords(self) -> list:
+        """The "keywords" payload of the API, reduced to the keyword values without `keep_raw`."""
+        if self.raw is not None:
+            return self.raw["keywords"]
+        return [{"value": value} for value in self.keyword_values]
 
 
 class BBCArticle(NewsArticle):
@@ -232,6 +325,7 @@ class BBCArticle(NewsArticle):
     Class representing an article from BBC News.
     Extends the base NewsArticle class with BBC-specific attributes.
     """
+    __slots__ = ("uuid", "image_url", "body", "description")
 
     def __init__(
         self, 
@@ -272,6 +366,7 @@ class BBCArticle(NewsArticle):
         self.uuid = uuid
         self.image_url = image_url
         self.body = body
+        self.description = description
 
     def get_article_full_md(self):
         """
@@ -308,6 +403,7 @@ class GNewsArticle(NewsArticle):
     Class representing an article from GNews.
     Extends the base NewsArticle class with GNews-specific attributes.
     """
+    __slots__ = ("description", "image")
 
     def __init__(
         self,
@@ -341,10 +437,7 @@ class GNewsArticle(NewsArticle):
             author=None,
             url=url    
         )
-        self.title = title
         self.description = description
-        self.content = content
-        self.url = url
         self.image = image
 
     def __repr__(self):
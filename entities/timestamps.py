@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def parse_timestamp(date: Optional[str]) -> Optional[int]:
+    """
+    Parses a provider publication date into seconds since the Unix epoch (UTC). Reads the
+    layouts of every provider, "2025-01-10T19:54:24Z" (The Guardian, NewsAPI.org, GNews)
+    and "2025-01-10T19:54:24+0000" (New York Times), as well as any other ISO-8601 date;
+    dates without an offset are taken as UTC.
+
+    Args:
+        date (Optional[str]): The raw publication date
+
+    Returns:
+        Optional[int]: Seconds since the epoch, None if the date is missing or malformed
+    """
+    if not isinstance(date, str) or not date:
+        return None
+    try:
+        # The C parser of datetime reads both provider layouts from Python 3.11
+        parsed = datetime.fromisoformat(date)
+    except ValueError:
+        try:
+            # Earlier versions read neither a "Z" suffix nor an offset without a colon
+            parsed = datetime.strptime(date, "%Y-%m-%dT%H:%M:%S%z")
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() // 1)
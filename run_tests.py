@@ -4,9 +4,26 @@ os.environ['STREAMLIT_SERVER_HEADLESS'] = 'true'
 
 import unittest
 import warnings
-from tests.test_scraper import TestArticleScraper
+from tests.test_scraper import TestArticleScraper, TestParallelEnrichment, TestLazyEnrichment, TestStreamingEnrichment, TestParseStage
 from tests.test_api_client import TestAPIClient
 from tests.test_news_article import TestNewsArticle, TestTheGuardianArticle, TestNYTArticle, TestBBCArticle, TestGNewsArticle
+from tests.test_fetcher import TestFanOutFetcher
+from tests.test_http_session import TestHTTPSessionPool
+from tests.test_cache import TestMemoryCache, TestDiskCache
+from tests.test_singleflight import TestSingleFlight
+from tests.test_http_cache import TestHTTPCache
+from tests.test_watermarks import TestWatermarkStore
+from tests.test_rate_limiter import TestRequestScheduler
+from tests.test_health import TestProviderHealth
+from tests.test_async_api_client import TestAsyncAPIClient
+from tests.test_scrape_store import TestScrapeStore
+from tests.test_extraction import TestExtraction
+from tests.test_planner import TestEnrichmentPlanner
+from tests.test_frontier import TestCrawlFrontier
+from tests.test_page_archive import TestPageArchive
+from tests.test_article_batch import TestArticleBatch
+from tests.test_dedup import TestNearDuplicates
+from tests.test_timestamps import TestTimestamps
 
 import logging
 # Disable all loggers to reduce noise during test execution
@@ -20,12 +37,34 @@ warnings.filterwarnings("ignore", category=FutureWarning, module="streamlit")
 
 # Load test suites for each component
 scraper_suite = unittest.TestLoader().loadTestsFromTestCase(TestArticleScraper)
+parallel_enrichment_suite = unittest.TestLoader().loadTestsFromTestCase(TestParallelEnrichment)
+lazy_enrichment_suite = unittest.TestLoader().loadTestsFromTestCase(TestLazyEnrichment)
+streaming_enrichment_suite = unittest.TestLoader().loadTestsFromTestCase(TestStreamingEnrichment)
+parse_stage_suite = unittest.TestLoader().loadTestsFromTestCase(TestParseStage)
 api_client_suite = unittest.TestLoader().loadTestsFromTestCase(TestAPIClient)
 news_article_suite = unittest.TestLoader().loadTestsFromTestCase(TestNewsArticle)
 the_guardian_article_suite = unittest.TestLoader().loadTestsFromTestCase(TestTheGuardianArticle)
 nyt_article_suite = unittest.TestLoader().loadTestsFromTestCase(TestNYTArticle)
 bbc_article_suite = unittest.TestLoader().loadTestsFromTestCase(TestBBCArticle)
 gnews_article_suite = unittest.TestLoader().loadTestsFromTestCase(TestGNewsArticle)
+fetcher_suite = unittest.TestLoader().loadTestsFromTestCase(TestFanOutFetcher)
+http_session_suite = unittest.TestLoader().loadTestsFromTestCase(TestHTTPSessionPool)
+memory_cache_suite = unittest.TestLoader().loadTestsFromTestCase(TestMemoryCache)
+disk_cache_suite = unittest.TestLoader().loadTestsFromTestCase(TestDiskCache)
+singleflight_suite = unittest.TestLoader().loadTestsFromTestCase(TestSingleFlight)
+http_cache_suite = unittest.TestLoader().loadTestsFromTestCase(TestHTTPCache)
+watermarks_suite = unittest.TestLoader().loadTestsFromTestCase(TestWatermarkStore)
+rate_limiter_suite = unittest.TestLoader().loadTestsFromTestCase(TestRequestScheduler)
+health_suite = unittest.TestLoader().loadTestsFromTestCase(TestProviderHealth)
+async_api_client_suite = unittest.TestLoader().loadTestsFromTestCase(TestAsyncAPIClient)
+scrape_store_suite = unittest.TestLoader().loadTestsFromTestCase(TestScrapeStore)
+extraction_suite = unittest.TestLoader().loadTestsFromTestCase(TestExtraction)
+planner_suite = unittest.TestLoader().loadTestsFromTestCase(TestEnrichmentPlanner)
+frontier_suite = unittest.TestLoader().loadTestsFromTestCase(TestCrawlFrontier)
+page_archive_suite = unittest.TestLoader().loadTestsFromTestCase(TestPageArchive)
+article_batch_suite = unittest.TestLoader().loadTestsFromTestCase(TestArticleBatch)
+dedup_suite = unittest.TestLoader().loadTestsFromTestCase(TestNearDuplicates)
+timestamps_suite = unittest.TestLoader().loadTestsFromTestCase(TestTimestamps)
 
 # Combine all test suites into a single suite
 combined_suite = unittest.TestSuite([
@@ -35,7 +74,29 @@ combined_suite = unittest.TestSuite([
 	the_guardian_article_suite,
 	nyt_article_suite,
 	bbc_article_suite,
-	gnews_article_suite
+	gnews_article_suite,
+	fetcher_suite,
+	http_session_suite,
+	memory_cache_suite,
+	disk_cache_suite,
+	singleflight_suite,
+	http_cache_suite,
+	watermarks_suite,
+	rate_limiter_suite,
+	health_suite,
+	async_api_client_suite,
+	parallel_enrichment_suite,
+	scrape_store_suite,
+	lazy_enrichment_suite,
+	extraction_suite,
+	streaming_enrichment_suite,
+	parse_stage_suite,
+	planner_suite,
+	frontier_suite,
+	page_archive_suite,
+	article_batch_suite,
+	dedup_suite,
+	timestamps_suite
 ])
 
 # Run the combined test suite with detailed output
@@ -1,6 +1,12 @@
 import unittest
 import requests
 from aggregator.api_client import APIClient, GNewsApi, TheGuardianApi, NYTNewsApi, BBCApi
+from aggregator.cache import MemoryCache
+from aggregator.rate_limiter import RequestScheduler
+from aggregator.singleflight import SingleFlight
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 from unittest.mock import patch, MagicMock
 from entities.news_article import TheGuardianArticle, NYTArticle, GNewsArticle, BBCArticle
 import os
@@ -11,19 +17,27 @@ class TestAPIClient(unittest.TestCase):
         self.client = APIClient(api_key="dummy_key", base_url="https://example.com")
         self.the_guardian_api = TheGuardianApi(
             api_key=os.getenv("THE_GUARDIAN_API_KEY"),
-            base_url=os.getenv("THE_GUARDIAN_BASE_URL")
+            base_url=os.getenv("THE_GUARDIAN_BASE_URL"),
+            cache=MemoryCache(),
+            scheduler=RequestScheduler()
         )
         self.bbc_api = BBCApi(
             api_key=os.getenv("BBC_API_KEY"),
-            base_url=os.getenv("BBC_BASE_URL")
+            base_url=os.getenv("BBC_BASE_URL"),
+            cache=MemoryCache(),
+            scheduler=RequestScheduler()
         )
         self.nyt_api = NYTNewsApi(
             api_key=os.getenv("NYT_API_KEY"),
-            base_url=os.getenv("NYT_BASE_URL")
+            base_url=os.getenv("NYT_BASE_URL"),
+            cache=MemoryCache(),
+            scheduler=RequestScheduler()
         )
         self.gnews_api = GNewsApi(
             api_key=os.getenv("GNEWS_API_KEY"),
-            base_url=os.getenv("GNEWS_BASE_URL")
+            base_url=os.getenv("GNEWS_BASE_URL"),
+            cache=MemoryCache(),
+            scheduler=RequestScheduler()
         )
 
     def test_fetch_sources_returns_expected_list(self):
@@ -35,7 +49,7 @@ class TestAPIClient(unittest.TestCase):
         self.assertEqual(self.client.fetch_categories(), expected)
 
     """ New York Times API Tests """
-    @patch("aggregator.api_client.requests.get")
+    @patch("aggregator.http_session.requests.Session.get")
     def test_fetch_articles_sucess_NYT(self, mock_get):
         mock_response = MagicMock()
         mock_response.json.return_value = {
@@ -110,7 +124,7 @@ class TestAPIClient(unittest.TestCase):
         self.assertIsInstance(articles[0], NYTArticle)
         self.assertEqual(articles[0].title, "How Climate Change Is Supercharging Disasters")
     
-    @patch("aggregator.api_client.requests.get")
+    @patch("aggregator.http_session.requests.Session.get")
     def test_fetch_articles_bad_response_NYT(self, mock_get):
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("Bad request")
@@ -119,7 +133,7 @@ class TestAPIClient(unittest.TestCase):
         with self.assertRaises(requests.exceptions.HTTPError):
             self.nyt_api.fetch_articles(category="Technology")
     
-    @patch("aggregator.api_client.requests.get")
+    @patch("aggregator.http_session.requests.Session.get")
     def test_fetch_articles_invalid_json_structure_NYT(self, mock_get):
         mock_response = MagicMock()
         mock_response.raise_for_status = MagicMock()
@@ -130,7 +144,7 @@ class TestAPIClient(unittest.TestCase):
             self.nyt_api.fetch_articles(category="Technology")
 
     """ The Guardian API Tests """
-    @patch("aggregator.api_client.requests.get")
+    @patch("aggregator.http_session.requests.Session.get")
     def test_fetch_articles_success_guardian(self, mock_get):
         # Mocking the API response JSON
         mock_response = MagicMock()
@@ -170,7 +184,7 @@ class TestAPIClient(unittest.TestCase):
         self.assertIsInstance(articles[0], TheGuardianArticle)
         self.assertEqual(articles[0].title, "Sample Article")
 
-    @patch("aggregator.api_client.requests.get")
+    @patch("aggregator.http_session.requests.Session.get")
     def test_fetch_articles_bad_response_guardian(self, mock_get):
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("Bad request")
@@ -179,7 +193,7 @@ class TestAPIClient(unittest.TestCase):
         with self.assertRaises(requests.exceptions.HTTPError):
             self.the_guardian_api.fetch_articles(category="Technology")
 
-    @patch("aggregator.api_client.requests.get")
+    @patch("aggregator.http_session.requests.Session.get")
     def test_fetch_articles_invalid_json_structure_guardian(self, mock_get):
         mock_response = MagicMock()
         mock_response.raise_for_status = MagicMock()
@@ -190,7 +204,7 @@ class TestAPIClient(unittest.TestCase):
             self.the_guardian_api.fetch_articles(category="Technology")
 
     """ The GNews API Tests """
-    @patch("aggregator.api_client.requests.get")
+    @patch("aggregator.http_session.requests.Session.get")
     def test_fetch_articles_success_gnews(self, mock_get):
         # Mocking the API response JSON
         mock_response = MagicMock()
@@ -225,7 +239,7 @@ class TestAPIClient(unittest.TestCase):
         self.assertIsInstance(articles[0], GNewsArticle)
         self.assertEqual(articles[0].title, "Google's Pixel 7")
 
-    @patch("aggregator.api_client.requests.get")
+    @patch("aggregator.http_session.requests.Session.get")
     def test_fetch_articles_bad_response_gnews(self, mock_get):
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("Bad request")
@@ -234,7 +248,7 @@ class TestAPIClient(unittest.TestCase):
         with self.assertRaises(requests.exceptions.HTTPError):
             self.gnews_api.fetch_articles(category="Technology")
 
-    @patch("aggregator.api_client.requests.get")
+    @patch("aggregator.http_session.requests.Session.get")
     def test_fetch_articles_invalid_json_structure_gnews(self, mock_get):
         mock_response = MagicMock()
         mock_response.raise_for_status = MagicMock()
@@ -244,8 +258,188 @@ class TestAPIClient(unittest.TestCase):
         with self.assertRaises(KeyError):
             self.gnews_api.fetch_articles(category="Technology")
 
+    """ Fetch Cache Tests """
+    @patch("aggregator.http_session.requests.Session.get")
+    def test_fetch_articles_served_from_cache(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.json.return_value = {"response": {"results": []}}
+        mock_get.return_value = mock_response
+
+        self.the_guardian_api.fetch_articles(category="Technology")
+        self.the_guardian_api.fetch_articles(category="Technology")
+        self.the_guardian_api.fetch_articles(category="World")
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(self.the_guardian_api.cache.stats.hits, 1)
+
+    @patch("aggregator.http_session.requests.Session.get")
+    def test_cache_hits_return_copies_of_the_articles(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.json.return_value = {"articles": [{
+            "title": "Title", "description": "Short desc", "content": "", "url": "https://example.com",
+            "image": "", "publishedAt": "2024-03-20T10:00:00Z", "source": {"name": "Example"}
+        }]}
+        mock_get.return_value = mock_response
+
+        client = GNewsApi(api_key="key", base_url="https://gnews.io/api/v4/", cache=MemoryCache(),
+                          flight=SingleFlight(), scheduler=RequestScheduler())
+        first = client.fetch_articles(category="Technology")
+        # Enrichment of one session's articles does not reach the cached ones
+        first[0].content = "Scraped content"
+        second = client.fetch_articles(category="Technology")
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertIsNot(first[0], second[0])
+        self.assertEqual(second[0].content, "")
+        self.assertEqual(second[0].summary, "Short desc")
+
+    @patch("aggregator.http_session.requests.Session.get")
+    def test_stale_results_served_while_refreshing(self, mock_get):
+        titles = iter(["Old", "New"])
+
+        def fresh_response(*args, **kwargs):
+            mock_response = MagicMock()
+            mock_response.raise_for_status = MagicMock()
+            mock_response.json.return_value = {"articles": [{
+                "title": next(titles), "description": "", "content": "", "url": "https://example.com",
+                "image": "", "publishedAt": "2024-03-20T10:00:00Z", "source": {"name": "Example"}
+            }]}
+            return mock_response
+        mock_get.side_effect = fresh_response
+
+        client = GNewsApi(api_key="key", base_url="https://gnews.io/api/v4/",
+                          cache=MemoryCache(ttl=0.05, max_stale=60), flight=SingleFlight(),
+                          scheduler=RequestScheduler())
+        first = client.fetch_articles(category="Technology")
+        self.assertFalse(first.stale)
+        time.sleep(0.1)
+
+        stale = client.fetch_articles(category="Technology")
+        self.assertTrue(stale.stale)
+        self.assertEqual(stale[0].title, "Old")
+        self.assertGreaterEqual(stale.age, 0.05)
+
+        # The background refresh replaces the stale entry
+        deadline = time.monotonic() + 2
+        while mock_get.call_count < 2 or client.flight.in_flight():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        refreshed = client.fetch_articles(category="Technology")
+        self.assertFalse(refreshed.stale)
+        self.assertEqual(refreshed[0].title, "New")
+
+    @patch("aggregator.http_session.requests.Session.get")
+    def test_failed_fetch_is_not_cached(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("Bad request")
+        mock_get.return_value = mock_response
+
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.gnews_api.fetch_articles(category="Technology")
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("aggregator.http_session.requests.Session.get")
+    def test_concurrent_fetches_are_coalesced(self, mock_get):
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(timeout=2)
+            mock_response = MagicMock()
+            mock_response.raise_for_status = MagicMock()
+            mock_response.json.return_value = {"articles": []}
+            return mock_response
+        mock_get.side_effect = slow_get
+
+        clients = [GNewsApi(api_key="key", base_url="https://gnews.io/api/v4/",
+                            cache=self.gnews_api.cache, flight=SingleFlight(),
+                            scheduler=RequestScheduler()) for _ in range(5)]
+        flight = clients[0].flight
+        for client in clients:
+            client.flight = flight
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(client.fetch_articles, "Technology") for client in clients]
+            while flight.in_flight() == 0 or flight.coalesced < 4:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(results, [[]] * 5)
+
+    """ Paginated Iterator Tests """
+    def guardian_page(self, url, params=None, **kwargs):
+        start = (params["page"] - 1) * params["page-size"]
+        total = 25
+        results = [{
+            "id": f"news/{i}", "type": "article", "sectionId": "technology", "sectionName": "Technology",
+            "webPublicationDate": "2024-03-20T10:00:00Z", "webTitle": f"Article {i}",
+            "webUrl": f"https://guardian.co.uk/{i}", "apiUrl": f"https://content.guardianapis.com/{i}",
+            "isHosted": False, "fields": {}
+        } for i in range(start, min(start + params["page-size"], total))]
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.json.return_value = {"response": {"results": results}}
+        return mock_response
+
+    @patch("aggregator.http_session.requests.Session.get")
+    def test_iter_articles_pages_until_exhausted(self, mock_get):
+        mock_get.side_effect = self.guardian_page
+
+        titles = [a.title for a in self.the_guardian_api.iter_articles("Technology", page_size=10)]
+
+        self.assertEqual(titles, [f"Article {i}" for i in range(25)])
+        self.assertEqual([c.kwargs["params"]["page"] for c in mock_get.call_args_list], [1, 2, 3])
+
+    @patch("aggregator.http_session.requests.Session.get")
+    def test_iter_articles_stops_early(self, mock_get):
+        mock_get.side_effect = self.guardian_page
+
+        limited = list(self.the_guardian_api.iter_articles("Technology", max_items=12, page_size=10))
+        self.assertEqual(len(limited), 12)
+        self.assertEqual(mock_get.call_count, 2)
+
+        mock_get.reset_mock()
+        iterator = self.the_guardian_api.iter_articles("Technology", page_size=10)
+        next(iterator)
+        iterator.close()
+        # Only the first page and at most one prefetched page were requested
+        self.assertLessEqual(mock_get.call_count, 2)
+
+    @patch("aggregator.http_session.requests.Session.get")
+    def test_iter_articles_stops_at_bbc_result_limit(self, mock_get):
+        def bbc_page(url, params=None, **kwargs):
+            if params["page"] * params["pageSize"] > 100:
+                raise AssertionError("NewsAPI.org serves only the first 100 results")
+            mock_response = MagicMock()
+            mock_response.raise_for_status = MagicMock()
+            mock_response.json.return_value = {"articles": [
+                {"title": f"Article {params['page']}-{i}", "url": f"https://www.bbc.com/news/{params['page']}-{i}"}
+                for i in range(params["pageSize"])
+            ]}
+            return mock_response
+        mock_get.side_effect = bbc_page
+
+        articles = list(self.bbc_api.iter_articles("Technology", page_size=30))
+
+        self.assertEqual(len(articles), 90)
+        self.assertEqual([c.kwargs["params"]["page"] for c in mock_get.call_args_list], [1, 2, 3])
+
+    @patch("aggregator.http_session.requests.Session.get")
+    def test_fetch_articles_honors_page_size_bbc(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.json.return_value = {"articles": []}
+        mock_get.return_value = mock_response
+
+        self.bbc_api.fetch_articles(source="BBC News", category="Technology", page_size=3)
+        self.assertEqual(mock_get.call_args.kwargs["params"]["pageSize"], 3)
+
     """ BBC API Tests """
-    @patch("aggregator.api_client.requests.get")
+    @patch("aggregator.http_session.requests.Session.get")
     def test_fetch_articles_success_bbc(self, mock_get):
         # Mocking the API response JSON
         mock_response = MagicMock()
@@ -281,7 +475,7 @@ class TestAPIClient(unittest.TestCase):
         self.assertEqual(articles[0].title, "BBC Test Article")
         self.assertEqual(articles[0].url, "https://bbc.com/test-article")
 
-    @patch("aggregator.api_client.requests.get")
+    @patch("aggregator.http_session.requests.Session.get")
     def test_fetch_articles_bad_response_bbc(self, mock_get):
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("Bad request")
@@ -290,7 +484,7 @@ class TestAPIClient(unittest.TestCase):
         with self.assertRaises(requests.exceptions.HTTPError):
             self.bbc_api.fetch_articles(category="Technology", source="BBC News")
 
-    @patch("aggregator.api_client.requests.get")
+    @patch("aggregator.http_session.requests.Session.get")
     def test_fetch_articles_invalid_json_structure_bbc(self, mock_get):
         mock_response = MagicMock()
         mock_response.raise_for_status = MagicMock()
@@ -0,0 +1,135 @@
+import unittest
+import numpy as np
+from aggregator.visualizer import NewsVisualizer
+from entities.article_batch import ArticleBatch
+from entities.news_article import NewsArticle, TheGuardianArticle, NYTArticle, BBCArticle, GNewsArticle
+
+
+class TestArticleBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.guardian_json = {"response": {"results": [{
+            "id": "world/1", "type": "article", "sectionId": "world", "sectionName": "World news",
+            "webPublicationDate": "2024-03-20T10:00:00Z", "webTitle": "Guardian story",
+            "webUrl": "https://www.theguardian.com/world/1", "apiUrl": "https://content.guardianapis.com/world/1",
+            "isHosted": False, "fields": {"body": "<p>Four words of body</p>", "byline": "Staff", "thumbnail": None},
+        }]}}
+        self.nyt_json = {"response": {"docs": [{
+            "abstract": "NYT abstract", "byline": {"original": "By Staff"}, "document_type": "article",
+            "headline": {"main": "Main", "print_headline": "NYT story"}, "_id": "nyt://article/1", "keywords": [],
+            "multimedia": {}, "news_desk": "Foreign", "print_page": "1", "print_section": "A",
+            "pub_date": "2024-01-05T08:30:00+0000", "section_name": "World", "snippet": "NYT abstract",
+            "source": "The New York Times", "subsection_name": "Europe", "type_of_material": "News",
+            "uri": "nyt://article/1", "web_url": "https://www.nytimes.com/1.html", "word_count": 900,
+        }]}}
+        self.bbc_json = {"articles": [{
+            "title": "BBC story", "description": "BBC description here", "url": "https://www.bbc.com/news/1",
+            "urlToImage": "", "publishedAt": "2024-03-21T12:00:00Z", "source": {"name": "BBC News"},
+        }]}
+        self.gnews_json = {"articles": [{
+            "title": "GNews story", "description": "GNews description", "content": "Opening lines",
+            "url": "https://example.com/1", "image": "", "publishedAt": "not a date", "source": {"name": "Example"},
+        }]}
+
+    def articles(self) -> list[NewsArticle]:
+        return [
+            TheGuardianArticle(**self.guardian_json["response"]["results"][0]),
+            NYTArticle(**self.nyt_json["response"]["docs"][0]),
+            BBCArticle.from_dict({
+                "title": "BBC story", "description": "BBC description here", "url": "https://www.bbc.com/news/1",
+                "image_url": "", "published_at": "2024-03-21T12:00:00Z", "source": "BBC News",
+            }),
+            GNewsArticle(**self.gnews_json["articles"][0]),
+        ]
+
+    def test_from_articles(self):
+        """Test that every field is put in its column, with dates parsed and words counted"""
+        batch = ArticleBatch.from_articles(self.articles())
+        self.assertEqual(len(batch), 4)
+        self.assertEqual(list(batch.title), ["Guardian story", "NYT story", "BBC story", "GNews story"])
+        self.assertEqual(list(batch.source), ["The Guardian", "New York Times", "BBC News", "GNews"])
+        self.assertEqual(batch.source_codes.dtype, np.int16)
+        self.assertEqual(batch.published[1], np.datetime64("2024-01-05T08:30:00"))
+        self.assertTrue(np.isnat(batch.published[3]))
+        # The NYT article has no text yet, so the count reported by the API is used
+        self.assertEqual(list(batch.word_count), [4, 900, 3, 2])
+        self.assertEqual(list(batch.author), ["Staff", "By Staff", "", ""])
+
+    def test_body_counted_for_bbc(self):
+        """Test that the scraped body of a BBC article is counted rather than its description"""
+        article = self.articles()[2]
+        article.body = "One two three four five six"
+        self.assertEqual(ArticleBatch.from_articles([article]).word_count[0], 6)
+
+    def test_from_api_json_matches_articles(self):
+        """Test that a batch built from API results equals one built from the articles"""
+        batches = [
+            ArticleBatch.from_api_json("The Guardian", self.guardian_json),
+            ArticleBatch.from_api_json("New York Times", self.nyt_json),
+            ArticleBatch.from_api_json("BBC News", self.bbc_json),
+            ArticleBatch.from_api_json("GNews", self.gnews_json),
+        ]
+        expected = ArticleBatch.from_articles(self.articles())
+        for i, batch in enumerate(batches):
+            self.assertEqual(len(batch), 1)
+            for column in ("title", "source", "summary", "url", "author", "word_count"):
+                self.assertEqual(getattr(batch, column)[0], getattr(expected, column)[i], column)
+            self.assertTrue(batch.published[0] == expected.published[i]
+                            or np.isnat(batch.published[0]) and np.isnat(expected.published[i]))
+
+    def test_from_api_json_errors(self):
+        """Test that unknown providers and unexpected responses are rejected"""
+        with self.assertRaises(ValueError):
+            ArticleBatch.from_api_json("Unknown", {})
+        with self.assertRaises(KeyError):
+            ArticleBatch.from_api_json("The Guardian", {"message": "error"})
+
+    def test_empty(self):
+        """Test that an empty batch has empty columns and counts"""
+        batch = ArticleBatch.from_articles([])
+        self.assertEqual(len(batch), 0)
+        self.assertEqual(batch.source_counts(), {})
+        months, counts = batch.monthly_counts()
+        self.assertEqual(len(months), 0)
+        self.assertEqual(len(counts), 0)
+
+    def test_selection(self):
+        """Test that slices and masks select articles in every column"""
+        batch = ArticleBatch.from_articles(self.articles())
+        head = batch[:2]
+        self.assertEqual(list(head.source), ["The Guardian", "New York Times"])
+        long = batch[batch.word_count > 3]
+        self.assertEqual(list(long.title), ["Guardian story", "NYT story"])
+        self.assertEqual(list(long.word_count), [4, 900])
+
+    def test_source_counts(self):
+        """Test that sources are counted, largest first"""
+        articles = self.articles() + [GNewsArticle(**self.gnews_json["articles"][0])]
+        self.assertEqual(
+            ArticleBatch.from_articles(articles).source_counts(),
+            {"GNews": 2, "BBC News": 1, "New York Times": 1, "The Guardian": 1}
+        )
+
+    def test_monthly_counts(self):
+        """Test that months between the first and last publication are counted, empty ones included"""
+        months, counts = ArticleBatch.from_articles(self.articles()).monthly_counts()
+        self.assertEqual(list(months.astype(str)), ["2024-01", "2024-02", "2024-03"])
+        self.assertEqual(list(counts), [1, 0, 2])
+
+    def test_to_frame(self):
+        """Test that the columns convert to a DataFrame with a categorical source"""
+        frame = ArticleBatch.from_articles(self.articles()).to_frame()
+        self.assertEqual(len(frame), 4)
+        self.assertEqual(frame["source"].dtype.name, "category")
+        self.assertEqual(frame["word_count"].tolist(), [4, 900, 3, 2])
+
+    def test_visualizer_plots(self):
+        """Test that the plots accept a batch and a list of articles alike"""
+        visualizer = NewsVisualizer()
+        articles = self.articles()
+        batch = ArticleBatch.from_articles(articles)
+        for data in (batch, articles):
+            monthly = visualizer.articles_by_day_plot(data)
+            self.assertEqual([sum(trace.y) for trace in monthly.data], [3])
+            words = visualizer.number_of_words_plot(data, max_articles=2)
+            self.assertEqual(sorted(int(x) for trace in words.data for x in trace.x), [4, 900])
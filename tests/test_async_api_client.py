@@ -0,0 +1,151 @@
+import unittest
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import requests
+from aggregator.async_api_client import AsyncGNewsApi, AsyncTheGuardianApi
+from aggregator.cache import MemoryCache
+from aggregator.api_client import TheGuardianApi
+from aggregator.rate_limiter import DEFAULT_LIMITS, RateLimit, RequestScheduler
+from entities.news_article import TheGuardianArticle
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_served = 0
+    delay = 0.0
+
+    def do_GET(self):
+        FeedHandler.requests_served += 1
+        time.sleep(FeedHandler.delay)
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+
+        if parts.path == "/search":
+            section = query["section"][0]
+            body = {"response": {"results": [{
+                "id": f"{section}/1", "type": "article", "sectionId": section, "sectionName": section,
+                "webPublicationDate": "2024-03-20T10:00:00Z", "webTitle": f"{section} article",
+                "webUrl": f"https://guardian.co.uk/{section}/1", "apiUrl": "", "isHosted": False, "fields": {}
+            }]}}
+        elif parts.path == "/top-headlines":
+            body = {"totalArticles": 1}  # Missing "articles"
+        else:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncAPIClient(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Start a local server answering like the provider APIs"""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+        cls.server.daemon_threads = True
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FeedHandler.requests_served = 0
+        FeedHandler.delay = 0.0
+
+    def guardian(self, **kwargs) -> AsyncTheGuardianApi:
+        return AsyncTheGuardianApi(api_key="key", base_url=self.base_url, cache=MemoryCache(),
+                                   scheduler=RequestScheduler(), **kwargs)
+
+    async def test_requests_are_rate_limited(self):
+        """Test that the async client is throttled by its provider's quota, shared with the blocking client"""
+        scheduler = RequestScheduler(limits={"TheGuardianApi": RateLimit(per_second=10, burst=1, per_day=10)})
+        async with AsyncTheGuardianApi(api_key="key", base_url=self.base_url, cache=MemoryCache(),
+                                       scheduler=scheduler) as client:
+            started = time.monotonic()
+            for category in ("World", "Science", "Sport"):
+                await client.fetch_articles(category=category)
+            elapsed = time.monotonic() - started
+
+        # One request right away, then one every 0.1s
+        self.assertGreaterEqual(elapsed, 0.18)
+        self.assertEqual(client.remaining_budget().daily_remaining, 7)
+        blocking = TheGuardianApi(api_key="key", base_url=self.base_url, cache=MemoryCache(), scheduler=scheduler)
+        self.assertEqual(blocking.remaining_budget().daily_remaining, 7)
+
+    def test_default_limits_apply(self):
+        """Test that every async client is keyed to a provider with a published quota"""
+        self.assertIn(AsyncTheGuardianApi.provider_key, DEFAULT_LIMITS)
+        self.assertIn(AsyncGNewsApi.provider_key, DEFAULT_LIMITS)
+        self.assertEqual(AsyncGNewsApi.provider_key, "GNewsApi")
+
+    async def test_parses_into_entities(self):
+        """Test that responses are parsed into the same entities as the blocking client"""
+        async with self.guardian() as client:
+            articles = await client.fetch_articles(category="Technology")
+
+        self.assertEqual(len(articles), 1)
+        self.assertIsInstance(articles[0], TheGuardianArticle)
+        self.assertEqual(articles[0].title, "technology article")
+
+    async def test_many_requests_run_concurrently(self):
+        """Test that hundreds of fetches overlap on one event loop"""
+        FeedHandler.delay = 0.2
+        async with self.guardian(max_connections=200, max_connections_per_host=200) as client:
+            started = time.monotonic()
+            results = await asyncio.gather(*[client.fetch_articles(category=f"section{i}") for i in range(200)])
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(len(results), 200)
+        self.assertEqual(FeedHandler.requests_served, 200)
+        # 200 sequential requests would take 40 seconds
+        self.assertLess(elapsed, 5)
+
+    async def test_identical_fetches_are_coalesced(self):
+        """Test that concurrent fetches of the same feed share one request"""
+        FeedHandler.delay = 0.1
+        async with self.guardian() as client:
+            results = await asyncio.gather(*[client.fetch_articles(category="World") for _ in range(10)])
+
+        self.assertEqual(FeedHandler.requests_served, 1)
+        self.assertTrue(all(r[0].title == "world article" for r in results))
+
+    async def test_errors_match_blocking_client(self):
+        """Test that failures raise the same exceptions as the blocking clients"""
+        async with AsyncGNewsApi(api_key="key", base_url=self.base_url, cache=MemoryCache(),
+                                 scheduler=RequestScheduler()) as client:
+            with self.assertRaises(KeyError):
+                await client.fetch_articles(category="Technology")
+
+        async with AsyncGNewsApi(api_key="key", base_url=f"{self.base_url}broken/", cache=MemoryCache(),
+                                 scheduler=RequestScheduler()) as client:
+            with self.assertRaises(requests.exceptions.HTTPError):
+                await client.fetch_articles(category="Technology")
+
+    async def test_iter_articles(self):
+        """Test that the async iterator yields parsed articles and stops at max_items"""
+        async with self.guardian() as client:
+            articles = [article async for article in client.iter_articles("Science", max_items=1)]
+
+        self.assertEqual([a.title for a in articles], ["science article"])
+        self.assertEqual(FeedHandler.requests_served, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import tempfile
+import time
+from aggregator.cache import MemoryCache, DiskCache, TieredCache, make_cache_key
+
+
+class TestMemoryCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a small memory cache"""
+        self.cache = MemoryCache(ttl=60, max_entries=3)
+
+    def test_set_and_get(self):
+        """Test that stored values are returned and counted as hits"""
+        self.cache.set("a", [1, 2, 3])
+        self.assertEqual(self.cache.get("a"), [1, 2, 3])
+        self.assertIsNone(self.cache.get("missing"))
+        self.assertEqual(self.cache.stats.hits, 1)
+        self.assertEqual(self.cache.stats.misses, 1)
+
+    def test_ttl_expiry(self):
+        """Test that expired values are treated as misses"""
+        self.cache.set("a", "value", ttl=0.05)
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats.expirations, 1)
+        self.assertEqual(self.cache.stats.entries, 0)
+
+    def test_lru_eviction_by_entries(self):
+        """Test that the least recently used entry is evicted first"""
+        for key in ("a", "b", "c"):
+            self.cache.set(key, key)
+        self.cache.get("a")
+        self.cache.set("d", "d")
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), "a")
+        self.assertEqual(self.cache.stats.evictions, 1)
+        self.assertEqual(self.cache.stats.entries, 3)
+
+    def test_eviction_by_bytes(self):
+        """Test that the byte bound is respected"""
+        cache = MemoryCache(max_entries=100, max_bytes=2500)
+        for i in range(5):
+            cache.set(str(i), "x" * 1000)
+        self.assertLessEqual(cache.stats.bytes, 2500)
+        self.assertEqual(cache.get("4"), "x" * 1000)
+        self.assertIsNone(cache.get("0"))
+
+    def test_stale_entries_within_ceiling(self):
+        """Test that expired entries are served as stale only until the ceiling passes"""
+        cache = MemoryCache(ttl=0.05, max_stale=0.2)
+        cache.set("a", "value")
+        time.sleep(0.1)
+
+        self.assertIsNone(cache.get("a"))
+        entry = cache.get_entry("a", allow_stale=True)
+        self.assertEqual(entry.value, "value")
+        self.assertTrue(entry.is_expired())
+        self.assertEqual(cache.stats.stale_hits, 1)
+
+        time.sleep(0.2)
+        self.assertIsNone(cache.get_entry("a", allow_stale=True))
+        self.assertEqual(cache.stats.expirations, 1)
+
+    def test_make_cache_key(self):
+        """Test that keys are readable strings"""
+        self.assertEqual(make_cache_key("TheGuardianApi", "Technology", 10), "TheGuardianApi:Technology:10")
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a disk cache in a temporary directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = DiskCache(self.tmp.name, ttl=60, max_entries=2)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_persists_between_instances(self):
+        """Test that a new cache instance sees values stored by another"""
+        self.cache.set("a", {"title": "Article"})
+        other = DiskCache(self.tmp.name)
+        self.assertEqual(other.get("a"), {"title": "Article"})
+
+    def test_eviction_and_expiry(self):
+        """Test that files are evicted past the entry bound and expire with their TTL"""
+        self.cache.set("a", 1)
+        time.sleep(0.01)
+        self.cache.set("b", 2, ttl=0.05)
+        time.sleep(0.01)
+        self.cache.set("c", 3)
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats.evictions, 1)
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("c"), 3)
+
+    def test_tiered_cache_promotes_disk_hits(self):
+        """Test that disk hits are copied into the memory tier"""
+        DiskCache(self.tmp.name).set("a", "value")
+        tiered = TieredCache(MemoryCache(), DiskCache(self.tmp.name))
+
+        self.assertEqual(tiered.get("a"), "value")
+        self.assertEqual(tiered.memory.get("a"), "value")
+        self.assertEqual(tiered.stats.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import numpy as np
+from aggregator.dedup import (
+    NUM_PERM, NearDuplicateIndex, article_text, collapse_duplicates, minhash, shingles, similarity
+)
+from entities.news_article import NewsArticle, BBCArticle
+
+STORM = ("Storm Ciaran batters southern England as thousands lose power. Winds of up to 100mph hit the "
+         "coast on Thursday, closing schools and cancelling trains across the region.")
+STORM_REWORDED = ("Storm Ciaran batters southern England as thousands lose power. Winds of up to 100mph hit the "
+                  "coast on Thursday, closing schools and cancelling trains across the south.")
+RATES = ("Central bank holds interest rates steady as inflation eases. The bank kept its main rate at "
+         "5.25% for a third meeting in a row on Thursday.")
+
+
+def article(title: str, summary: str, source: str, url: str, content=None) -> NewsArticle:
+    return NewsArticle(title=title, feature_image_url=None, content=content, summary=summary, author=None,
+                       source=source, date="2024-03-20T10:00:00Z", url=url)
+
+
+class TestNearDuplicates(unittest.TestCase):
+
+    def test_signature(self):
+        """Test that signatures are stable and estimate the similarity of texts"""
+        signature = minhash(STORM)
+        self.assertEqual(signature.shape, (NUM_PERM,))
+        self.assertEqual(signature.dtype, np.uint32)
+        np.testing.assert_array_equal(signature, minhash(STORM.upper()))
+        self.assertGreater(similarity(signature, minhash(STORM_REWORDED)), 0.8)
+        self.assertLess(similarity(signature, minhash(RATES)), 0.2)
+        self.assertIsNone(minhash("  ... "))
+
+    def test_shingles(self):
+        """Test that the distinct word pairs of a text are hashed"""
+        self.assertEqual(len(shingles("a b a b")), 2)
+        self.assertEqual(len(shingles("word")), 1)
+        self.assertEqual(len(shingles("")), 0)
+
+    def test_article_text(self):
+        """Test that tags and the truncation marker are removed, and the content is cut to its opening"""
+        gnews = article("Title", "<p>Summary</p>", "GNews", "u", content="Body text ... [2345 chars]")
+        self.assertEqual(article_text(gnews).split(), ["Title", "Summary", "Body", "text", "..."])
+        long = article("Title", "", "GNews", "u", content=" ".join(["word"] * 1000))
+        self.assertEqual(len(article_text(long).split()), 121)
+
+    def test_index(self):
+        """Test that near-duplicates join the cluster of the first similar entry"""
+        index = NearDuplicateIndex()
+        self.assertEqual(index.add("storm", minhash(STORM)), "storm")
+        self.assertEqual(index.add("rates", minhash(RATES)), "rates")
+        self.assertEqual(index.add("storm again", minhash(STORM_REWORDED)), "storm")
+        self.assertEqual(index.query(minhash(STORM)), ["storm", "storm again"])
+        self.assertEqual(len(index), 3)
+
+    def test_index_grows(self):
+        """Test that the index keeps every signature beyond its initial capacity"""
+        index = NearDuplicateIndex()
+        for i in range(200):
+            index.add(i, minhash(f"story number {i} about topic {i * 7}"))
+        self.assertEqual(len(index), 200)
+        self.assertEqual(index.query(minhash("story number 150 about topic 1050")), [150])
+
+    def test_invalid_bands(self):
+        """Test that bands must split the signature evenly"""
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex(bands=7)
+
+    def test_collapse_duplicates(self):
+        """Test that one article per story is kept, at the position of the story's first article"""
+        articles = [
+            article("Storm Ciaran", STORM, "GNews", "https://example.com/storm"),
+            article("Rates on hold", RATES, "The Guardian", "https://www.theguardian.com/rates", content="<p>Body</p>"),
+            article("Storm Ciaran", STORM_REWORDED, "The Guardian", "https://www.theguardian.com/storm"),
+            article("No text", "", "GNews", "https://example.com/empty-1"),
+            article("", "", "GNews", "https://example.com/empty-2"),
+            article("", "", "GNews", "https://example.com/empty-3"),
+        ]
+        result = collapse_duplicates(articles)
+        self.assertEqual([a.url for a in result.articles], [
+            "https://example.com/storm", "https://www.theguardian.com/rates",
+            "https://example.com/empty-1", "https://example.com/empty-2", "https://example.com/empty-3",
+        ])
+        self.assertEqual(result.duplicates, {"https://example.com/storm": [articles[2]]})
+        self.assertEqual(result.collapsed, 1)
+
+    def test_collapse_prefers_articles_without_scraping(self):
+        """Test that the article of a story kept is one whose page does not need to be scraped"""
+        bbc = BBCArticle(uuid="1", title="Storm Ciaran", description=STORM, url="https://www.bbc.com/news/storm",
+                         image_url="", published_at="2024-03-20", source="BBC News", content="", body=STORM)
+        gnews = article("Storm Ciaran", STORM, "GNews", "https://example.com/storm")
+        result = collapse_duplicates([gnews, bbc])
+        self.assertEqual(result.articles, [bbc])
+        self.assertEqual(result.duplicates, {bbc.url: [gnews]})
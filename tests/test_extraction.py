@@ -0,0 +1,119 @@
+import unittest
+import os
+from unittest.mock import Mock
+import requests
+from bs4 import BeautifulSoup
+from aggregator.extraction import (
+    declared_encoding, main_content, parse_page, ElementSpec, PageScanner, GUARDIAN_BODY, NYTIMES_FIELDS, BBC_FIELDS,
+)
+from aggregator.cache import MemoryCache
+from aggregator.scraper import ArticleScraper
+from aggregator.singleflight import SingleFlight
+from entities.news_article import NewsArticle
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "pages")
+
+
+def page_response(content: bytes, content_type: str = "text/html; charset=utf-8") -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = content_type
+    response._content = content
+    return response
+
+
+def fixture(name: str) -> requests.Response:
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return page_response(f.read())
+
+
+class TestExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.scraper = ArticleScraper([], lazy=True)
+        self.article = NewsArticle(title="", feature_image_url=None, content=None, summary="", author=None,
+                                   source="", date="", url="")
+
+    def test_declared_encoding(self):
+        """Test that only a charset sent by the server is reported"""
+        self.assertEqual(declared_encoding(page_response(b"", "text/html; charset=\"ISO-8859-1\"")), "ISO-8859-1")
+        self.assertIsNone(declared_encoding(page_response(b"", "text/html")))
+        self.assertIsNone(declared_encoding(requests.Response()))
+
+    def test_declared_encoding_is_used(self):
+        """Test that the charset from the headers decodes the page"""
+        content = "<div class='article-body-viewer-selector'>Café</div>".encode("cp1252")
+        result = self.scraper._extract_guardian(self.article, page_response(content, "text/html; charset=cp1252"))
+        self.assertEqual(result["content"], "Café")
+
+    def test_only_relevant_subtrees_are_built(self):
+        """Test that restricted parsing skips everything outside the extracted tags"""
+        soup = parse_page(fixture("guardian.html"), GUARDIAN_BODY)
+        self.assertIsNone(soup.find("script"))
+        self.assertEqual(len(soup.find_all("div", class_="article-body-viewer-selector")), 1)
+
+        soup = parse_page(fixture("bbc.html"), BBC_FIELDS)
+        self.assertIsNone(soup.find("nav"))
+        self.assertEqual(soup.find("meta", property="og:title").parent, soup)
+
+    def test_matches_full_parse(self):
+        """Test that extraction from the restricted tree equals extraction from the whole page"""
+        for name, strainer, tags in [
+            ("guardian.html", GUARDIAN_BODY, [("div", {"class": "article-body-viewer-selector"})]),
+            ("nytimes.html", NYTIMES_FIELDS, [("article", {}), ("h1", {}), ("img", {}), (None, {"itemprop": "name"})]),
+            ("bbc.html", BBC_FIELDS, [("meta", {}), ("title", {}), ("div", {"data-component": "text-block"})]),
+        ]:
+            with self.subTest(page=name):
+                response = fixture(name)
+                full = BeautifulSoup(response.content, "html.parser")
+                restricted = parse_page(response, strainer)
+                for tag, attrs in tags:
+                    self.assertEqual([t.get_text() for t in restricted.find_all(tag, attrs=attrs)],
+                                     [t.get_text() for t in full.find_all(tag, attrs=attrs)])
+                    self.assertEqual([t.attrs for t in restricted.find_all(tag, attrs=attrs)],
+                                     [t.attrs for t in full.find_all(tag, attrs=attrs)])
+
+    def test_scanner_stops_after_element(self):
+        """Test that the scanner reports the end of the stop element across chunks and nesting"""
+        scanner = PageScanner(ElementSpec("div", (("class", "body"),)))
+        chunks = [b'<div class="nav"></div><div class="main bo', b'dy"><div><p>Text</p></div>', b'</div><footer>']
+        self.assertEqual([scanner.feed_bytes(chunk) for chunk in chunks], [False, False, True])
+
+    def test_main_content_of_fixture_pages(self):
+        """Test that the generic extractor finds the article paragraphs of differently built pages"""
+        for name, body in [
+            ("guardian.html", ("div", {"class": "article-body-viewer-selector"})),
+            ("nytimes.html", ("section", {"name": "articleBody"})),
+            ("bbc.html", ("article", {})),
+            ("publisher.html", ("div", {"class": "entry-content"})),
+        ]:
+            with self.subTest(page=name):
+                soup = BeautifulSoup(fixture(name).content, "html.parser")
+                expected = [p.get_text(" ", strip=True) for p in soup.find(*body).find_all(["p", "blockquote"])
+                            if p.parent.name != "blockquote"]
+                self.assertEqual(main_content(soup).split("\n\n"), expected)
+
+    def test_main_content_without_article(self):
+        """Test that pages without paragraphs of text give no content"""
+        soup = BeautifulSoup("<nav><p>Home, World, Business, Technology and Science</p></nav><p>Short</p>", "html.parser")
+        self.assertEqual(main_content(soup), "")
+
+    def test_gnews_article_is_scraped(self):
+        """Test that GNews articles get the main text of the publisher's page"""
+        article = NewsArticle(title="GNews", feature_image_url=None, content="Opening... [1200 chars]", summary="",
+                              author=None, source="GNews", date="", url="https://example.com/markets/1")
+        pool = Mock()
+        pool.get.return_value = fixture("publisher.html")
+        ArticleScraper([article], session_pool=pool, flight=SingleFlight(), extraction_cache=MemoryCache())
+        self.assertEqual(article.content.count("\n\n"), 18)
+
+    def test_bbc_description_fallback(self):
+        """Test that title and description fall back to the <title> tag and plain meta description"""
+        content = b'<meta name="description" content="Plain description"><title>Title</title>'
+        result = self.scraper._extract_bbc(self.article, page_response(content))
+        self.assertEqual(result["title"], "Title")
+        self.assertEqual(result["description"], "Plain description")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import time
+from aggregator.fetcher import FanOutFetcher
+from entities.news_article import NewsArticle
+
+
+def make_article(source: str, i: int) -> NewsArticle:
+    return NewsArticle(
+        title=f"{source} {i}",
+        feature_image_url=None,
+        content="content",
+        summary="summary",
+        author=None,
+        source=source,
+        date="2024-03-20",
+        url=f"https://example.com/{source}/{i}"
+    )
+
+
+class TestFanOutFetcher(unittest.TestCase):
+    def setUp(self):
+        """Set up a fetcher with a short deadline"""
+        self.fetcher = FanOutFetcher(timeout=0.5)
+
+    def test_results_keep_source_order(self):
+        """Test that articles are concatenated in the order the sources were given"""
+        result = self.fetcher.fetch_all({
+            "A": lambda: (time.sleep(0.05), [make_article("A", 1)])[1],
+            "B": lambda: [make_article("B", 1), make_article("B", 2)],
+        })
+        self.assertEqual([a.source for a in result.articles], ["A", "B", "B"])
+        self.assertEqual(result.failed_sources, [])
+        self.assertEqual(set(result.durations), {"A", "B"})
+
+    def test_sources_run_concurrently(self):
+        """Test that total latency is close to the slowest source, not the sum"""
+        tasks = {name: (lambda n=name: (time.sleep(0.2), [make_article(n, 1)])[1]) for name in "ABCD"}
+        started = time.monotonic()
+        result = self.fetcher.fetch_all(tasks)
+        self.assertLess(time.monotonic() - started, 0.6)
+        self.assertEqual(len(result.articles), 4)
+
+    def test_slow_source_times_out(self):
+        """Test that a source missing its deadline is reported and does not block the others"""
+        started = time.monotonic()
+        result = self.fetcher.fetch_all(
+            {
+                "fast": lambda: [make_article("fast", 1)],
+                "slow": lambda: (time.sleep(1.0), [make_article("slow", 1)])[1],
+            },
+            deadlines={"slow": 0.1}
+        )
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual([a.source for a in result.articles], ["fast"])
+        self.assertEqual(result.failed_sources, ["slow"])
+        self.assertIn("Timed out", result.errors["slow"])
+
+    def test_failing_source_is_collected(self):
+        """Test that an exception in one source is reported as a failure"""
+        def broken():
+            raise ValueError("Bad request")
+
+        result = self.fetcher.fetch_all({"ok": lambda: [make_article("ok", 1)], "broken": broken})
+        self.assertEqual(len(result.articles), 1)
+        self.assertEqual(result.failed_sources, ["broken"])
+        self.assertEqual(result.errors["broken"], "Bad request")
+
+    def test_no_tasks(self):
+        """Test that an empty fan-out returns an empty result"""
+        result = self.fetcher.fetch_all({})
+        self.assertEqual(result.articles, [])
+        self.assertEqual(result.failed_sources, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import threading
+from aggregator.cache import MemoryCache
+from aggregator.frontier import CrawlFrontier
+from aggregator.rate_limiter import Priority
+from aggregator.scraper import ArticleScraper
+from aggregator.singleflight import SingleFlight
+from entities.news_article import NewsArticle
+from tests.test_scraper import SlowPagePool
+
+
+class TestCrawlFrontier(unittest.TestCase):
+
+    def setUp(self):
+        self.frontier = CrawlFrontier(workers=1)
+        self.order = []
+        # Keep the only worker busy until the queue is filled
+        self.release = threading.Event()
+        self.blocker = self.frontier.submit("blocker", self.release.wait, Priority.INTERACTIVE)
+
+    def record(self, name):
+        return lambda: self.order.append(name) or name
+
+    def test_runs_by_priority_then_order(self):
+        """Test that interactive tasks overtake background ones, each in submission order"""
+        futures = [
+            self.frontier.submit("off-screen 1", self.record("off-screen 1")),
+            self.frontier.submit("visible 1", self.record("visible 1"), Priority.INTERACTIVE),
+            self.frontier.submit("off-screen 2", self.record("off-screen 2")),
+            self.frontier.submit("visible 2", self.record("visible 2"), Priority.INTERACTIVE),
+        ]
+        self.release.set()
+        self.assertEqual([f.result(timeout=1) for f in futures], ["off-screen 1", "visible 1", "off-screen 2", "visible 2"])
+        self.assertEqual(self.order, ["visible 1", "visible 2", "off-screen 1", "off-screen 2"])
+
+    def test_resubmit_moves_task_up(self):
+        """Test that a queued task submitted again with a higher priority runs earlier, once"""
+        first = self.frontier.submit("a", self.record("a"))
+        self.frontier.submit("b", self.record("b"))
+        self.assertIs(self.frontier.submit("a", self.record("a again"), Priority.INTERACTIVE), first)
+        self.frontier.submit("c", self.record("c"), Priority.INTERACTIVE)
+
+        self.release.set()
+        first.result(timeout=1)
+        self.frontier.submit("done", lambda: None, Priority.BACKGROUND).result(timeout=1)
+        self.assertEqual(self.order, ["a", "c", "b"])
+
+    def test_cancel_background(self):
+        """Test that queued background tasks are cancelled and interactive ones still run"""
+        background = self.frontier.submit("off-screen", self.record("off-screen"))
+        visible = self.frontier.submit("visible", self.record("visible"), Priority.INTERACTIVE)
+
+        self.assertEqual(self.frontier.cancel_background(), 1)
+        self.release.set()
+        self.assertEqual(visible.result(timeout=1), "visible")
+        self.assertTrue(background.cancelled())
+        self.assertEqual(self.frontier.pending(), 0)
+
+    def test_scraper_cancels_its_prefetches(self):
+        """Test that a scraper's off-screen prefetches can be cancelled before they start"""
+        articles = [NewsArticle(
+            title=f"Article {i}", feature_image_url=None, content=None, summary="Summary", author=None,
+            source="The Guardian", date="2024-03-20", url=f"https://www.theguardian.com/world/{i}"
+        ) for i in range(4)]
+        scraper = ArticleScraper(articles, session_pool=SlowPagePool(delay=0.01), flight=SingleFlight(),
+                                 extraction_cache=MemoryCache(), lazy=True, enrichment_memo=MemoryCache(),
+                                 frontier=self.frontier)
+
+        scraper.prefetch(articles[:1], priority=Priority.INTERACTIVE)
+        scraper.prefetch(articles)
+        self.assertEqual(scraper.cancel_prefetches(), 3)
+        self.release.set()
+
+        scraper.enrich(articles[0])
+        self.assertEqual(articles[0].content, f"Body of {articles[0].url}")
+        self.assertEqual(scraper.enrichment_memo.get(scraper._memo_key(articles[1])), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+import requests
+from aggregator.health import CircuitBreaker, CircuitOpenError, HealthRegistry, ProviderHealth
+from aggregator.http_session import HTTPSessionPool
+
+
+class HangingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(1)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def ok_response():
+    response = MagicMock()
+    response.status_code = 200
+    return response
+
+
+class TestProviderHealth(unittest.TestCase):
+    def test_circuit_opens_and_recovers(self):
+        """Test that the circuit opens after repeated failures and closes after a good trial"""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())  # The single trial request
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_trial_reopens(self):
+        """Test that a failing half-open trial opens the circuit again"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+    def test_server_errors_count_as_failures(self):
+        """Test that 5xx answers open the circuit and later calls fail fast"""
+        health = ProviderHealth("example.com", failure_threshold=2)
+        error = MagicMock()
+        error.status_code = 503
+        send = MagicMock(return_value=error)
+        health.call(send)
+        health.call(send)
+
+        with self.assertRaises(CircuitOpenError):
+            health.call(send)
+        self.assertEqual(send.call_count, 2)
+        stats = health.stats()
+        self.assertEqual((stats.failures, stats.rejected, stats.state), (2, 1, "open"))
+
+    def test_slow_request_is_hedged(self):
+        """Test that a request slower than the p95 latency is duplicated and the faster answer wins"""
+        health = ProviderHealth("example.com", min_hedge_samples=5)
+        for _ in range(5):
+            health.latency.add(0.01)
+
+        calls = []
+
+        def send():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return "slow"
+            return "fast"
+
+        started = time.monotonic()
+        self.assertEqual(health.call(send, hedge=True), "fast")
+        self.assertLess(time.monotonic() - started, 0.4)
+        stats = health.stats()
+        self.assertEqual((stats.hedged, stats.hedge_wins), (1, 1))
+
+    def test_no_hedging_without_history(self):
+        """Test that requests are not duplicated before enough latencies were recorded"""
+        health = ProviderHealth("example.com")
+        send = MagicMock(side_effect=ok_response)
+        health.call(send, hedge=True)
+        self.assertEqual(send.call_count, 1)
+        self.assertEqual(health.stats().hedged, 0)
+
+    def test_pool_times_out_and_fails_fast(self):
+        """Test that a hanging host times out and then fails fast once its circuit opens"""
+        server = ThreadingHTTPServer(("127.0.0.1", 0), HangingHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        pool = HTTPSessionPool(max_retries=0, timeout=(1, 0.1),
+                               health=HealthRegistry(failure_threshold=2, recovery_timeout=60))
+        try:
+            for _ in range(2):
+                started = time.monotonic()
+                with self.assertRaises(requests.exceptions.RequestException):
+                    pool.get(url)
+                self.assertLess(time.monotonic() - started, 0.5)
+
+            started = time.monotonic()
+            with self.assertRaises(CircuitOpenError):
+                pool.get(url)
+            self.assertLess(time.monotonic() - started, 0.05)
+            self.assertEqual(pool.health.snapshot()["127.0.0.1"].state, "open")
+        finally:
+            pool.close()
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from aggregator.cache import DiskCache, MemoryCache
+from aggregator.http_cache import HTTPCache, request_key
+from aggregator.http_session import HTTPSessionPool
+from aggregator.scraper import ArticleScraper
+from aggregator.singleflight import SingleFlight
+from entities.news_article import NewsArticle
+
+PAGE = b"""
+<html><body>
+<div class="article-body-viewer-selector"><p>Guardian article content</p></div>
+</body></html>
+"""
+
+
+class ValidatingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    bodies_sent = 0
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        ValidatingHandler.bodies_sent += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHTTPCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Start a local server that honors If-None-Match"""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ValidatingHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/article"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        ValidatingHandler.bodies_sent = 0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.http_cache = HTTPCache(DiskCache(self.tmp.name, ttl=None))
+        self.pool = HTTPSessionPool(http_cache=self.http_cache)
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmp.cleanup()
+
+    def test_request_key_drops_credentials(self):
+        """Test that API keys are not part of the cache key and parameter order does not matter"""
+        first = request_key("https://gnews.io/api/v4/top-headlines?apikey=secret&lang=en", {"category": "world"})
+        second = request_key("https://gnews.io/api/v4/top-headlines?category=world&lang=en")
+        self.assertEqual(first, second)
+        self.assertNotIn("secret", first)
+
+    def test_conditional_get_reuses_body(self):
+        """Test that a 304 answer is served from the stored body"""
+        first = self.pool.get(self.url)
+        second = self.pool.get(self.url)
+
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, PAGE)
+        self.assertEqual(second.validator, '"v1"')
+        self.assertEqual(ValidatingHandler.bodies_sent, 1)
+        self.assertEqual(self.http_cache.revalidated, 1)
+
+    def test_not_modified_page_is_not_parsed_again(self):
+        """Test that the scraper reuses its extraction when the page was not modified"""
+        article = NewsArticle(
+            title="Guardian Test", feature_image_url=None, content=None, summary="Summary",
+            author=None, source="The Guardian", date="2024-03-20", url=self.url
+        )
+        options = dict(session_pool=self.pool, flight=SingleFlight(), extraction_cache=MemoryCache())
+        ArticleScraper([article], **options)
+        self.assertEqual(article.content, "Guardian article content")
+
+        article.content = None
+        with patch("aggregator.extraction.BeautifulSoup") as mock_soup:
+            scraper = ArticleScraper([article], **options)
+            mock_soup.assert_not_called()
+
+        self.assertEqual(article.content, "Guardian article content")
+        self.assertEqual(scraper.parses_skipped, 1)
+        self.assertEqual(ValidatingHandler.bodies_sent, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from aggregator.http_session import HTTPSessionPool, ConnectionStats
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"status": "ok"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHTTPSessionPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Start a local keep-alive HTTP server"""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_connections_are_reused(self):
+        """Test that sequential requests to the same host share one connection"""
+        pool = HTTPSessionPool()
+        for _ in range(5):
+            response = pool.get(self.url)
+            self.assertEqual(response.json(), {"status": "ok"})
+
+        stats = pool.stats()["127.0.0.1"]
+        self.assertEqual(stats.requests, 5)
+        self.assertEqual(stats.new_connections, 1)
+        self.assertEqual(stats.reused_connections, 4)
+        self.assertAlmostEqual(stats.reuse_ratio, 0.8)
+        pool.close()
+
+    def test_keep_alive_disabled(self):
+        """Test that every request opens a new connection when keep-alive is off"""
+        pool = HTTPSessionPool(keep_alive=False)
+        for _ in range(3):
+            pool.get(self.url)
+
+        stats = pool.stats()["127.0.0.1"]
+        self.assertEqual(stats.requests, 3)
+        self.assertEqual(stats.new_connections, 3)
+        pool.close()
+
+    def test_host_pool_sizes_mount_dedicated_adapters(self):
+        """Test that hosts with a custom pool size get their own adapter"""
+        pool = HTTPSessionPool(pool_maxsize=5, host_pool_sizes={"www.nytimes.com": 25})
+        adapter = pool.session.get_adapter("https://www.nytimes.com/2025/article.html")
+        default_adapter = pool.session.get_adapter("https://example.com/")
+
+        self.assertEqual(adapter._pool_maxsize, 25)
+        self.assertEqual(default_adapter._pool_maxsize, 5)
+        self.assertEqual(adapter.max_retries.total, pool.max_retries)
+
+    def test_reuse_ratio_without_requests(self):
+        """Test that an unused host reports a zero reuse ratio"""
+        self.assertEqual(ConnectionStats(host="example.com").reuse_ratio, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
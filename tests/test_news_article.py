@@ -1,4 +1,6 @@
 import unittest
+import copy
+import pickle
 from datetime import datetime
 from entities.news_article import NewsArticle, TheGuardianArticle, NYTArticle, BBCArticle, GNewsArticle
 
@@ -39,6 +41,13 @@ class TestNewsArticle(unittest.TestCase):
         self.assertIn("**Date:** 2024-03-20", preview)
         self.assertIn("This is a summary...", preview)
 
+    def test_preview_leaves_summary_unchanged(self):
+        """Test that rendering the preview again does not add another ellipsis"""
+        self.article.get_article_preview_md(limit=50)
+        preview = self.article.get_article_preview_md(limit=50)
+        self.assertEqual(self.article.summary, "This is a summary")
+        self.assertNotIn("summary......", preview)
+
     def test_get_article_full_md(self):
         """Test that full article markdown is generated correctly"""
         full_md = self.article.get_article_full_md()
@@ -46,6 +55,12 @@ class TestNewsArticle(unittest.TestCase):
         self.assertIn("**Date:** 2024-03-20", full_md)
         self.assertIn("This is the full content of the article.", full_md)
 
+    def test_slots(self):
+        """Test that articles have no per-instance __dict__ and survive pickling and copying"""
+        self.assertFalse(hasattr(self.article, "__dict__"))
+        self.assertEqual(pickle.loads(pickle.dumps(self.article)).to_dict(), self.article.to_dict())
+        self.assertEqual(copy.deepcopy(self.article).to_dict(), self.article.to_dict())
+
 class TestTheGuardianArticle(unittest.TestCase):
     def setUp(self):
         """Set up test data for TheGuardianArticle class"""
@@ -80,6 +95,23 @@ class TestTheGuardianArticle(unittest.TestCase):
         expected = "TheGuardianArticle(title='Guardian Test Article', section='World', date='2024-03-20')"
         self.assertEqual(repr(self.article), expected)
 
+    def test_guardian_payload_is_dropped(self):
+        """Test that the body is held once and the fields payload only on request"""
+        self.assertIsNone(self.article.raw)
+        self.assertIs(self.article.summary, self.article.content)
+        self.assertEqual(self.article.fields, self.fields)
+        self.assertEqual(self.article.webUrl, "https://guardian.com/article")
+
+        TheGuardianArticle.keep_raw = True
+        try:
+            fields = dict(self.fields, bodyText="Guardian article content")
+            article = TheGuardianArticle(id="guardian-124", type="article", sectionId="world", sectionName="World",
+                                         webPublicationDate="2024-03-20", webTitle="Title", webUrl="https://guardian.com/2",
+                                         apiUrl="", fields=fields, isHosted=False)
+        finally:
+            TheGuardianArticle.keep_raw = False
+        self.assertIs(article.fields, fields)
+
 class TestNYTArticle(unittest.TestCase):
     def setUp(self):
         """Set up test data for NYTArticle class"""
@@ -113,6 +145,22 @@ class TestNYTArticle(unittest.TestCase):
         self.assertEqual(self.article.main, "Main Headline")
         self.assertEqual(self.article.kicker, "Kicker")
 
+    def test_nyt_payloads_are_reduced(self):
+        """Test that the raw payloads are replaced by the values the article uses"""
+        self.assertIsNone(self.article.raw)
+        self.assertEqual(self.article.headline["main"], "Main Headline")
+        self.assertEqual(self.article.byline, {"original": "NYT Author"})
+        self.assertEqual(self.article.multimedia["default"]["url"], "https://example.com/nyt.jpg")
+        self.assertEqual(self.article.keywords, [])
+        # Repeated short values are shared between articles
+        desk = "".join(["For", "eign"])
+        other = NYTArticle(abstract="", byline={}, document_type="article", headline={}, _id="nyt-124",
+                           keywords=[{"name": "subject", "value": "Politics"}], multimedia={}, news_desk=desk,
+                           print_page="", print_section="", pub_date="", section_name="", snippet="", source="",
+                           subsection_name="", type_of_material="", uri="", web_url="", word_count=0)
+        self.assertIs(other.news_desk, self.article.news_desk)
+        self.assertEqual(other.keyword_values, ("Politics",))
+
 class TestBBCArticle(unittest.TestCase):
     def setUp(self):
         """Set up test data for BBCArticle class"""
@@ -0,0 +1,167 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest.mock import Mock
+import requests
+from aggregator.cache import MemoryCache, make_cache_key
+from aggregator.page_archive import PageArchive
+from aggregator.scrape_store import ScrapeStore
+from aggregator.scraper import TRUNCATED_PAGE, ArticleScraper
+from aggregator.singleflight import SingleFlight
+from entities.news_article import NewsArticle
+
+PAGE = '<html><body><div class="article-body-viewer-selector"><p>Archived body</p></div>{}</body></html>'
+
+
+def page_response(content: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "text/html; charset=utf-8"
+    response._content = content.encode("utf-8")
+    return response
+
+
+class TestPageArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_put_and_get(self):
+        """Test that a page is read back with its headers, compressed on disk"""
+        archive = PageArchive(self.directory)
+        content = PAGE.format("<p>Filler paragraph</p>" * 500)
+        self.assertTrue(archive.put("https://example.com/1", page_response(content), "GNews"))
+
+        page = archive.get("https://example.com/1")
+        self.assertEqual(page.content, content.encode("utf-8"))
+        self.assertEqual(page.source, "GNews")
+        self.assertEqual(page.to_response().headers["content-type"], "text/html; charset=utf-8")
+        self.assertIsNone(archive.get("https://example.com/2"))
+        self.assertLess(os.path.getsize(os.path.join(self.directory, "pages.dat")), len(content) / 10)
+
+    def test_latest_copy_wins(self):
+        """Test that archiving a URL again replaces the copy returned, keeping one entry"""
+        archive = PageArchive(self.directory)
+        archive.put("https://example.com/1", page_response("old"))
+        archive.put("https://example.com/1", page_response("new"))
+        self.assertEqual(archive.get("https://example.com/1").content, b"new")
+        self.assertEqual(len(archive), 1)
+        self.assertEqual([p.content for p in archive.pages()], [b"new"])
+
+    def test_index_grows_and_survives_reopening(self):
+        """Test that the index keeps every URL as it grows, across reopening and rebuilding"""
+        archive = PageArchive(self.directory, initial_slots=8)
+        urls = [f"https://example.com/{i}" for i in range(200)]
+        for url in urls:
+            archive.put(url, page_response(url))
+        archive.close()
+
+        reopened = PageArchive(self.directory)
+        self.assertEqual(len(reopened), 200)
+        self.assertTrue(all(reopened.get(url).content == url.encode() for url in urls))
+        reopened.close()
+
+        os.remove(os.path.join(self.directory, "index.dat"))
+        rebuilt = PageArchive(self.directory)
+        self.assertEqual(len(rebuilt), 200)
+        self.assertEqual(rebuilt.get(urls[123]).content, urls[123].encode())
+
+    def test_reextract_offline(self):
+        """Test that fixed extractors are re-run on archived pages without downloading them"""
+        article = NewsArticle(title="Guardian", feature_image_url=None, content=None, summary="", author=None,
+                              source="The Guardian", date="", url="https://www.theguardian.com/world/1")
+        pool = Mock()
+        pool.get.return_value = page_response(PAGE.format(""))
+        archive = PageArchive(self.directory)
+        store = ScrapeStore()
+        scraper = ArticleScraper([article], session_pool=pool, flight=SingleFlight(), extraction_cache=MemoryCache(),
+                                 enrichment_memo=MemoryCache(), scrape_store=store, archive=archive)
+        self.assertEqual(article.content, "Archived body")
+
+        def fixed_extractor(article, response):
+            return {"content": response.text.upper()[:20]}
+
+        scraper.extractors["The Guardian"] = fixed_extractor
+        self.assertEqual(scraper.reextract(), 1)
+        self.assertEqual(article.content, "<HTML><BODY><DIV CLA")
+
+        results = scraper.reextract_archive()
+        self.assertEqual(results, {article.url: {"content": "<HTML><BODY><DIV CLA"}})
+        self.assertEqual(store.get(article.url, "fixed_extractor").fields, {"content": "<HTML><BODY><DIV CLA"})
+        pool.get.assert_called_once()
+
+    def test_reextract_archive_keeps_api_fields(self):
+        """Test that re-extracting the archive does not save fields over those an API returned"""
+        article = NewsArticle(title="API title", feature_image_url=None, content=None, summary="", author=None,
+                              source="The Guardian", date="", url="https://www.theguardian.com/world/1")
+        other_url = "https://www.theguardian.com/world/2"
+        archive = PageArchive(self.directory)
+        for url in (article.url, other_url):
+            archive.put(url, page_response(PAGE.format("")), "The Guardian")
+        memo = MemoryCache()
+        store = ScrapeStore()
+        scraper = ArticleScraper([article], session_pool=Mock(), flight=SingleFlight(), extraction_cache=MemoryCache(),
+                                 enrichment_memo=memo, scrape_store=store, archive=archive, lazy=True)
+
+        def extractor(article, response):
+            fields = {"content": "Archived body"}
+            if not article.title:
+                fields["title"] = "Page title"
+            return fields
+
+        scraper.extractors["The Guardian"] = extractor
+        results = scraper.reextract_archive()
+        self.assertEqual(results, {article.url: {"content": "Archived body"},
+                                   other_url: {"content": "Archived body", "title": "Page title"}})
+        self.assertEqual(memo.get(scraper._memo_key(article)), {"content": "Archived body"})
+        self.assertEqual(store.get(article.url, "extractor").fields, {"content": "Archived body"})
+        self.assertIsNone(memo.get(make_cache_key("The Guardian", other_url)))
+        self.assertIsNone(store.get(other_url, "extractor"))
+        self.assertEqual(article.title, "API title")
+
+    def test_reextract_skips_truncated_pages(self):
+        """Test that pages archived truncated are reported instead of extracted again"""
+        article = NewsArticle(title="Guardian", feature_image_url=None, content="API body", summary="",
+                              author=None, source="The Guardian", date="", url="https://www.theguardian.com/world/1")
+        archive = PageArchive(self.directory)
+        response = page_response(PAGE.format(""))
+        response.truncated = True
+        archive.put(article.url, response, article.source)
+        scraper = ArticleScraper([article], session_pool=Mock(), flight=SingleFlight(), extraction_cache=MemoryCache(),
+                                 enrichment_memo=MemoryCache(), scrape_store=ScrapeStore(), archive=archive, lazy=True)
+
+        self.assertEqual(scraper.reextract(), 0)
+        self.assertEqual(scraper.reextract_archive(), {})
+        self.assertEqual(article.content, "API body")
+        self.assertEqual(scraper.failures, {article.url: TRUNCATED_PAGE})
+
+    def test_error_pages_are_not_archived_or_extracted(self):
+        """Test that error responses are not archived, and those archived before are not extracted again"""
+        article = NewsArticle(title="Guardian", feature_image_url=None, content=None, summary="", author=None,
+                              source="The Guardian", date="", url="https://www.theguardian.com/world/1")
+        error_page = page_response(PAGE.format(""))
+        error_page.status_code = 503
+        pool = Mock()
+        pool.get.return_value = error_page
+        archive = PageArchive(self.directory)
+        memo = MemoryCache()
+        scraper = ArticleScraper([article], session_pool=pool, flight=SingleFlight(), extraction_cache=MemoryCache(),
+                                 enrichment_memo=memo, scrape_store=ScrapeStore(), archive=archive)
+        self.assertIn("503", scraper.failures[article.url])
+        self.assertNotIn(article.url, archive)
+
+        archive.put(article.url, error_page, article.source)
+        scraper.failures.clear()
+        self.assertEqual(scraper.reextract(), 0)
+        self.assertEqual(scraper.reextract_archive(), {})
+        self.assertIsNone(article.content)
+        self.assertIsNone(memo.get(scraper._memo_key(article)))
+        self.assertEqual(scraper.failures, {article.url: "Archived page has status 503"})
+
+
+if __name__ == '__main__':
+    unittest.main()
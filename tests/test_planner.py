@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import Mock
+from aggregator.cache import MemoryCache
+from aggregator.planner import missing_fields, plan_enrichment
+from aggregator.scraper import ArticleScraper
+from aggregator.singleflight import SingleFlight
+from entities.news_article import NewsArticle, BBCArticle
+
+
+class TestEnrichmentPlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.guardian_with_body = NewsArticle(
+            title="Guardian", feature_image_url=None, content="<p>Body from the API</p>", summary="",
+            author=None, source="The Guardian", date="2024-03-20", url="https://www.theguardian.com/world/1"
+        )
+        self.guardian_without_body = NewsArticle(
+            title="Guardian", feature_image_url=None, content=None, summary="",
+            author=None, source="The Guardian", date="2024-03-20", url="https://www.theguardian.com/world/2"
+        )
+        self.bbc_with_body = BBCArticle(
+            uuid="bbc-1", title="BBC", description="Description", url="https://www.bbc.com/news/1",
+            image_url="", published_at="2024-03-20", source="BBC News", content="", body="Full body"
+        )
+        self.gnews = NewsArticle(
+            title="GNews", feature_image_url=None, content="The opening lines... [2345 chars]", summary="",
+            author=None, source="GNews", date="2024-03-20", url="https://example.com/gnews"
+        )
+        self.articles = [self.guardian_with_body, self.guardian_without_body, self.bbc_with_body, self.gnews]
+
+    def test_missing_fields(self):
+        """Test that only the empty fields filled in by the source's scraper are reported"""
+        self.assertEqual(missing_fields(self.guardian_without_body), ("content",))
+        self.assertEqual(missing_fields(self.guardian_with_body), ())
+        self.assertEqual(missing_fields(self.bbc_with_body), ())
+        self.assertEqual(missing_fields(self.gnews), ("content",))
+        self.gnews.content = "The full text."
+        self.assertEqual(missing_fields(self.gnews), ())
+
+    def test_plan(self):
+        """Test that articles with every field are skipped and counted as saved requests"""
+        plan = plan_enrichment(self.articles)
+        self.assertEqual(plan.to_fetch, [self.guardian_without_body, self.gnews])
+        self.assertEqual(plan.missing, {self.guardian_without_body.url: ("content",), self.gnews.url: ("content",)})
+        self.assertEqual(plan.skipped, [self.guardian_with_body, self.bbc_with_body])
+        self.assertEqual(plan.requests_saved, 2)
+
+    def test_scraper_downloads_only_planned_articles(self):
+        """Test that the scraper does not download pages of complete articles"""
+        response = Mock()
+        response.content = '<div class="article-body-viewer-selector"><p>Scraped</p></div>'
+        pool = Mock()
+        pool.get.return_value = response
+
+        scraper = ArticleScraper(self.articles, session_pool=pool, flight=SingleFlight(),
+                                 extraction_cache=MemoryCache())
+
+        self.assertCountEqual([c.args[0] for c in pool.get.call_args_list], [self.guardian_without_body.url, self.gnews.url])
+        self.assertEqual(self.guardian_without_body.content, "Scraped")
+        self.assertEqual(self.guardian_with_body.content, "<p>Body from the API</p>")
+        self.assertEqual(scraper.requests_saved, 2)
+
+    def test_lazy_enrich_skips_complete_articles(self):
+        """Test that opening a complete article does not download its page"""
+        pool = Mock()
+        scraper = ArticleScraper(self.articles, session_pool=pool, lazy=True, enrichment_memo=MemoryCache())
+
+        self.assertIs(scraper.enrich(self.bbc_with_body), self.bbc_with_body)
+        scraper.prefetch([self.guardian_with_body])
+        pool.get.assert_not_called()
+        self.assertEqual(scraper.requests_saved, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
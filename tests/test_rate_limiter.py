@@ -0,0 +1,115 @@
+import unittest
+import threading
+import time
+from unittest.mock import patch, MagicMock
+from aggregator.api_client import GNewsApi
+from aggregator.cache import MemoryCache
+from aggregator.rate_limiter import (Priority, RateLimit, RateLimitExceeded, RequestScheduler,
+                                     current_priority, request_priority)
+from aggregator.singleflight import SingleFlight
+
+
+class TestRequestScheduler(unittest.TestCase):
+    def test_unlimited_provider_passes_through(self):
+        """Test that providers without a quota are never delayed"""
+        scheduler = RequestScheduler()
+        for _ in range(100):
+            scheduler.acquire("Unknown", "key")
+        self.assertEqual(scheduler.sent[("Unknown", "key")], 100)
+        self.assertIsNone(scheduler.remaining("Unknown", "key").daily_remaining)
+
+    def test_burst_then_refill(self):
+        """Test that a burst is served at once and the next request waits for a token"""
+        scheduler = RequestScheduler({"Test": RateLimit(per_second=20, burst=3)})
+        start = time.monotonic()
+        for _ in range(3):
+            scheduler.acquire("Test", "key")
+        self.assertLess(time.monotonic() - start, 0.04)
+
+        scheduler.acquire("Test", "key")
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_keys_have_separate_buckets(self):
+        """Test that quotas are tracked per API key"""
+        scheduler = RequestScheduler({"Test": RateLimit(per_second=1, burst=1, per_day=5)})
+        scheduler.acquire("Test", "first")
+        scheduler.acquire("Test", "second", timeout=0.01)
+        self.assertEqual(scheduler.remaining("Test", "first").daily_remaining, 4)
+        self.assertEqual(scheduler.remaining("Test", "second").daily_remaining, 4)
+
+    def test_daily_quota_and_timeout(self):
+        """Test that an exhausted daily quota or a timeout raises instead of blocking"""
+        scheduler = RequestScheduler({"Test": RateLimit(per_second=1000, burst=2, per_day=2)})
+        scheduler.acquire("Test", "key")
+        scheduler.acquire("Test", "key")
+        with self.assertRaises(RateLimitExceeded):
+            scheduler.acquire("Test", "key")
+
+        slow = RequestScheduler({"Test": RateLimit(per_second=0.1, burst=1)})
+        slow.acquire("Test", "key")
+        with self.assertRaises(RateLimitExceeded):
+            slow.acquire("Test", "key", timeout=0.05)
+        self.assertEqual(slow.remaining("Test", "key").waiting, 0)
+
+    def test_interactive_requests_go_first(self):
+        """Test that queued interactive requests are served before earlier background ones"""
+        scheduler = RequestScheduler({"Test": RateLimit(per_second=20, burst=1)})
+        scheduler.acquire("Test", "key")
+        order = []
+
+        def request(name, priority):
+            scheduler.acquire("Test", "key", priority=priority)
+            order.append(name)
+
+        threads = [threading.Thread(target=request, args=(f"background-{i}", Priority.BACKGROUND)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        while scheduler.remaining("Test", "key").waiting < 2:
+            time.sleep(0.001)
+        interactive = threading.Thread(target=request, args=("interactive", Priority.INTERACTIVE))
+        interactive.start()
+        for thread in threads + [interactive]:
+            thread.join(timeout=2)
+
+        self.assertEqual(order[0], "interactive")
+        self.assertEqual(sorted(order[1:]), ["background-0", "background-1"])
+
+    def test_acquire_nowait(self):
+        """Test that the non-blocking acquire reports how long to wait instead of sleeping"""
+        scheduler = RequestScheduler({"Test": RateLimit(per_second=10, burst=1)})
+        self.assertEqual(scheduler.acquire_nowait("Test", "key"), 0)
+        wait = scheduler.acquire_nowait("Test", "key")
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, 0.1)
+
+    def test_priority_context(self):
+        """Test that the request priority is taken from the calling context"""
+        self.assertEqual(current_priority(), Priority.INTERACTIVE)
+        with request_priority(Priority.BACKGROUND):
+            self.assertEqual(current_priority(), Priority.BACKGROUND)
+        self.assertEqual(current_priority(), Priority.INTERACTIVE)
+
+    @patch("aggregator.http_session.requests.Session.get")
+    def test_client_pauses_after_429(self, mock_get):
+        """Test that a 429 answer pauses the API key for its Retry-After"""
+        mock_response = MagicMock()
+        mock_response.status_code = 429
+        mock_response.headers = {"Retry-After": "30"}
+        mock_response.raise_for_status.side_effect = Exception("Too Many Requests")
+        mock_get.return_value = mock_response
+
+        scheduler = RequestScheduler({"GNewsApi": RateLimit(per_second=10, burst=5, per_day=100)})
+        client = GNewsApi(api_key="key", base_url="https://gnews.io/api/v4/",
+                          cache=MemoryCache(), flight=SingleFlight(), scheduler=scheduler)
+        with self.assertRaises(Exception):
+            client.fetch_articles(category="Technology")
+
+        budget = client.remaining_budget()
+        self.assertEqual(budget.daily_remaining, 99)
+        self.assertLess(budget.tokens, 1)
+        with self.assertRaises(RateLimitExceeded):
+            scheduler.acquire("GNewsApi", "key", timeout=0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+import os
+import tempfile
+import time
+from unittest.mock import Mock, patch
+from aggregator.cache import MemoryCache, make_cache_key
+from aggregator.scrape_store import ScrapeStore, content_hash
+from aggregator.scraper import ArticleScraper
+from aggregator.singleflight import SingleFlight
+from entities.news_article import NewsArticle
+
+PAGE = '<div class="article-body-viewer-selector"><p>Stored body</p></div>'
+
+
+class TestScrapeStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "scrapes.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_article(self) -> NewsArticle:
+        return NewsArticle(
+            title="Guardian Test", feature_image_url=None, content=None, summary="Summary", author=None,
+            source="The Guardian", date="2024-03-20", url="https://www.theguardian.com/world/1"
+        )
+
+    def make_pool(self, content=PAGE, status_code=200) -> Mock:
+        response = Mock()
+        response.content = content
+        response.status_code = status_code
+        pool = Mock()
+        pool.get.return_value = response
+        return pool
+
+    def test_put_get_and_persistence(self):
+        """Test that records survive reopening the database"""
+        store = ScrapeStore(self.path)
+        store.put("https://example.com/a", "_extract", {"content": "Body"}, content_hash(PAGE))
+        store.close()
+
+        record = ScrapeStore(self.path).get("https://example.com/a", "_extract")
+        self.assertEqual(record.fields, {"content": "Body"})
+        self.assertEqual(record.content_hash, content_hash(PAGE))
+        self.assertLess(record.age, 5)
+
+    def test_max_age(self):
+        """Test that expired records are only returned when asked for"""
+        store = ScrapeStore(self.path, max_age=0.05)
+        store.put("https://example.com/a", "_extract", {"content": "Body"}, "hash")
+        time.sleep(0.06)
+
+        self.assertIsNone(store.get("https://example.com/a", "_extract"))
+        self.assertIsNotNone(store.get("https://example.com/a", "_extract", allow_expired=True))
+        self.assertEqual(store.stats().misses, 2)
+
+    def test_size_eviction(self):
+        """Test that the least recently used records are evicted beyond max_bytes"""
+        store = ScrapeStore(self.path, max_bytes=100)
+        store.put("https://example.com/a", "_extract", {"content": "a" * 30}, "a")
+        time.sleep(0.01)
+        store.put("https://example.com/b", "_extract", {"content": "b" * 30}, "b")
+        time.sleep(0.01)
+        store.get("https://example.com/a", "_extract")
+        time.sleep(0.01)
+        store.put("https://example.com/c", "_extract", {"content": "c" * 30}, "c")
+
+        self.assertIsNone(store.get("https://example.com/b", "_extract"))
+        self.assertIsNotNone(store.get("https://example.com/a", "_extract"))
+        stats = store.stats()
+        self.assertEqual((stats.entries, stats.evictions), (2, 1))
+        self.assertLessEqual(stats.bytes, 100)
+
+    def test_seen_article_is_not_downloaded(self):
+        """Test that a second scraper enriches a known article from the store"""
+        store = ScrapeStore(self.path)
+        options = dict(flight=SingleFlight(), extraction_cache=MemoryCache(), scrape_store=store)
+        ArticleScraper([self.make_article()], session_pool=self.make_pool(), **options)
+
+        pool = self.make_pool()
+        article = self.make_article()
+        scraper = ArticleScraper([article], session_pool=pool, **options)
+
+        pool.get.assert_not_called()
+        self.assertEqual(article.content, "Stored body")
+        self.assertEqual(scraper.store_hits, 1)
+
+    def test_unchanged_page_is_not_parsed_again(self):
+        """Test that an expired record is reused when the page has the same content hash"""
+        store = ScrapeStore(self.path, max_age=0)
+        options = dict(flight=SingleFlight(), extraction_cache=MemoryCache(), scrape_store=store)
+        ArticleScraper([self.make_article()], session_pool=self.make_pool(), **options)
+
+        article = self.make_article()
+        with patch("aggregator.extraction.BeautifulSoup") as mock_soup:
+            scraper = ArticleScraper([article], session_pool=self.make_pool(), **options)
+            mock_soup.assert_not_called()
+        self.assertEqual(article.content, "Stored body")
+        self.assertEqual(scraper.parses_skipped, 1)
+
+        changed = self.make_article()
+        ArticleScraper([changed], session_pool=self.make_pool(PAGE.replace("Stored", "New")), **options)
+        self.assertEqual(changed.content, "New body")
+
+    def test_error_page_is_not_stored(self):
+        """Test that a 5xx page is reported as a failure and the page is downloaded again once it recovers"""
+        store = ScrapeStore(self.path)
+        extraction_cache = MemoryCache()
+        options = dict(flight=SingleFlight(), extraction_cache=extraction_cache, scrape_store=store)
+        failed = self.make_article()
+        error_page = '<div class="article-body-viewer-selector"><p>Access denied</p></div>'
+        pool = self.make_pool(error_page, status_code=503)
+        pool.get.return_value.validator = '"v1"'
+        scraper = ArticleScraper([failed], session_pool=pool, **options)
+
+        self.assertIn("503", scraper.failures[failed.url])
+        self.assertIsNone(failed.content)
+        self.assertIsNone(store.get(failed.url, "_extract_guardian", allow_expired=True))
+        self.assertIsNone(extraction_cache.get(make_cache_key("_extract_guardian", failed.url, '"v1"')))
+
+        pool = self.make_pool()
+        article = self.make_article()
+        scraper = ArticleScraper([article], session_pool=pool, **options)
+        pool.get.assert_called_once()
+        self.assertEqual(article.content, "Stored body")
+        self.assertEqual(scraper.failures, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,19 @@
 import unittest
+import copy
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, Mock
+import requests
+from aggregator.cache import MemoryCache, make_cache_key
+from aggregator.http_session import DEFAULT_TIMEOUT, HTTPSessionPool
+from aggregator.page_archive import PageArchive
 from aggregator.scraper import ArticleScraper
+from aggregator.singleflight import SingleFlight
 from entities.news_article import NewsArticle, NYTArticle, BBCArticle
 
 
@@ -60,7 +73,7 @@ class TestArticleScraper(unittest.TestCase):
             self.bbc_article
         ]
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_guardian_scraping(self, mock_get):
         """Test scraping of Guardian articles"""
         # Mock HTML response for Guardian
@@ -77,9 +90,9 @@ class TestArticleScraper(unittest.TestCase):
         enriched_articles = scraper.get_enriched_articles()
 
         self.assertEqual(enriched_articles[0].content, "This is the Guardian article content")
-        mock_get.assert_called_once_with(self.guardian_article.url)
+        mock_get.assert_called_once_with(self.guardian_article.url, timeout=DEFAULT_TIMEOUT)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_nyt_scraping(self, mock_get):
         """Test scraping of NYT articles"""
         # Mock HTML response for NYT
@@ -101,9 +114,9 @@ class TestArticleScraper(unittest.TestCase):
         self.assertEqual(enriched_articles[0].content, "This is the NYT article content")
         self.assertEqual(enriched_articles[0].author, "Nyt Author")
         self.assertEqual(enriched_articles[0].feature_image_url, "https://example.com/nyt.jpg")
-        mock_get.assert_called_once_with(self.nyt_article.url)
+        mock_get.assert_called_once_with(self.nyt_article.url, timeout=DEFAULT_TIMEOUT)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_bbc_scraping(self, mock_get):
         """Test scraping of BBC articles"""
         # Mock HTML response for BBC
@@ -128,7 +141,7 @@ class TestArticleScraper(unittest.TestCase):
         self.assertEqual(enriched_articles[0].image_url, "https://example.com/bbc.jpg")
         self.assertEqual(enriched_articles[0].body, "This is the BBC article content\nMore content here")
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_scraping_error_handling(self, mock_get):
         """Test error handling during scraping"""
         # Mock a failed request
@@ -141,10 +154,337 @@ class TestArticleScraper(unittest.TestCase):
         self.assertEqual(enriched_articles[0].content, None)
         self.assertEqual(enriched_articles[1].author, None)
 
-if __name__ == '__main__':
-    unittest.main()
 
+class SlowPagePool:
+    """Session pool stand-in serving Guardian pages slowly and recording concurrency"""
+
+    def __init__(self, delay=0.05, hang_on=None):
+        self.delay = delay
+        self.hang_on = hang_on
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def get(self, url, hedge=False, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(1 if url == self.hang_on else self.delay)
+            if url.endswith("/broken"):
+                raise Exception("Connection error")
+            response = Mock()
+            response.content = f'<div class="article-body-viewer-selector"><p>Body of {url}</p></div>'
+            return response
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestParallelEnrichment(unittest.TestCase):
+    def setUp(self):
+        self.articles = [NewsArticle(
+            title=f"Article {i}", feature_image_url=None, content=None, summary="Summary", author=None,
+            source="The Guardian", date="2024-03-20", url=f"https://www.theguardian.com/world/{i}"
+        ) for i in range(12)]
+
+    def enrich(self, articles, pool, **kwargs):
+        return ArticleScraper(articles, session_pool=pool, flight=SingleFlight(),
+                              extraction_cache=MemoryCache(), **kwargs)
+
+    def test_parallel_matches_serial(self):
+        """Test that parallel enrichment gives the same articles as the serial path"""
+        serial = copy.deepcopy(self.articles)
+        self.enrich(serial, SlowPagePool(delay=0.01), max_workers=1)
+
+        started = time.monotonic()
+        self.enrich(self.articles, SlowPagePool(delay=0.05), max_workers=8)
+        self.assertLess(time.monotonic() - started, 12 * 0.05)
+
+        self.assertEqual([a.to_dict() for a in self.articles], [a.to_dict() for a in serial])
+
+    def test_per_host_cap(self):
+        """Test that no more pages than the site's cap are downloaded at once"""
+        pool = SlowPagePool(delay=0.05)
+        self.enrich(self.articles, pool, max_workers=8, host_limits={"theguardian.com": 3})
+        self.assertEqual(pool.peak, 3)
+        self.assertTrue(all(a.content for a in self.articles))
+
+    def test_failures_and_timeouts_are_collected(self):
+        """Test that failing and slow articles are reported and left unchanged"""
+        self.articles[2].url = "https://www.theguardian.com/world/broken"
+        slow_url = self.articles[5].url
+        scraper = self.enrich(self.articles, SlowPagePool(delay=0.01, hang_on=slow_url), timeout=0.3)
+
+        self.assertEqual(set(scraper.failures), {self.articles[2].url, slow_url})
+        self.assertIn("Timed out", scraper.failures[slow_url])
+        self.assertIsNone(self.articles[2].content)
+        self.assertIsNone(self.articles[5].content)
+        self.assertEqual(self.articles[0].content, f"Body of {self.articles[0].url}")
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Thread pool recording how many submitted tasks were unfinished at once"""
 
+    def __init__(self, delay=0.02):
+        super().__init__(max_workers=8)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.peak = 0
+        self.finished = 0
 
+    def submit(self, fn, *args, **kwargs):
+        with self.lock:
+            self.pending += 1
+            self.peak = max(self.peak, self.pending)
+        return super().submit(self.run, fn, *args, **kwargs)
 
+    def run(self, fn, *args, **kwargs):
+        try:
+            time.sleep(self.delay)
+            return fn(*args, **kwargs)
+        finally:
+            with self.lock:
+                self.pending -= 1
+                self.finished += 1
 
+
+class TestParseStage(unittest.TestCase):
+    def setUp(self):
+        self.articles = [NewsArticle(
+            title=f"Article {i}", feature_image_url=None, content=None, summary="Summary", author=None,
+            source="The Guardian", date="2024-03-20", url=f"https://www.theguardian.com/world/{i}"
+        ) for i in range(12)]
+
+    def enrich(self, articles, session_pool=None, **kwargs):
+        return ArticleScraper(articles, session_pool=session_pool or SlowPagePool(delay=0.01), flight=SingleFlight(),
+                              extraction_cache=MemoryCache(), **kwargs)
+
+    def test_process_pool_matches_in_thread_parsing(self):
+        """Test that pages parsed in worker processes give the same articles"""
+        in_thread = copy.deepcopy(self.articles)
+        self.enrich(in_thread)
+
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            scraper = self.enrich(self.articles, parse_pool=pool)
+
+        self.assertEqual(scraper.failures, {})
+        self.assertEqual([a.to_dict() for a in self.articles], [a.to_dict() for a in in_thread])
+
+    def test_parse_queue_is_bounded(self):
+        """Test that downloads pause while parse_queue_size pages wait for the parse stage"""
+        pool = CountingExecutor(delay=0.05)
+        pages = SlowPagePool(delay=0.001)
+        get = pages.get
+        backlog = []  # Pages downloaded but not parsed yet, after each download
+
+        def counting_get(url, **kwargs):
+            response = get(url, **kwargs)
+            backlog.append(len(backlog) + 1 - pool.finished)
+            return response
+
+        pages.get = counting_get
+        self.enrich(self.articles, session_pool=pages, max_workers=1, parse_pool=pool, parse_queue_size=2,
+                    parse_workers=1)
+        pool.shutdown()
+
+        self.assertEqual(pool.peak, 1)
+        # The page parsed, the pages queued and the page just downloaded
+        self.assertLessEqual(max(backlog), 4)
+        self.assertTrue(all(a.content for a in self.articles))
+
+    def test_downloads_overlap_parsing(self):
+        """Test that the site's slot is released once a page is downloaded, before it is parsed"""
+        pages = SlowPagePool(delay=0.02)
+        pool = CountingExecutor(delay=0.1)
+        started = time.monotonic()
+        self.enrich(self.articles[:6], session_pool=pages, max_workers=4, host_limits={"theguardian.com": 1},
+                    parse_pool=pool, parse_workers=4)
+        elapsed = time.monotonic() - started
+        pool.shutdown()
+
+        self.assertEqual(pages.peak, 1)
+        # Holding the slot while parsing would take 6 * (0.02 + 0.1)s
+        self.assertLess(elapsed, 0.5)
+        self.assertTrue(all(a.content for a in self.articles[:6]))
+
+
+class TestLazyEnrichment(unittest.TestCase):
+    def setUp(self):
+        self.articles = [NewsArticle(
+            title=f"Article {i}", feature_image_url=None, content=None, summary="Summary", author=None,
+            source="The Guardian", date="2024-03-20", url=f"https://www.theguardian.com/world/{i}"
+        ) for i in range(3)]
+        self.pool = SlowPagePool(delay=0.01)
+        self.pool.get = Mock(side_effect=self.pool.get)
+        self.memo = MemoryCache()
+
+    def lazy(self):
+        return ArticleScraper(self.articles, session_pool=self.pool, flight=SingleFlight(),
+                              extraction_cache=MemoryCache(), lazy=True, enrichment_memo=self.memo)
+
+    def test_lazy_scraper_does_not_scrape(self):
+        """Test that a lazy scraper leaves the articles untouched until asked"""
+        scraper = self.lazy()
+        self.assertEqual(scraper.get_enriched_articles(), self.articles)
+        self.pool.get.assert_not_called()
+        self.assertIsNone(self.articles[0].content)
+
+    def test_enrich_on_demand_is_memoized(self):
+        """Test that an opened article is scraped once, even across scrapers"""
+        article = self.lazy().enrich(self.articles[1])
+        self.assertEqual(article.content, f"Body of {self.articles[1].url}")
+        self.assertIsNone(self.articles[0].content)
+
+        rerun = copy.deepcopy(self.articles[1])
+        rerun.content = None
+        self.lazy().enrich(rerun)
+        self.assertEqual(rerun.content, article.content)
+        self.assertEqual(self.pool.get.call_count, 1)
+
+    def test_prefetch_then_enrich(self):
+        """Test that prefetched articles are enriched without another download"""
+        scraper = self.lazy()
+        scraper.prefetch(self.articles[:2])
+        self.assertIsNone(self.articles[0].content)
+
+        for article in self.articles[:2]:
+            scraper.enrich(article)
+        self.assertEqual([a.content is not None for a in self.articles], [True, True, False])
+        self.assertEqual(self.pool.get.call_count, 2)
+
+    def test_bbc_outage_is_not_memoized(self):
+        """Test that a BBC page that could not be downloaded is reported and scraped again later"""
+        article = BBCArticle(uuid="bbc-1", title="BBC Test", description="BBC description",
+                             url="https://www.bbc.com/news/articles/1", image_url="", published_at="2024-03-20",
+                             source="BBC News", content="BBC content", body="")
+        response = Mock()
+        response.status_code = 200
+        response.content = '<meta property="og:title" content="BBC Title"><div data-component="text-block"><p>Body</p></div>'
+        pool = Mock()
+        pool.get.side_effect = [requests.ConnectionError("BBC is down"), response]
+        scraper = ArticleScraper([article], session_pool=pool, flight=SingleFlight(), extraction_cache=MemoryCache(),
+                                 lazy=True, enrichment_memo=self.memo)
+
+        scraper.enrich(article)
+        self.assertIn("BBC is down", scraper.failures[article.url])
+        self.assertEqual((article.title, article.body), ("BBC Test", ""))
+        self.assertIsNone(self.memo.get(scraper._memo_key(article)))
+
+        scraper.enrich(article)
+        self.assertEqual((article.title, article.body), ("BBC Title", "Body"))
+        self.assertEqual(pool.get.call_count, 2)
+
+
+class FixturePageHandler(BaseHTTPRequestHandler):
+    """Serves the saved Guardian page in small chunks"""
+    page = open(os.path.join(os.path.dirname(__file__), "fixtures", "pages", "guardian.html"), "rb").read()
+    etag = '"v1"'
+    not_modified = 0  # Requests answered with 304
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == self.etag:
+            FixturePageHandler.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        # A partial copy of the page, e.g. from a transforming proxy
+        self.send_response(203 if self.path.endswith("/partial") else 200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(self.page)))
+        self.end_headers()
+        try:
+            for start in range(0, len(self.page), 8192):
+                self.wfile.write(self.page[start:start + 8192])
+                self.wfile.flush()
+                time.sleep(0.002)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestStreamingEnrichment(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FixturePageHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/world/1"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def enrich(self, url=None, **kwargs) -> tuple[ArticleScraper, NewsArticle]:
+        article = NewsArticle(title="Article", feature_image_url=None, content=None, summary="Summary",
+                              author=None, source="The Guardian", date="2024-03-20", url=url or self.url)
+        kwargs.setdefault("extraction_cache", MemoryCache())
+        scraper = ArticleScraper([article], session_pool=HTTPSessionPool(max_retries=0), flight=SingleFlight(),
+                                 **kwargs)
+        return scraper, article
+
+    def test_stops_after_extracted_fields(self):
+        """Test that a streamed page is read only up to the article body, with the same result"""
+        _, full = self.enrich()
+        scraper, streamed = self.enrich(streaming=True)
+
+        self.assertEqual(streamed.content, full.content)
+        self.assertIsNotNone(full.content)
+        self.assertEqual(scraper.early_stops, 1)
+        self.assertLess(scraper.bytes_read, len(FixturePageHandler.page))
+
+    def test_byte_budget(self):
+        """Test that no more than the byte budget is kept when the fields come later"""
+        scraper, article = self.enrich(streaming=True, byte_budget=4096)
+        self.assertIsNone(article.content)
+        self.assertEqual(scraper.early_stops, 1)
+        self.assertLess(scraper.bytes_read, 64 * 1024)
+
+    def test_revalidates_streamed_pages(self):
+        """Test that a streamed page is sent with its ETag again and a 304 reuses its extraction"""
+        extraction_cache = MemoryCache()
+        scraper, first = self.enrich(streaming=True, extraction_cache=extraction_cache)
+        not_modified = FixturePageHandler.not_modified
+        scraper, again = self.enrich(streaming=True, extraction_cache=extraction_cache)
+
+        self.assertEqual(FixturePageHandler.not_modified, not_modified + 1)
+        self.assertEqual(again.content, first.content)
+        self.assertIsNotNone(again.content)
+        self.assertEqual(scraper.parses_skipped, 1)
+        self.assertEqual(scraper.bytes_read, 0)
+
+    def test_only_200_pages_are_revalidated(self):
+        """Test that the ETag of a non-200 streamed answer is not sent with the next request"""
+        url = self.url.replace("/world/1", "/world/partial")
+        extraction_cache = MemoryCache()
+        _, first = self.enrich(url=url, streaming=True, extraction_cache=extraction_cache)
+        not_modified = FixturePageHandler.not_modified
+        scraper, again = self.enrich(url=url, streaming=True, extraction_cache=extraction_cache)
+
+        self.assertIsNotNone(first.content)
+        self.assertEqual(FixturePageHandler.not_modified, not_modified)
+        self.assertIsNone(extraction_cache.get(make_cache_key("validators", "_extract_guardian", url)))
+        self.assertEqual(scraper.parses_skipped, 0)
+        self.assertEqual(again.content, first.content)
+
+    def test_truncated_pages_not_archived(self):
+        """Test that a page whose download stopped early is not archived for re-extraction"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        archive = PageArchive(directory)
+        scraper, article = self.enrich(streaming=True, archive=archive)
+        self.assertIsNotNone(article.content)
+        self.assertEqual(scraper.early_stops, 1)
+        self.assertNotIn(self.url, archive)
+
+        self.enrich(archive=archive)
+        self.assertFalse(archive.get(self.url).truncated)
+
+
+if __name__ == '__main__':
+    unittest.main()
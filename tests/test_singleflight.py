@@ -0,0 +1,61 @@
+import unittest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from aggregator.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        """Set up a fresh single-flight group"""
+        self.flight = SingleFlight()
+
+    def test_identical_calls_share_one_execution(self):
+        """Test that concurrent calls with the same key run the function once"""
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait(timeout=2)
+            return "page"
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(self.flight.do, "url", fetch) for _ in range(4)]
+            while self.flight.coalesced < 3:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(results, ["page"] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.flight.executed, 1)
+        self.assertEqual(self.flight.in_flight(), 0)
+
+    def test_errors_are_shared(self):
+        """Test that every waiting caller receives the leader's exception"""
+        release = threading.Event()
+
+        def broken():
+            release.wait(timeout=2)
+            raise ValueError("Connection error")
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(self.flight.do, "url", broken) for _ in range(3)]
+            while self.flight.coalesced < 2:
+                time.sleep(0.01)
+            release.set()
+            for future in futures:
+                with self.assertRaises(ValueError):
+                    future.result()
+
+    def test_sequential_calls_run_again(self):
+        """Test that a finished call is not reused by later callers"""
+        self.assertEqual(self.flight.do("url", lambda: 1), 1)
+        self.assertEqual(self.flight.do("url", lambda: 2), 2)
+        self.assertEqual(self.flight.executed, 2)
+        self.assertEqual(self.flight.coalesced, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
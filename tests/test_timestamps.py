@@ -0,0 +1,61 @@
+import unittest
+import random
+from datetime import datetime, timedelta, timezone
+from entities.news_article import TheGuardianArticle, NYTArticle, BBCArticle, GNewsArticle
+from entities.timestamps import parse_timestamp
+
+EXPECTED = int(datetime(2025, 1, 10, 19, 54, 24, tzinfo=timezone.utc).timestamp())
+
+
+class TestTimestamps(unittest.TestCase):
+
+    def test_provider_formats(self):
+        """Test that the date layouts of every provider are parsed into the same UTC timestamp"""
+        self.assertEqual(parse_timestamp("2025-01-10T19:54:24Z"), EXPECTED)
+        self.assertEqual(parse_timestamp("2025-01-10T19:54:24+0000"), EXPECTED)
+        self.assertEqual(parse_timestamp("2025-01-10T14:54:24-0500"), EXPECTED)
+        self.assertEqual(parse_timestamp("2025-01-10T21:24:24+0130"), EXPECTED)
+
+    def test_other_iso_dates(self):
+        """Test that other ISO-8601 dates are parsed, and dates without offset taken as UTC"""
+        self.assertEqual(parse_timestamp("2025-01-10T20:54:24+01:00"), EXPECTED)
+        self.assertEqual(parse_timestamp("2025-01-10T19:54:24.750Z"), EXPECTED)
+        self.assertEqual(parse_timestamp("2025-01-10T19:54:24"), EXPECTED)
+        self.assertEqual(parse_timestamp("2025-01-10"), EXPECTED - (19 * 3600 + 54 * 60 + 24))
+
+    def test_malformed(self):
+        """Test that missing and malformed dates give None"""
+        for value in (None, "", "yesterday", "2025-02-30T10:00:00Z", "2025-13-01T10:00:00Z",
+                      "2025-01-10T24:00:00Z", "2025-01-10 19:54:24+0000x", 1736538864):
+            self.assertIsNone(parse_timestamp(value), value)
+        leap_day = int(datetime(2024, 2, 29, tzinfo=timezone.utc).timestamp())
+        self.assertEqual(parse_timestamp("2024-02-29T00:00:00Z"), leap_day)
+
+    def test_random_dates(self):
+        """Test that both provider layouts give the seconds since the epoch over random dates"""
+        random.seed(3)
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        for _ in range(2000):
+            moment = epoch + timedelta(seconds=random.randrange(-2_000_000_000, 4_000_000_000))
+            expected = int((moment - epoch).total_seconds())
+            self.assertEqual(parse_timestamp(moment.strftime("%Y-%m-%dT%H:%M:%SZ")), expected)
+            self.assertEqual(parse_timestamp(moment.strftime("%Y-%m-%dT%H:%M:%S+0000")), expected)
+
+    def test_articles_parse_once(self):
+        """Test that every article class holds the timestamp of its publication date"""
+        guardian = TheGuardianArticle(
+            id="1", type="article", sectionId="world", sectionName="World", webPublicationDate="2025-01-10T19:54:24Z",
+            webTitle="Title", webUrl="https://www.theguardian.com/1", apiUrl="", fields={}, isHosted=False
+        )
+        nyt = NYTArticle(
+            abstract="", byline={}, document_type="article", headline={}, _id="1", keywords=[], multimedia={},
+            news_desk="", print_page="", print_section="", pub_date="2025-01-10T19:54:24+0000", section_name="",
+            snippet="", source="", subsection_name="", type_of_material="", uri="", web_url="", word_count=0
+        )
+        bbc = BBCArticle(uuid="1", title="Title", description="", url="", image_url="",
+                         published_at="2025-01-10T19:54:24Z", source="BBC News", content="")
+        gnews = GNewsArticle(title="Title", description="", content="", url="", image="",
+                             publishedAt="2025-01-10T19:54:24Z", source={})
+        for article in (guardian, nyt, bbc, gnews):
+            self.assertEqual(article.timestamp, EXPECTED)
+        self.assertIsNone(BBCArticle.from_dict({}).timestamp)
@@ -0,0 +1,89 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime, timezone
+from unittest.mock import patch, MagicMock
+from aggregator.api_client import TheGuardianApi
+from aggregator.cache import MemoryCache
+from aggregator.rate_limiter import RequestScheduler
+from aggregator.watermarks import WatermarkStore, parse_published_at
+from entities.news_article import NewsArticle
+
+
+def make_article(i: int, date: str) -> NewsArticle:
+    return NewsArticle(
+        title=f"Article {i}", feature_image_url=None, content=None, summary="Summary",
+        author=None, source="Test", date=date, url=f"https://example.com/{i}"
+    )
+
+
+def guardian_item(i: int, date: str) -> dict:
+    return {
+        "id": f"news/{i}", "type": "article", "sectionId": "technology", "sectionName": "Technology",
+        "webPublicationDate": date, "webTitle": f"Article {i}", "webUrl": f"https://guardian.co.uk/{i}",
+        "apiUrl": f"https://content.guardianapis.com/news/{i}", "isHosted": False, "fields": {}
+    }
+
+
+class TestWatermarkStore(unittest.TestCase):
+    def setUp(self):
+        """Set up an in-memory store"""
+        self.store = WatermarkStore()
+
+    def test_parse_published_at(self):
+        """Test that provider date formats are parsed into UTC"""
+        expected = datetime(2025, 1, 10, 19, 54, 24, tzinfo=timezone.utc)
+        self.assertEqual(parse_published_at("2025-01-10T19:54:24Z"), expected)
+        self.assertEqual(parse_published_at("2025-01-10T19:54:24+0000"), expected)
+        self.assertEqual(parse_published_at("2025-01-10T20:54:24+01:00"), expected)
+        self.assertIsNone(parse_published_at(""))
+        self.assertIsNone(parse_published_at("yesterday"))
+
+    def test_merge_deduplicates_and_moves_mark(self):
+        """Test that merges skip known articles, sort newest first and move the mark forward"""
+        self.store.merge("Test", "World", [make_article(1, "2024-03-20T10:00:00Z")])
+        merged = self.store.merge("Test", "world", [
+            make_article(2, "2024-03-21T10:00:00Z"),
+            make_article(1, "2024-03-20T10:00:00Z"),
+        ])
+
+        self.assertEqual([a.title for a in merged], ["Article 2", "Article 1"])
+        self.assertEqual(self.store.since("Test", "World"), datetime(2024, 3, 21, 10, tzinfo=timezone.utc))
+        self.assertEqual(self.store.get("Test", "World").latest_id, "https://example.com/2")
+
+    def test_persistence(self):
+        """Test that marks survive a restart when a path is given"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "marks.pkl")
+            WatermarkStore(path=path).merge("Test", "World", [make_article(1, "2024-03-20T10:00:00Z")])
+            reloaded = WatermarkStore(path=path)
+            self.assertEqual(len(reloaded.get("Test", "World").articles), 1)
+
+    @patch("aggregator.http_session.requests.Session.get")
+    def test_delta_fetch_asks_only_for_newer_items(self, mock_get):
+        """Test that the second fetch sends from-date and is merged with the first"""
+        responses = iter([
+            [guardian_item(1, "2024-03-20T10:00:00Z")],
+            [guardian_item(2, "2024-03-21T08:00:00Z")],
+        ])
+
+        def fake_get(url, **kwargs):
+            mock_response = MagicMock()
+            mock_response.raise_for_status = MagicMock()
+            mock_response.json.return_value = {"response": {"results": next(responses)}}
+            return mock_response
+        mock_get.side_effect = fake_get
+
+        api = TheGuardianApi(api_key="key", base_url="https://content.guardianapis.com/",
+                             cache=MemoryCache(ttl=0), watermarks=self.store,
+                             scheduler=RequestScheduler())
+        api.fetch_articles(category="Technology")
+        self.assertNotIn("from-date", mock_get.call_args.kwargs["params"])
+
+        articles = api.fetch_articles(category="Technology")
+        self.assertEqual(mock_get.call_args.kwargs["params"]["from-date"], "2024-03-20")
+        self.assertEqual([a.title for a in articles], ["Article 2", "Article 1"])
+
+
+if __name__ == '__main__':
+    unittest.main()